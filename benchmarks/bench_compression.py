@@ -0,0 +1,75 @@
+"""
+تكلفة ضغط استجابات JSON (زمن المعالج) مقابل البايتات الموفرة، لأحجام الاستجابات
+المعتادة في المسارات، بمستويات gzip المختلفة وجودات brotli (إن كان مثبتاً).
+
+الاستخدام:
+    python benchmarks/generate_data.py --db /tmp/hr_bench.db --employees 2000
+    python benchmarks/bench_compression.py --db /tmp/hr_bench.db
+"""
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAYLOADS = [
+    ('employee by id', '/api/employees/1'),
+    ('employees page 100', '/api/employees?limit=100'),
+    ('leave requests page 100', '/api/leave-requests?limit=100'),
+    ('attendance page 1000', '/api/attendance?limit=1000'),
+    ('employees all', '/api/employees'),
+]
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+def codecs():
+    for level in GZIP_LEVELS:
+        yield f'gzip-{level}', lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0)
+    try:
+        import brotli
+    except ImportError:
+        return
+    for quality in BROTLI_QUALITIES:
+        yield f'br-{quality}', lambda data, quality=quality: brotli.compress(data, quality=quality)
+
+
+def measure(compress, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        compressed = compress(data)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), len(compressed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', required=True, help='قاعدة بيانات مولّدة بـ generate_data.py')
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ['HR_DATABASE_URI'] = f"sqlite:///{os.path.abspath(args.db)}"
+    os.environ['HR_COMPRESSION'] = '0'
+    from src.main import app
+
+    client = app.test_client()
+    print(f"{'payload':<24} {'codec':>8} {'bytes':>10} {'ratio':>6} {'saved KB':>9} {'cpu ms':>8} {'MB/s':>7}")
+    for name, url in PAYLOADS:
+        data = client.get(url).get_data()
+        print(f"{name:<24} {'none':>8} {len(data):>10}")
+        for codec, compress in codecs():
+            seconds, size = measure(compress, data, args.repeat)
+            print(
+                f"{'':<24} {codec:>8} {size:>10} {size / len(data):>6.2f} {(len(data) - size) / 1024:>9.1f} "
+                f"{seconds * 1000:>8.2f} {len(data) / seconds / 1e6:>7.0f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
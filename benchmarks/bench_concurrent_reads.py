@@ -0,0 +1,121 @@
+"""
+قياس معدل القراءة من /api/employees أثناء تشغيل استيراد Excel، لكل ملف شخصي
+لمحرك قاعدة البيانات (HR_DB_PROFILE). كل ملف شخصي يُشغَّل على قاعدة بيانات
+مؤقتة، والقرّاء عمليات مستقلة حتى لا يتنافسوا مع الاستيراد على الـ GIL.
+
+الاستخدام:
+    python benchmarks/bench_concurrent_reads.py --rows 20000 --readers 4
+"""
+import argparse
+import io
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def reader_process(max_id, stop, results):
+    """عملية قراءة مستقلة (مثل عامل gunicorn) تكرر طلبات صفحات الموظفين حتى الإيقاف."""
+    from src.main import app
+
+    client = app.test_client()
+    ok = errors = 0
+    while not stop.is_set():
+        after = random.randint(0, max_id)
+        response = client.get(f"/api/employees?limit=50&after={after}&fields=employee_id,full_name,department")
+        if response.status_code == 200:
+            ok += 1
+        else:
+            errors += 1
+    results.put((ok, errors))
+
+
+def measure_reads(rows, readers, seconds=None, writer=None):
+    """تشغيل القرّاء لمدة محددة أو حتى انتهاء الكاتب. يعيد (قراءات/ث، أخطاء، المدة)."""
+    context = multiprocessing.get_context('spawn')
+    stop = context.Event()
+    results = context.Queue()
+    processes = [context.Process(target=reader_process, args=(rows, stop, results)) for _ in range(readers)]
+    for process in processes:
+        process.start()
+    # انتظار تحميل التطبيق في عمليات القراءة قبل بدء القياس
+    time.sleep(2)
+
+    started = time.perf_counter()
+    if writer is not None:
+        writer()
+    else:
+        time.sleep(seconds)
+    stop.set()
+    elapsed = time.perf_counter() - started
+
+    ok = errors = 0
+    for _ in processes:
+        process_ok, process_errors = results.get()
+        ok += process_ok
+        errors += process_errors
+    for process in processes:
+        process.join()
+    return ok / elapsed, errors, elapsed
+
+
+def worker(args):
+    from bench_excel_export import seed_employees
+    from src.main import app
+    from src.models.hr_models import db
+    from src.utils.excel_export import write_employees_xlsx
+    from src.utils.excel_import import import_employees_xlsx
+
+    with app.app_context():
+        seed_employees(args.rows)
+        workbook = io.BytesIO()
+        write_employees_xlsx(workbook)
+        db.session.remove()
+
+    idle_rate, _, _ = measure_reads(args.rows, args.readers, seconds=5)
+
+    def run_import():
+        with app.app_context():
+            workbook.seek(0)
+            import_employees_xlsx(workbook, chunk_size=args.chunk_size)
+            db.session.remove()
+
+    busy_rate, errors, elapsed = measure_reads(args.rows, args.readers, writer=run_import)
+    profile = os.environ.get('HR_DB_PROFILE', 'default')
+    print(f"{profile:>10} {idle_rate:>12.0f} {busy_rate:>14.0f} {errors:>7} {elapsed:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--profiles', nargs='+', default=['default', 'production'])
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    print(f"{'profile':>10} {'idle reads/s':>12} {'import reads/s':>14} {'errors':>7} {'import s':>11}")
+    for profile in args.profiles:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ)
+            env['HR_DB_PROFILE'] = profile
+            env['HR_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--worker',
+                 '--rows', str(args.rows), '--readers', str(args.readers), '--chunk-size', str(args.chunk_size)],
+                env=env, check=True,
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+مقارنة مسار تصدير Excel السابق (مصنف كامل في الذاكرة) بمسار الكتابة فقط.
+
+الاستخدام:
+    python benchmarks/bench_excel_export.py --rows 10000 100000
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from openpyxl import Workbook
+from openpyxl.styles import Font, Alignment
+from src.models.hr_models import db, Employee
+from src.utils.excel_export import EMPLOYEE_EXCEL_COLUMNS, write_employees_xlsx
+
+
+def make_app(db_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{db_path}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed_employees(rows):
+    departments = ['الموارد البشرية', 'المالية', 'تقنية المعلومات', 'المبيعات', 'الشؤون القانونية']
+    batch = []
+    for i in range(1, rows + 1):
+        batch.append({
+            'employee_id': i,
+            'full_name': f'موظف رقم {i} محمد أحمد',
+            'national_id': f'2900{i:010d}',
+            'job_title': 'محاسب أول',
+            'qualification': 'بكالوريوس تجارة',
+            'hire_date': date(2015 + i % 10, 1 + i % 12, 1 + i % 28),
+            'points_count': i % 7,
+            'years_of_experience': i % 30,
+            'actual_salary': 5000.0 + i % 4000,
+            'department': departments[i % len(departments)],
+            'email': f'employee{i}@example.com',
+            'phone': f'010{i:08d}',
+        })
+        if len(batch) == 5000:
+            db.session.execute(Employee.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Employee.__table__.insert(), batch)
+    db.session.commit()
+
+
+def legacy_export():
+    """نسخة من مسار التصدير السابق للمقارنة فقط."""
+    employees = Employee.query.all()
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "بيانات الموظفين"
+    ws.append([header for header, _ in EMPLOYEE_EXCEL_COLUMNS])
+    header_font = Font(bold=True)
+    for cell in ws[1]:
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center')
+    for emp in employees:
+        emp_dict = emp.to_dict()
+        ws.append([emp_dict.get(field) for _, field in EMPLOYEE_EXCEL_COLUMNS])
+    for col in ws.columns:
+        max_length = 0
+        column = col[0].column_letter
+        for cell in col:
+            if len(str(cell.value)) > max_length:
+                max_length = len(str(cell.value))
+        ws.column_dimensions[column].width = (max_length + 2) * 1.2
+    output = io.BytesIO()
+    wb.save(output)
+    return output
+
+
+def streaming_export():
+    with tempfile.TemporaryFile() as output:
+        write_employees_xlsx(output)
+
+
+def measure(func, trace_memory):
+    """يعيد (الثواني، ذروة الذاكرة بالميجابايت). تتبع الذاكرة يبطئ التنفيذ فيُقاس الزمن بدونه."""
+    db.session.expunge_all()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+
+    peak = None
+    if trace_memory:
+        db.session.expunge_all()
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak = peak / (1024 * 1024)
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--no-memory', action='store_true', help='تخطي قياس ذروة الذاكرة')
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'path':>10} {'seconds':>9} {'peak MB':>9}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = make_app(os.path.join(tmp, 'bench.db'))
+            with app.app_context():
+                db.create_all()
+                seed_employees(rows)
+                for name, func in (('legacy', legacy_export), ('streaming', streaming_export)):
+                    elapsed, peak = measure(func, not args.no_memory)
+                    peak = f"{peak:>9.1f}" if peak is not None else f"{'-':>9}"
+                    print(f"{rows:>8} {name:>10} {elapsed:>9.2f} {peak}")
+                db.session.remove()
+                db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,418 @@
+"""
+قياس زمن الاستجابة لكل مسارات hr_bp عبر Flask test client على قاعدة بيانات
+مولّدة بـ generate_data.py: p50/p95 بالميلي ثانية، الصفوف في الثانية، والذاكرة
+التي أضافها كل سيناريو (ذروة RSS أثناءه ناقص RSS عند بدايته). المسارات التي تكتب تُشغَّل بعد مسارات
+القراءة، فاستخدم نسخة من قاعدة البيانات إن أردت إعادة القياس على نفس البيانات.
+
+خط الأساس المرفق benchmarks/baseline.json مقاس على قاعدة بيانات 1000 موظف وسنة
+واحدة بالبذرة 42 و 20 تكراراً (القيم في "meta" داخل الملف). الأزمنة تعتمد على
+الجهاز، فأعد توليده على جهاز CI نفسه عند تغييره. الفحص يفشل (رمز خروج 1) إذا
+تجاوز p50 لأي سيناريو خط الأساس بأكثر من --threshold وبأكثر من --min-delta-ms
+(--metric p95_ms للمقارنة بـ p95 مع عدد تكرارات أكبر).
+
+الاستخدام:
+    python benchmarks/generate_data.py --db /tmp/hr_bench.db --employees 1000 --years 1 --seed 42
+    python benchmarks/bench_routes.py --db /tmp/hr_bench.db --baseline benchmarks/baseline.json --threshold 1.25
+    python benchmarks/bench_routes.py --db /tmp/hr_bench.db --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import io
+from contextlib import closing
+import json
+import os
+import platform
+import resource
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLE_EMPLOYEE = 1
+SAMPLE_DEPARTMENT = 'المالية'
+
+
+class Scenario:
+    """
+    طلب واحد يُكرر. body و url_id دوال في (حالة مشتركة، رقم التكرار)، و url_id
+    يُعوَّض عن {id} في الرابط. ok_statuses رموز HTTP المقبولة غير 2xx.
+    """
+
+    def __init__(self, name, method, url, body=None, url_id=None, content_type=None, iterations=None, ok_statuses=()):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.body = body
+        self.url_id = url_id
+        self.content_type = content_type
+        self.iterations = iterations
+        self.ok_statuses = ok_statuses
+
+
+def _new_employee(state, i):
+    state['next_id'] += 1
+    return {'employee_id': state['next_id'], 'full_name': f'موظف قياس {state["next_id"]}', 'hire_date': '2024-01-01'}
+
+
+def _punches(state, i):
+    lines = ['employee_id,timestamp']
+    for employee_id in range(1, 1001):
+        lines.append(f"{employee_id},2026-01-{1 + i % 28:02d}T08:{employee_id % 50:02d}:00")
+        lines.append(f"{employee_id},2026-01-{1 + i % 28:02d}T16:{employee_id % 50:02d}:00")
+    return '\n'.join(lines)
+
+
+def _leave_request(state, i):
+    day = 1 + i % 28
+    return {
+        'employee_id': state['leave_employee'] + i, 'leave_type': 'casual',
+        'start_date': f'2027-02-{day:02d}', 'end_date': f'2027-02-{day:02d}', 'days_requested': 1,
+    }
+
+
+def _pending_request(state, i):
+    return state['pending'].pop()
+
+
+def _excel_file(state, i):
+    return {'file': (io.BytesIO(state['workbook']), 'employees.xlsx')}
+
+
+def _document_file(state, i):
+    state['documents'] += 1
+    return {
+        'document_number': f"قياس-{state['first_document'] + state['documents']}", 'document_type': 'letter',
+        'employee_id': str(SAMPLE_EMPLOYEE), 'file': (io.BytesIO(state['document'] + str(i).encode()), 'letter.pdf'),
+    }
+
+
+def scenarios():
+    """كل مسارات hr_bp بشكل الاستخدام المعتاد. الكتابة في النهاية والحذف آخراً."""
+    department = SAMPLE_DEPARTMENT
+    return [
+        Scenario('employees page', 'GET', '/api/employees?limit=100&after=100'),
+        Scenario('employees default page', 'GET', '/api/employees'),
+        Scenario('employees max page', 'GET', '/api/employees?limit=1000', iterations=5),
+        Scenario('employees stream ndjson', 'GET', '/api/employees?stream=ndjson&fields=employee_id,full_name,department', iterations=3),
+        Scenario('employees page with includes', 'GET', '/api/employees?limit=100&include=leave_management,leave_requests'),
+        Scenario('employee by id', 'GET', f'/api/employees/{SAMPLE_EMPLOYEE}'),
+        Scenario('employee with attendance', 'GET', f'/api/employees/{SAMPLE_EMPLOYEE}?include=leave_management,attendance_records'),
+        Scenario('employee search', 'GET', '/api/employees/search?q=محمد&limit=50'),
+        Scenario('employee search by department', 'GET', f'/api/employees/search?department={department}&limit=100'),
+        Scenario('employees by department', 'GET', f'/api/employees_by_department/{department}'),
+        Scenario('departments', 'GET', '/api/departments'),
+        Scenario('departments list', 'GET', '/api/departments_list'),
+        Scenario('leave management page', 'GET', '/api/leave-management?limit=100'),
+        Scenario('leave management by employee', 'GET', f'/api/leave-management/{SAMPLE_EMPLOYEE}'),
+        Scenario('leave requests page', 'GET', '/api/leave-requests?limit=100&after=1000'),
+        Scenario('leave calendar', 'GET', f'/api/leave-requests/calendar?from=2025-06-01&to=2025-06-30&department={department}'),
+        Scenario('attendance page', 'GET', '/api/attendance?limit=1000&after=10000'),
+        Scenario('attendance stream', 'GET', '/api/attendance?stream=ndjson', iterations=1),
+        Scenario('attendance by employee month', 'GET', f'/api/attendance/{SAMPLE_EMPLOYEE}?from=2025-06-01&to=2025-06-30'),
+        Scenario('attendance summary by department', 'GET', '/api/attendance/summary?from=2025-01&to=2025-12&group=department'),
+        Scenario('statistics', 'GET', '/api/statistics'),
+        Scenario('export excel', 'GET', '/api/employees/export', iterations=1),
+        Scenario('export attendance csv', 'GET', '/api/export/attendance?format=csv', iterations=1),
+        Scenario('export leave requests ndjson', 'GET', '/api/export/leave_requests?format=ndjson&from=2025-01-01', iterations=3),
+        Scenario('add employee', 'POST', '/api/employees', body=_new_employee),
+        Scenario('update employee', 'PUT', f'/api/employees/{SAMPLE_EMPLOYEE}', body=lambda state, i: {'notes': f'تحديث {i}'}),
+        Scenario('batch add employees', 'POST', '/api/employees/batch',
+                 body=lambda state, i: [_new_employee(state, i) for _ in range(1000)], iterations=3),
+        Scenario('batch update employees', 'PUT', '/api/employees/batch',
+                 body=lambda state, i: [{'employee_id': e, 'notes': f'دفعة {i}'} for e in range(1, 1001)], iterations=3),
+        Scenario('import excel', 'POST', '/api/employees/import', body=_excel_file,
+                 content_type='multipart/form-data', iterations=1),
+        Scenario('ingest punches', 'POST', '/api/attendance/ingest', body=_punches, content_type='text/csv', iterations=5),
+        Scenario('add leave request', 'POST', '/api/leave-requests', body=_leave_request),
+        # الاعتماد قد يُرفض بـ 409 إذا استُنفد الرصيد في البيانات المولّدة
+        Scenario('approve leave', 'POST', '/api/leave-requests/{id}/approve', url_id=_pending_request, ok_statuses=(409,)),
+        Scenario('reject leave', 'POST', '/api/leave-requests/{id}/reject', url_id=_pending_request),
+        Scenario('recompute leave balances', 'POST', '/api/leave-management/recompute', iterations=3),
+        Scenario('rebuild statistics', 'POST', '/api/statistics/rebuild', iterations=3),
+        Scenario('add document', 'POST', '/api/documents', body=_document_file,
+                 content_type='multipart/form-data', iterations=5),
+        Scenario('replace document content', 'PUT', '/api/documents/{id}/content',
+                 url_id=lambda state, i: state['first_document'] + 1, body=lambda state, i: state['document'],
+                 content_type='application/pdf', iterations=5),
+        Scenario('documents page', 'GET', f'/api/documents?employee_id={SAMPLE_EMPLOYEE}&limit=100'),
+        Scenario('document by id', 'GET', '/api/documents/{id}', url_id=lambda state, i: state['first_document'] + 1),
+        Scenario('document content', 'GET', '/api/documents/{id}/content', url_id=lambda state, i: state['first_document'] + 1),
+        Scenario('submit export job', 'POST', '/api/jobs/employees-export', iterations=3),
+        Scenario('jobs list', 'GET', '/api/jobs'),
+        # المهمة الأولى قد تكون ما زالت تعمل، فلا يوجد ناتج بعد (409)
+        Scenario('job status', 'GET', '/api/jobs/{id}', url_id=lambda state, i: 1),
+        Scenario('job artifact', 'GET', '/api/jobs/{id}/artifact', url_id=lambda state, i: 1, iterations=1, ok_statuses=(409,)),
+        Scenario('delete employee', 'DELETE', '/api/employees/{id}', url_id=lambda state, i: state['next_id'] - i),
+        Scenario('batch delete employees', 'DELETE', '/api/employees/batch',
+                 body=lambda state, i: list(range(state['next_id'] - 1000 * (i + 1), state['next_id'] - 1000 * i)),
+                 iterations=2),
+    ]
+
+
+def _consume(response):
+    """
+    قراءة الاستجابة كاملة (المبثوثة تنفذ استعلاماتها أثناء القراءة) دون الاحتفاظ
+    بجسمها. يعيد (عدد الصفوف، أول 200 بايت).
+    """
+    lines = 0
+    head = b''
+    # JSON يُحلَّل لعدّ عناصره؛ NDJSON و CSV تُعدّ أسطرهما أثناء البث
+    body = [] if response.mimetype == 'application/json' else None
+    for chunk in response.iter_encoded():
+        if len(head) < 200:
+            head += chunk[:200 - len(head)]
+        if body is None:
+            lines += chunk.count(b'\n')
+        else:
+            body.append(chunk)
+    response.close()
+
+    if response.mimetype == 'application/x-ndjson':
+        return lines, head
+    if response.mimetype == 'text/csv':
+        return lines - 1, head
+    if body is None:
+        return 1, head
+    try:
+        data = json.loads(b''.join(body))
+    except ValueError:
+        return 1, head
+    if isinstance(data, list):
+        return len(data), head
+    if isinstance(data, dict):
+        counts = [value for key, value in data.items() if key.endswith('_count') and key != 'errors_count']
+        if counts:
+            return sum(counts), head
+    return 1, head
+
+
+def _reset_peak_rss():
+    """تصفير ذروة RSS للعملية (VmHWM، على Linux فقط). يعيد False إن لم يكن مدعوماً."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _rss_kb():
+    """(RSS الحالي، ذروة RSS) بالكيلوبايت. بدون /proc: (None، ru_maxrss للعملية كلها)."""
+    try:
+        with open('/proc/self/status') as f:
+            fields = dict(line.split(':', 1) for line in f)
+        return int(fields['VmRSS'].split()[0]), int(fields['VmHWM'].split()[0])
+    except (OSError, KeyError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss بالبايت على macOS وبالكيلوبايت على Linux
+        return None, peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _request(client, scenario, state, i):
+    url = scenario.url
+    if scenario.url_id:
+        url = url.format(id=scenario.url_id(state, i))
+    body = scenario.body(state, i) if scenario.body else None
+
+    if scenario.content_type:
+        return client.open(url, method=scenario.method, data=body, content_type=scenario.content_type)
+    if body is not None:
+        return client.open(url, method=scenario.method, json=body)
+    return client.open(url, method=scenario.method)
+
+
+def run_scenario(client, scenario, state, iterations):
+    latencies = []
+    rows = 0
+    # ru_maxrss ذروة العملية منذ بدايتها، فتُصفَّر الذروة لكل سيناريو. إن لم يكن
+    # ذلك ممكناً يُقاس ارتفاع الذروة فقط (صفر إن بلغت سيناريوهات سابقة أكثر منه)
+    # طلب إحماء غير محسوب لمسارات القراءة: مع 20 تكراراً يكون p95 هو أبطأ طلب،
+    # فلا يُترك لأول طلب بارد أن يقرر نتيجة الفحص
+    if scenario.method == 'GET':
+        _consume(_request(client, scenario, state, 0))
+    reset = _reset_peak_rss()
+    start_rss, start_peak = _rss_kb()
+    for i in range(scenario.iterations or iterations):
+        started = time.perf_counter()
+        response = _request(client, scenario, state, i)
+        count, head = _consume(response)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400 and response.status_code not in scenario.ok_statuses:
+            raise RuntimeError(f"{scenario.name}: HTTP {response.status_code} {head!r}")
+        rows += count
+    _, end_peak = _rss_kb()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        'rows_per_s': rows / total if total else 0,
+        'rss_delta_mb': max(0, end_peak - (start_rss if reset else start_peak)) / 1024,
+    }
+
+
+def prepare_state(app):
+    from src.models.hr_models import db, Employee, LeaveRequest, Document
+    from src.utils.excel_export import write_employees_xlsx
+
+    with app.app_context():
+        max_id = db.session.execute(db.select(db.func.max(Employee.employee_id))).scalar() or 0
+        max_document = db.session.execute(db.select(db.func.max(Document.id))).scalar() or 0
+        pending = db.session.execute(
+            db.select(LeaveRequest.id).where(LeaveRequest.status == 'pending').order_by(LeaveRequest.id).limit(1000)
+        ).scalars().all()
+        workbook = io.BytesIO()
+        write_employees_xlsx(workbook)
+        db.session.remove()
+    return {
+        'next_id': max_id + 1000,
+        'leave_employee': 1,
+        'pending': list(pending),
+        'workbook': workbook.getvalue(),
+        'first_document': max_document,
+        'documents': 0,
+        'document': os.urandom(512 * 1024),
+    }
+
+
+def check_coverage(app, scenario_list):
+    """المسارات المسجلة في hr_bp التي ليس لها سيناريو قياس."""
+    covered = set()
+    for scenario in scenario_list:
+        adapter = app.url_map.bind('localhost')
+        endpoint, _ = adapter.match(scenario.url.split('?')[0].format(id=1), method=scenario.method)
+        covered.add((endpoint, scenario.method))
+    missing = []
+    for rule in app.url_map.iter_rules():
+        if not rule.endpoint.startswith('hr.'):
+            continue
+        for method in rule.methods - {'HEAD', 'OPTIONS'}:
+            if (rule.endpoint, method) not in covered:
+                missing.append(f"{method} {rule.rule}")
+    return missing
+
+
+def copy_database(source, target):
+    """
+    نسخ قاعدة البيانات بواجهة النسخ الاحتياطي في SQLite: نسخ الملف وحده يُسقط
+    ما لم يُنقل بعد من ملف -wal (الملف الشخصي production يستخدم WAL).
+    """
+    with closing(sqlite3.connect(source)) as src, closing(sqlite3.connect(target)) as dst:
+        src.backup(dst)
+    return target
+
+
+def describe_run(app, iterations):
+    """حجم البيانات وبيئة القياس، تُحفظ مع خط الأساس في "meta"."""
+    from sqlalchemy import text
+    from src.models.hr_models import db
+
+    with app.app_context():
+        counts = {
+            table: db.session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            for table in ('employees', 'attendance', 'leave_requests')
+        }
+        sqlite_version = db.session.execute(text("SELECT sqlite_version()")).scalar()
+        db.session.remove()
+    return {
+        'rows': counts,
+        'iterations': iterations,
+        'db_profile': os.environ.get('HR_DB_PROFILE'),
+        'python': platform.python_version(),
+        'sqlite': sqlite_version,
+        'machine': platform.machine(),
+    }
+
+
+def load_baseline(path):
+    """يعيد (meta، النتائج) من ملف خط الأساس. الملفات القديمة كانت النتائج وحدها."""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if 'scenarios' in data:
+        return data.get('meta', {}), data['scenarios']
+    return {}, data
+
+
+def compare(results, baseline, threshold, min_delta_ms=0, metric='p50_ms'):
+    """
+    يعيد قائمة السيناريوهات التي تجاوز فيها metric خط الأساس بأكثر من threshold
+    وبفرق مطلق أكبر من min_delta_ms (حتى لا يُعد تذبذب المسارات السريعة تراجعاً).
+    """
+    regressions = []
+    print(f"\n{'scenario':<34} {metric.replace('_ms', ' ms'):>9} {'baseline':>9} {'ratio':>7}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        ratio = result[metric] / base[metric] if base[metric] else 1
+        regressed = ratio > threshold and result[metric] - base[metric] > min_delta_ms
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{name:<34} {result[metric]:>9.2f} {base[metric]:>9.2f} {ratio:>6.2f}x{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', required=True, help='قاعدة بيانات مولّدة بـ generate_data.py')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--only', nargs='+', help='تشغيل السيناريوهات التي تحتوي أسماؤها على هذه الكلمات')
+    parser.add_argument('--in-place', action='store_true', help='القياس على القاعدة نفسها بدلاً من نسخة مؤقتة')
+    parser.add_argument('--baseline', help='ملف JSON لنتائج سابقة للمقارنة')
+    parser.add_argument('--save-baseline', help='حفظ النتائج في ملف JSON')
+    parser.add_argument('--threshold', type=float, default=1.25, help='نسبة المقياس إلى خط الأساس التي تُعتبر تراجعاً')
+    parser.add_argument('--metric', choices=('p50_ms', 'p95_ms'), default='p50_ms',
+                        help='المقياس الذي يُقارن بخط الأساس؛ p95 من 20 تكراراً هو أبطأ طلب وحده فيتذبذب كثيراً')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='أقل فرق مطلق في p95 (ميلي ثانية) يُعتبر تراجعاً')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.abspath(args.db)
+        if not args.in_place:
+            # مسارات الكتابة تغيّر البيانات، فالقياس يتم على نسخة
+            db_path = copy_database(db_path, os.path.join(tmp, 'bench.db'))
+        os.environ['HR_DATABASE_URI'] = f"sqlite:///{db_path}"
+        os.environ.setdefault('HR_DB_PROFILE', 'production')
+        os.environ.setdefault('HR_BLOBS_DIR', os.path.join(tmp, 'blobs'))
+
+        from src.main import app
+
+        scenario_list = scenarios()
+        missing = check_coverage(app, scenario_list)
+        if missing:
+            print(f"routes without a scenario: {', '.join(missing)}")
+        if args.only:
+            scenario_list = [s for s in scenario_list if any(word in s.name for word in args.only)]
+
+        meta = describe_run(app, args.iterations)
+        state = prepare_state(app)
+        client = app.test_client()
+        results = {}
+        print(f"{'scenario':<34} {'p50 ms':>9} {'p95 ms':>9} {'rows/s':>11} {'RSS delta MB':>12}")
+        for scenario in scenario_list:
+            result = run_scenario(client, scenario, state, args.iterations)
+            results[scenario.name] = result
+            print(f"{scenario.name:<34} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                  f"{result['rows_per_s']:>11.0f} {result['rss_delta_mb']:>12.1f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'meta': meta, 'scenarios': results}, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+    if args.baseline:
+        baseline_meta, baseline = load_baseline(args.baseline)
+        if baseline_meta.get('rows') and baseline_meta['rows'] != meta['rows']:
+            print(f"warning: baseline was measured on {baseline_meta['rows']}, this database has {meta['rows']}")
+        if compare(results, baseline, args.threshold, args.min_delta_ms, args.metric):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
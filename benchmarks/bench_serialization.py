@@ -0,0 +1,90 @@
+"""
+مقارنة تحويل القوائم إلى JSON: كائنات ORM كاملة مع to_dict() ومُرمِّز json القياسي
+مقابل صفوف الأعمدة مع row_encoder و orjson (إن كان مثبتاً).
+
+الاستخدام:
+    python benchmarks/bench_serialization.py --rows 10000 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_excel_export import make_app, seed_employees
+from src.models.hr_models import db, Employee, Attendance
+from src.models.serialization import row_encoder
+from src.utils.json_provider import orjson
+
+
+def seed_attendance(rows):
+    start = date(2024, 1, 1)
+    batch = []
+    for i in range(rows):
+        day = start + timedelta(days=i // 1000)
+        batch.append({
+            'employee_id': 1 + i % 1000,
+            'date': day,
+            'check_in_time': datetime(day.year, day.month, day.day, 8, i % 60).time(),
+            'check_out_time': datetime(day.year, day.month, day.day, 16, i % 60).time(),
+            'working_hours': 8.0,
+            'late_minutes': i % 15,
+            'status': 'present',
+            'created_at': datetime(day.year, day.month, day.day, 16, 30),
+        })
+        if len(batch) == 5000:
+            db.session.execute(Attendance.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Attendance.__table__.insert(), batch)
+    db.session.commit()
+
+
+def legacy_json(model):
+    """المسار السابق: تحميل كائنات ORM ثم to_dict() لكل كائن."""
+    return json.dumps([obj.to_dict() for obj in model.query.all()], ensure_ascii=False)
+
+
+def column_json(model):
+    columns = [model.__table__.c[name] for name in model.serialize_fields()]
+    encode = row_encoder(model)
+    rows = [encode(row) for row in db.session.execute(db.select(*columns))]
+    if orjson is not None:
+        return orjson.dumps(rows)
+    return json.dumps(rows, ensure_ascii=False)
+
+
+def measure(func, model):
+    db.session.expunge_all()
+    started = time.perf_counter()
+    func(model)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'table':>11} {'legacy s':>9} {'columns s':>10} {'speedup':>8}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = make_app(os.path.join(tmp, 'bench.db'))
+            with app.app_context():
+                db.create_all()
+                seed_employees(rows)
+                seed_attendance(rows)
+                for model in (Employee, Attendance):
+                    legacy = measure(legacy_json, model)
+                    columns = measure(column_json, model)
+                    print(f"{rows:>8} {model.__tablename__:>11} {legacy:>9.2f} {columns:>10.2f} {legacy / columns:>7.1f}x")
+                db.session.remove()
+                db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
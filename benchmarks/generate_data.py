@@ -0,0 +1,201 @@
+"""
+توليد قاعدة بيانات تجريبية حتمية (نفس البذرة = نفس البيانات) بأسماء عربية
+وأقسام وسجلات حضور وطلبات إجازة على مدى عدة سنوات، لقياس أداء المسارات.
+
+الاستخدام:
+    python benchmarks/generate_data.py --db /tmp/hr_bench.db --employees 1000 --years 2
+    python benchmarks/generate_data.py --db /tmp/hr_big.db --employees 1000000 --years 0.25
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIRST_NAMES = [
+    'محمد', 'أحمد', 'محمود', 'مصطفى', 'علي', 'حسن', 'حسين', 'إبراهيم', 'يوسف', 'عمر',
+    'خالد', 'طارق', 'ياسر', 'عبد الله', 'عبد الرحمن', 'سامي', 'هشام', 'وائل', 'كريم', 'أيمن',
+    'فاطمة', 'مريم', 'عائشة', 'زينب', 'نور', 'سارة', 'هدى', 'منى', 'إيمان', 'أسماء',
+    'رحاب', 'دعاء', 'آية', 'ياسمين', 'هبة', 'شيماء', 'نادية', 'سلمى', 'رانيا', 'ليلى',
+]
+FAMILY_NAMES = [
+    'السيد', 'عبد العزيز', 'الشافعي', 'المصري', 'النجار', 'الحداد', 'العطار', 'الشريف',
+    'عبد الحميد', 'إسماعيل', 'سليمان', 'منصور', 'رمضان', 'عثمان', 'فؤاد', 'جمال',
+    'الجمال', 'البنا', 'الفقي', 'حمدي', 'زكي', 'بدوي', 'شحاتة', 'عيسى',
+]
+DEPARTMENTS = [
+    'الموارد البشرية', 'المالية', 'تقنية المعلومات', 'المبيعات', 'الشؤون القانونية',
+    'المشتريات', 'خدمة العملاء', 'التسويق', 'الإنتاج', 'الجودة', 'المخازن', 'الصيانة',
+    'الأمن', 'العلاقات العامة', 'التدريب', 'التخطيط',
+]
+JOB_TITLES = ['محاسب', 'محاسب أول', 'مهندس', 'مهندس أول', 'أخصائي', 'مدير', 'مشرف', 'فني', 'سكرتير', 'مندوب']
+QUALIFICATIONS = ['بكالوريوس تجارة', 'بكالوريوس هندسة', 'ليسانس حقوق', 'بكالوريوس حاسبات', 'دبلوم فني', 'ماجستير']
+LEAVE_TYPES = [('annual', 6), ('casual', 3), ('sick', 2), ('other', 1)]
+
+SHIFT_START_MINUTES = 8 * 60
+BATCH_SIZE = 5000
+# الجمعة والسبت عطلة أسبوعية
+WEEKEND = (4, 5)
+
+
+def insert_batches(table, rows):
+    from src.models.hr_models import db
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            db.session.execute(table.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(table.insert(), batch)
+    db.session.commit()
+
+
+def generate_employees(rng, count, start):
+    for employee_id in range(1, count + 1):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(FIRST_NAMES)} {rng.choice(FAMILY_NAMES)}"
+        hire_date = start - timedelta(days=rng.randint(0, 365 * 20))
+        salary = round(rng.uniform(4000, 30000), 2)
+        allowances = round(salary * rng.uniform(0.05, 0.3), 2)
+        yield {
+            'employee_id': employee_id,
+            'full_name': name,
+            'national_id': f"2{rng.randint(60, 99):02d}{employee_id:011d}",
+            'job_title': rng.choice(JOB_TITLES),
+            'qualification': rng.choice(QUALIFICATIONS),
+            'hire_date': hire_date,
+            'points_count': rng.randint(0, 10),
+            'years_of_experience': (start - hire_date).days // 365,
+            'actual_salary': salary,
+            'basic_salary': salary,
+            'allowances': allowances,
+            'total_salary': round(salary + allowances, 2),
+            'department': DEPARTMENTS[employee_id % len(DEPARTMENTS)],
+            'department_code': f"D{employee_id % len(DEPARTMENTS):02d}",
+            'email': f"employee{employee_id}@example.com",
+            'phone': f"01{rng.randint(0, 2)}{employee_id:08d}",
+            'nationality': 'مصري',
+            'marital_status': rng.choice(['أعزب', 'متزوج', 'متزوج', 'مطلق']),
+            'children_count': rng.randint(0, 4),
+            'created_at': datetime(start.year, start.month, start.day),
+            'updated_at': datetime(start.year, start.month, start.day),
+        }
+
+
+def generate_attendance(rng, employees, days):
+    """يوم عمل لكل موظف: دخول بين 07:45 و 08:45 تقريباً، خروج بعد 8 ساعات تقريباً، وغياب نادر."""
+    for day in days:
+        created_at = datetime(day.year, day.month, day.day, 18)
+        for employee_id in range(1, employees + 1):
+            if rng.random() < 0.03:
+                yield {
+                    'employee_id': employee_id, 'date': day, 'check_in_time': None, 'check_out_time': None,
+                    'working_hours': None, 'late_minutes': None, 'status': 'absent', 'created_at': created_at,
+                }
+                continue
+            check_in = SHIFT_START_MINUTES - 15 + int(rng.expovariate(1 / 12))
+            check_out = check_in + rng.randint(7 * 60 + 30, 9 * 60)
+            late_minutes = max(0, check_in - SHIFT_START_MINUTES)
+            yield {
+                'employee_id': employee_id,
+                'date': day,
+                'check_in_time': datetime.min.replace(hour=check_in // 60, minute=check_in % 60).time(),
+                'check_out_time': datetime.min.replace(hour=min(check_out // 60, 23), minute=check_out % 60).time(),
+                'working_hours': round((check_out - check_in) / 60, 2),
+                'late_minutes': late_minutes,
+                'status': 'late' if late_minutes else 'on_time',
+                'created_at': created_at,
+            }
+
+
+def generate_leave_requests(rng, employees, start, end, per_year):
+    """طلبات إجازة غير متقاطعة لكل موظف، أغلبها معتمد."""
+    kinds = [kind for kind, weight in LEAVE_TYPES for _ in range(weight)]
+    span = (end - start).days
+    requests_per_employee = max(1, round(per_year * span / 365))
+    for employee_id in range(1, employees + 1):
+        cursor = start
+        for _ in range(requests_per_employee):
+            cursor += timedelta(days=rng.randint(1, max(2, span // requests_per_employee)))
+            length = rng.randint(1, 5)
+            if cursor + timedelta(days=length) > end:
+                break
+            requested_at = datetime(cursor.year, cursor.month, cursor.day) - timedelta(days=rng.randint(1, 20))
+            status = rng.choices(['approved', 'rejected', 'pending'], weights=[85, 10, 5])[0]
+            yield {
+                'employee_id': employee_id,
+                'leave_type': rng.choice(kinds),
+                'start_date': cursor,
+                'end_date': cursor + timedelta(days=length - 1),
+                'days_requested': length,
+                'reason': 'ظروف خاصة',
+                'status': status,
+                'requested_at': requested_at,
+                'approved_by': None if status == 'pending' else 1,
+                'approved_at': None if status == 'pending' else requested_at + timedelta(days=1),
+            }
+            cursor += timedelta(days=length)
+
+
+def generate(employees, years, seed, leave_per_year):
+    from src.models.hr_models import db, Employee, Department, Attendance, LeaveRequest
+    from src.models.leave_workflow import recompute_leave_balances
+
+    rng = random.Random(seed)
+    end = date(2025, 12, 31)
+    start = end - timedelta(days=int(365 * years))
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    workdays = [day for day in days if day.weekday() not in WEEKEND]
+
+    steps = [
+        ('departments', lambda: insert_batches(Department.__table__, [
+            {'name': name, 'description': f"إدارة {name}", 'manager_id': index + 1, 'created_at': datetime(start.year, 1, 1)}
+            for index, name in enumerate(DEPARTMENTS)
+        ])),
+        ('employees', lambda: insert_batches(Employee.__table__, generate_employees(rng, employees, start))),
+        ('attendance', lambda: insert_batches(Attendance.__table__, generate_attendance(rng, employees, workdays))),
+        ('leave_requests', lambda: insert_batches(
+            LeaveRequest.__table__, generate_leave_requests(rng, employees, start, end, leave_per_year)
+        )),
+        ('leave_management', recompute_leave_balances),
+    ]
+    for name, step in steps:
+        started = time.perf_counter()
+        step()
+        count = db.session.execute(db.text(f"SELECT COUNT(*) FROM {name}")).scalar()
+        print(f"{name:>16} {count:>12} rows {time.perf_counter() - started:>9.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', required=True, help='مسار قاعدة البيانات (تُستبدل إن كانت موجودة)')
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--years', type=float, default=1, help='عدد سنوات سجل الحضور والإجازات')
+    parser.add_argument('--leave-per-year', type=float, default=4, help='متوسط طلبات الإجازة لكل موظف في السنة')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # ملفات WAL القديمة بجانب قاعدة محذوفة تُطبَّق على القاعدة الجديدة
+    for path in (args.db, f"{args.db}-wal", f"{args.db}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+    os.environ['HR_DATABASE_URI'] = f"sqlite:///{os.path.abspath(args.db)}"
+    os.environ.setdefault('HR_DB_PROFILE', 'production')
+
+    from src.main import app
+    from src.models.hr_models import db
+
+    with app.app_context():
+        generate(args.employees, args.years, args.seed, args.leave_per_year)
+        # نقل محتوى WAL إلى ملف القاعدة حتى يكون نسخه وحده كافياً
+        db.session.execute(db.text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        db.session.remove()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import os
+import re
+
+# إعدادات قاعدة البيانات تُقرأ من متغيرات البيئة:
+#   HR_DATABASE_URI      رابط قاعدة البيانات (الافتراضي src/database/hr_system.db)
+#   HR_DB_PROFILE        default (إعدادات SQLite الافتراضية) أو production
+#   HR_DB_JOURNAL_MODE, HR_DB_SYNCHRONOUS, HR_DB_BUSY_TIMEOUT,
+#   HR_DB_CACHE_SIZE, HR_DB_MMAP_SIZE      لتجاوز قيم الـ PRAGMA في الملف الشخصي
+#   HR_DB_POOL_SIZE, HR_DB_MAX_OVERFLOW    حجم مجمع الاتصالات
+
+DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'database', 'hr_system.db')
+# ملفات المهام الخلفية (الملفات المرفوعة ونواتج التصدير)، يمكن تغييره عبر HR_JOBS_DIR
+JOBS_DIR = os.path.join(os.path.dirname(__file__), 'database', 'jobs')
+# مخزن محتوى المستندات، يمكن تغييره عبر HR_BLOBS_DIR
+BLOBS_DIR = os.path.join(os.path.dirname(__file__), 'database', 'blobs')
+
+ENGINE_PROFILES = {
+    'default': {
+        'pragmas': {},
+        'engine_options': {},
+    },
+    'production': {
+        # WAL يسمح للقراءة بالاستمرار أثناء الكتابة (مثلاً أثناء الاستيراد)
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,   # بالميلي ثانية
+            'cache_size': -65536,   # قيمة سالبة = بالكيلوبايت (64MB)
+            'mmap_size': 268435456, # 256MB
+            'temp_store': 'MEMORY',
+        },
+        'engine_options': {
+            'pool_size': 10,
+            'max_overflow': 20,
+            'pool_timeout': 30,
+            'connect_args': {'check_same_thread': False, 'timeout': 5},
+        },
+    },
+}
+
+_PRAGMA_ENV = {
+    'journal_mode': 'HR_DB_JOURNAL_MODE',
+    'synchronous': 'HR_DB_SYNCHRONOUS',
+    'busy_timeout': 'HR_DB_BUSY_TIMEOUT',
+    'cache_size': 'HR_DB_CACHE_SIZE',
+    'mmap_size': 'HR_DB_MMAP_SIZE',
+}
+
+_POOL_ENV = {
+    'pool_size': 'HR_DB_POOL_SIZE',
+    'max_overflow': 'HR_DB_MAX_OVERFLOW',
+}
+
+_PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+
+def database_settings(environ=None):
+    """يعيد (رابط قاعدة البيانات، خيارات المحرك، قيم PRAGMA) حسب متغيرات البيئة."""
+    environ = os.environ if environ is None else environ
+
+    profile_name = environ.get('HR_DB_PROFILE', 'default')
+    if profile_name not in ENGINE_PROFILES:
+        raise ValueError(f"HR_DB_PROFILE غير معروف: {profile_name} (المتاح: {', '.join(ENGINE_PROFILES)})")
+    profile = ENGINE_PROFILES[profile_name]
+
+    pragmas = dict(profile['pragmas'])
+    for name, variable in _PRAGMA_ENV.items():
+        value = environ.get(variable)
+        if value:
+            if not _PRAGMA_VALUE.match(value):
+                raise ValueError(f"قيمة غير صالحة لـ {variable}: {value}")
+            pragmas[name] = value
+
+    engine_options = dict(profile['engine_options'])
+    for option, variable in _POOL_ENV.items():
+        if environ.get(variable):
+            engine_options[option] = int(environ[variable])
+
+    uri = environ.get('HR_DATABASE_URI') or f"sqlite:///{DATABASE_PATH}"
+    return uri, engine_options, pragmas
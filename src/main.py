@@ -3,41 +3,115 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_cors import CORS
+from src.config import BLOBS_DIR, JOBS_DIR, database_settings
 from src.models.hr_models import db
+from src.models.migrations import run_migrations
+from src.models.document_blobs import referenced_blobs
+from src.models.query_plans import READ_REQUESTS, check_query_plans, uncovered_routes
 from src.routes.hr_routes import hr_bp
+from src.utils.sqlite_engine import install_sqlite_pragmas
+from src.utils.json_provider import install_json_provider
+from src.utils.metrics import install_metrics
+from src.utils.compression import install_compression
+from src.utils.jobs import job_runner
+from src.utils.blob_store import blob_store
+from src.utils.employee_cache import employee_cache
+from src.utils.static_assets import SPA_INDEX, asset_response, scan_static_folder
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
+# مُرمِّز JSON سريع (orjson) إن كان مثبتاً
+app.config['FAST_JSON'] = os.environ.get('HR_FAST_JSON', '1') != '0'
+install_json_provider(app)
+
+# قياسات المسارات واستعلامات SQL على /api/_metrics. HR_PROFILING=1 يتيح ?_profile=1
+app.config['METRICS'] = os.environ.get('HR_METRICS', '1') != '0'
+app.config['SLOW_QUERY_MS'] = float(os.environ.get('HR_SLOW_QUERY_MS', 100))
+app.config['PROFILING'] = os.environ.get('HR_PROFILING', '0') == '1'
+
+# الذاكرة المؤقتة للقوائم المنسدلة (الأقسام وموظفو كل قسم)، تُبطل بإصدارات الجداول
+app.config['DIRECTORY_CACHE'] = os.environ.get('HR_DIRECTORY_CACHE', '1') != '0'
+
 # تمكين CORS للسماح بالطلبات من الواجهة الأمامية
 CORS(app)
 
+# ضغط استجابات الـ API (gzip، و brotli إن كان مثبتاً) حسب Accept-Encoding
+app.config['COMPRESSION'] = os.environ.get('HR_COMPRESSION', '1') != '0'
+app.config['COMPRESS_LEVEL'] = int(os.environ.get('HR_COMPRESS_LEVEL', 6))
+app.config['COMPRESS_BROTLI_QUALITY'] = int(os.environ.get('HR_COMPRESS_BROTLI_QUALITY', 4))
+app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('HR_COMPRESS_MIN_SIZE', 1024))
+install_compression(hr_bp)
+
 # تسجيل مسارات الموارد البشرية
 app.register_blueprint(hr_bp, url_prefix='/api')
 
-# إعداد قاعدة البيانات
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'hr_system.db')}"
+# إعداد قاعدة البيانات (الملف الشخصي للمحرك يُختار عبر HR_DB_PROFILE، انظر src/config.py)
+database_uri, engine_options, sqlite_pragmas = database_settings()
+app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
 
+# مخزن محتوى المستندات (ملفات معنونة بـ SHA-256، انظر src/utils/blob_store.py)
+app.config['BLOBS_DIR'] = os.environ.get('HR_BLOBS_DIR') or BLOBS_DIR
+
+# إنشاء الجداول الناقصة وتطبيق ترحيلات المخطط (الفهارس، الإحصائيات، البحث)
+with app.app_context():
+    install_sqlite_pragmas(db.engine, sqlite_pragmas)
+    run_migrations()
+    install_metrics(app, db.engine)
+
+# ذاكرة سجلات الموظفين لـ GET /employees/<id> (LRU): الحد الأقصى للعدد (0 يعطلها) والصلاحية بالثواني
+app.config['EMPLOYEE_CACHE_SIZE'] = int(os.environ.get('HR_EMPLOYEE_CACHE_SIZE', 10000))
+app.config['EMPLOYEE_CACHE_TTL'] = float(os.environ.get('HR_EMPLOYEE_CACHE_TTL', 30))
+employee_cache.init_app(app)
+
+# المهام الخلفية (الاستيراد والتصدير وإعادة الحساب): عدد المهام المتزامنة وطول الطابور
+app.config['JOB_WORKERS'] = int(os.environ.get('HR_JOB_WORKERS', 1))
+app.config['MAX_QUEUED_JOBS'] = int(os.environ.get('HR_MAX_QUEUED_JOBS', 10))
+job_runner.init_app(app, os.environ.get('HR_JOBS_DIR') or JOBS_DIR)
+
+# فحص خطط تنفيذ استعلامات مسارات القراءة على قاعدة البيانات الحالية:
+# flask --app src.main check-query-plans (الاختبار الكامل في tests/test_query_plans.py)
+@app.cli.command("check-query-plans")
+def check_query_plans_command():
+    failures = check_query_plans(app)
+    for name, statements in failures.items():
+        print(f"FULL SCAN: {name}")
+        for statement, plan in statements:
+            print(f"    {' '.join(statement.split())[:200]}")
+            for line in plan:
+                print(f"        {line}")
+    missing = uncovered_routes(app, READ_REQUESTS)
+    if missing:
+        print(f"routes without a plan request: {', '.join(missing)}")
+    if failures or missing:
+        sys.exit(1)
+    print("All route queries use an index.")
+
+# حذف ملفات المخزن التي لم يعد أي مستند يشير إليها: flask --app src.main gc-blobs
+@app.cli.command("gc-blobs")
+def gc_blobs_command():
+    removed = blob_store().remove_unreferenced(referenced_blobs())
+    print(f"Removed {removed} unreferenced blob(s).")
+
+# الملفات الثابتة تُقرأ وتُضغط مسبقاً مرة واحدة عند البدء (انظر src/utils/static_assets.py)
+static_assets = scan_static_folder(app.static_folder)
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
+    if app.static_folder is None:
             return "Static folder not configured", 404
 
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
-
+    # أي مسار غير موجود يعيد index.html (تطبيق الصفحة الواحدة)
+    asset = static_assets.get(path) or static_assets.get(SPA_INDEX)
+    if asset is None:
+        return "index.html not found", 404
+    return asset_response(asset)
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
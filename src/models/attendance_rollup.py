@@ -0,0 +1,195 @@
+from sqlalchemy import func, inspect, text
+from src.models.hr_models import db
+
+# ملخص الحضور الشهري لكل موظف (attendance_monthly) ولكل قسم
+# (attendance_department_monthly) تحدّثهما الـ Triggers مع كل كتابة على جدول
+# الحضور (بما في ذلك استقبال البصمات والإدراج المجمّع). تقارير فترات الرواتب
+# تقرأ صفاً لكل موظف أو قسم وشهر بدلاً من سجلات الحضور اليومية.
+#
+# الشهر يُنسب إلى قسم الموظف عند كتابة أول سجل حضور له في ذلك الشهر (يُحفظ في
+# attendance_monthly.department)، فنقل الموظف لاحقاً لا ينقل الشهور السابقة إلى
+# قسمه الجديد. إعادة البناء الكاملة لا تعرف الأقسام السابقة فتستخدم القسم الحالي.
+
+
+class AttendanceMonthly(db.Model):
+    __tablename__ = 'attendance_monthly'
+
+    employee_id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.String(7), primary_key=True)  # YYYY-MM
+    department = db.Column(db.String(255), nullable=False, default='')
+    records_count = db.Column(db.Integer, nullable=False, default=0)
+    days_present = db.Column(db.Integer, nullable=False, default=0)
+    days_late = db.Column(db.Integer, nullable=False, default=0)
+    days_absent = db.Column(db.Integer, nullable=False, default=0)
+    total_hours = db.Column(db.Float, nullable=False, default=0)
+    total_late_minutes = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.Index('ix_attendance_monthly_month', 'month'),)
+
+
+class AttendanceDepartmentMonthly(db.Model):
+    __tablename__ = 'attendance_department_monthly'
+
+    # المفتاح (الشهر، القسم) يخدم مدى الشهور في تقارير الأقسام
+    month = db.Column(db.String(7), primary_key=True)
+    department = db.Column(db.String(255), primary_key=True)
+    records_count = db.Column(db.Integer, nullable=False, default=0)
+    days_present = db.Column(db.Integer, nullable=False, default=0)
+    days_late = db.Column(db.Integer, nullable=False, default=0)
+    days_absent = db.Column(db.Integer, nullable=False, default=0)
+    total_hours = db.Column(db.Float, nullable=False, default=0)
+    total_late_minutes = db.Column(db.Integer, nullable=False, default=0)
+
+
+SUMMARY_COLUMNS = ['days_present', 'days_late', 'days_absent', 'total_hours', 'total_late_minutes']
+
+
+def _row_values(row):
+    return {
+        'days_present': f"({row}.check_in_time IS NOT NULL)",
+        'days_late': f"({row}.status IS 'late')",
+        'days_absent': f"({row}.status IS 'absent')",
+        'total_hours': f"COALESCE({row}.working_hours, 0)",
+        'total_late_minutes': f"COALESCE({row}.late_minutes, 0)",
+    }
+
+
+_NEW = _row_values('NEW')
+_OLD = _row_values('OLD')
+
+# قسم شهر الموظف المحفوظ في attendance_monthly
+def _month_department(row):
+    return (
+        f"(SELECT department FROM attendance_monthly "
+        f"WHERE employee_id = {row}.employee_id AND month = substr({row}.date, 1, 7))"
+    )
+
+
+# الإضافة إلى صف الموظف أولاً: صف الشهر الجديد يأخذ القسم الحالي، ثم يُضاف
+# السجل إلى صف القسم المحفوظ
+_MONTHLY_ADD = f"""
+    INSERT INTO attendance_monthly (employee_id, month, department, records_count, {', '.join(SUMMARY_COLUMNS)})
+        VALUES (
+            NEW.employee_id, substr(NEW.date, 1, 7),
+            COALESCE((SELECT department FROM employees WHERE employee_id = NEW.employee_id), ''),
+            1, {', '.join(_NEW[name] for name in SUMMARY_COLUMNS)}
+        )
+        ON CONFLICT(employee_id, month) DO UPDATE SET
+            records_count = records_count + 1,
+            {', '.join(f"{name} = {name} + excluded.{name}" for name in SUMMARY_COLUMNS)};
+    INSERT INTO attendance_department_monthly (month, department, records_count, {', '.join(SUMMARY_COLUMNS)})
+        VALUES (substr(NEW.date, 1, 7), {_month_department('NEW')}, 1, {', '.join(_NEW[name] for name in SUMMARY_COLUMNS)})
+        ON CONFLICT(month, department) DO UPDATE SET
+            records_count = records_count + 1,
+            {', '.join(f"{name} = {name} + excluded.{name}" for name in SUMMARY_COLUMNS)};
+"""
+
+# الطرح من صف القسم أولاً، قبل حذف صف الموظف الذي يحمل القسم
+_MONTHLY_REMOVE = f"""
+    UPDATE attendance_department_monthly SET
+        records_count = records_count - 1,
+        {', '.join(f"{name} = {name} - {_OLD[name]}" for name in SUMMARY_COLUMNS)}
+    WHERE month = substr(OLD.date, 1, 7) AND department = {_month_department('OLD')};
+    DELETE FROM attendance_department_monthly
+        WHERE month = substr(OLD.date, 1, 7) AND department = {_month_department('OLD')} AND records_count <= 0;
+    UPDATE attendance_monthly SET
+        records_count = records_count - 1,
+        {', '.join(f"{name} = {name} - {_OLD[name]}" for name in SUMMARY_COLUMNS)}
+    WHERE employee_id = OLD.employee_id AND month = substr(OLD.date, 1, 7);
+    DELETE FROM attendance_monthly
+        WHERE employee_id = OLD.employee_id AND month = substr(OLD.date, 1, 7) AND records_count <= 0;
+"""
+
+ROLLUP_TRIGGERS = {
+    'trg_rollup_attendance_insert': f"AFTER INSERT ON attendance BEGIN {_MONTHLY_ADD} END",
+    'trg_rollup_attendance_delete': f"AFTER DELETE ON attendance BEGIN {_MONTHLY_REMOVE} END",
+    'trg_rollup_attendance_update': f"""
+        AFTER UPDATE OF employee_id, date, check_in_time, working_hours, late_minutes, status ON attendance BEGIN
+            {_MONTHLY_REMOVE}
+            {_MONTHLY_ADD}
+        END""",
+}
+
+
+def rebuild_attendance_rollup():
+    """إعادة بناء الملخصين الشهريين من جدول الحضور بالكامل (بالقسم الحالي لكل موظف)."""
+    row = _row_values('a')
+    db.session.execute(text("DELETE FROM attendance_monthly"))
+    db.session.execute(text(f"""
+        INSERT INTO attendance_monthly (employee_id, month, department, records_count, {', '.join(SUMMARY_COLUMNS)})
+        SELECT a.employee_id, substr(a.date, 1, 7), COALESCE(e.department, ''), COUNT(*),
+            {', '.join(f"SUM({row[name]})" for name in SUMMARY_COLUMNS)}
+        FROM attendance AS a LEFT JOIN employees AS e ON e.employee_id = a.employee_id
+        GROUP BY a.employee_id, substr(a.date, 1, 7)
+    """))
+    db.session.execute(text("DELETE FROM attendance_department_monthly"))
+    db.session.execute(text(f"""
+        INSERT INTO attendance_department_monthly (month, department, records_count, {', '.join(SUMMARY_COLUMNS)})
+        SELECT month, department, SUM(records_count), {', '.join(f"SUM({name})" for name in SUMMARY_COLUMNS)}
+        FROM attendance_monthly
+        GROUP BY month, department
+    """))
+    db.session.commit()
+
+
+def install_attendance_rollup():
+    """إنشاء الـ Triggers إن لم تكن موجودة، وبناء الملخص لأول مرة."""
+    for name, body in ROLLUP_TRIGGERS.items():
+        db.session.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+    db.session.commit()
+    rebuild_attendance_rollup()
+
+
+def install_department_rollup():
+    """
+    ترقية ملخص الترحيل 5: إضافة قسم الشهر إلى attendance_monthly واستبدال الـ
+    Triggers بالتي تحدّث attendance_department_monthly أيضاً، ثم إعادة البناء.
+    """
+    existing = {column['name'] for column in inspect(db.session.connection()).get_columns('attendance_monthly')}
+    if 'department' not in existing:
+        db.session.execute(text("ALTER TABLE attendance_monthly ADD COLUMN department VARCHAR(255) NOT NULL DEFAULT ''"))
+    for name, body in ROLLUP_TRIGGERS.items():
+        db.session.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        db.session.execute(text(f"CREATE TRIGGER {name} {body}"))
+    db.session.commit()
+    rebuild_attendance_rollup()
+
+
+def attendance_summary(month_from=None, month_to=None, group='employee', employee_id=None, department=None):
+    """
+    ملخص الحضور الشهري ضمن مدى من الشهور (YYYY-MM، شامل الطرفين)، مجمّعاً حسب
+    الموظف أو حسب القسم. القسم هو قسم الموظف في ذلك الشهر وليس قسمه الحالي.
+    """
+    if group == 'department' and employee_id is None:
+        # صف جاهز لكل قسم وشهر
+        monthly = AttendanceDepartmentMonthly
+        key = monthly.department
+        columns = [getattr(monthly, name) for name in SUMMARY_COLUMNS]
+    elif group == 'department':
+        monthly = AttendanceMonthly
+        key = monthly.department
+        columns = [func.sum(getattr(monthly, name)).label(name) for name in SUMMARY_COLUMNS]
+    else:
+        monthly = AttendanceMonthly
+        key = monthly.employee_id
+        columns = [getattr(monthly, name) for name in SUMMARY_COLUMNS]
+
+    query = db.select(monthly.month, key, *columns)
+    if month_from:
+        query = query.where(monthly.month >= month_from)
+    if month_to:
+        query = query.where(monthly.month <= month_to)
+    if employee_id is not None:
+        query = query.where(monthly.employee_id == employee_id)
+    if department is not None:
+        query = query.where(monthly.department == department)
+    if group == 'department' and employee_id is not None:
+        query = query.group_by(monthly.month, key)
+    query = query.order_by(monthly.month, key)
+
+    summary = []
+    for row in db.session.execute(query):
+        item = row._asdict()
+        item['total_hours'] = round(item['total_hours'], 2)
+        summary.append(item)
+    return summary
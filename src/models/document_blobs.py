@@ -0,0 +1,84 @@
+import re
+from sqlalchemy import inspect, text
+from src.models.hr_models import db, Document
+from src.utils.blob_store import blob_store
+
+# محتوى المستندات يُحفظ في مخزن الملفات (src/utils/blob_store.py) ويبقى في
+# جدول documents بصمته وحجمه ونوعه فقط، فلا تحمل القوائم والاستعلامات نصوص
+# المستندات الكاملة ويمكن بث الملف عند التنزيل.
+
+DOCUMENT_BLOB_COLUMNS = {
+    'content_sha256': 'VARCHAR(64)',
+    'content_size': 'INTEGER',
+    'content_type': 'VARCHAR(255)',
+    'file_name': 'VARCHAR(255)',
+}
+
+# نوع المحتوى النصي المنقول من عمود content (يضيف Werkzeug charset=utf-8 عند التنزيل)
+INLINE_CONTENT_TYPE = 'text/plain'
+MOVE_BATCH_SIZE = 500
+
+# الأنواع التي تُعرض في المتصفح عند التنزيل. أي نوع آخر (text/html، image/svg+xml...)
+# يُرسل كمرفق حتى لا ينفذ المتصفح محتوى رفعه مستخدم على نطاق التطبيق.
+INLINE_SAFE_TYPES = frozenset({
+    'text/plain', 'application/pdf', 'image/png', 'image/jpeg', 'image/gif', 'image/webp',
+})
+DEFAULT_CONTENT_TYPE = 'application/octet-stream'
+_MIMETYPE = re.compile(r"^[a-z0-9][a-z0-9!#$&^_.+-]*/[a-z0-9][a-z0-9!#$&^_.+-]*$")
+
+
+def normalize_content_type(value):
+    """نوع المحتوى المرسل من العميل بدون معاملاته، أو application/octet-stream إن لم يكن صالحاً."""
+    value = (value or '').split(';', 1)[0].strip().lower()
+    return value if _MIMETYPE.match(value) else DEFAULT_CONTENT_TYPE
+
+
+def serves_inline(content_type):
+    return content_type in INLINE_SAFE_TYPES
+
+
+def move_inline_content(batch_size=MOVE_BATCH_SIZE):
+    """نقل المحتوى المخزن في عمود content إلى مخزن الملفات على دفعات. يعيد عدد المستندات."""
+    store = blob_store()
+    moved = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            db.select(Document.id, Document.content)
+            .where(Document.id > last_id, Document.content.is_not(None))
+            .order_by(Document.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return moved
+        for document_id, content in rows:
+            digest, size = store.put_bytes(content.encode('utf-8'))
+            db.session.execute(
+                db.update(Document).where(Document.id == document_id).values(
+                    content=None, content_sha256=digest, content_size=size, content_type=INLINE_CONTENT_TYPE,
+                )
+            )
+        # الملفات تُكتب قبل الالتزام، فلا يشير صف إلى بصمة غير موجودة
+        db.session.commit()
+        moved += len(rows)
+        last_id = rows[-1][0]
+
+
+def install_document_blobs():
+    """إضافة أعمدة المحتوى إلى جدول documents القائم ونقل المحتوى الحالي إلى المخزن."""
+    existing = {column['name'] for column in inspect(db.session.connection()).get_columns('documents')}
+    for name, ddl in DOCUMENT_BLOB_COLUMNS.items():
+        if name not in existing:
+            db.session.execute(text(f"ALTER TABLE documents ADD COLUMN {name} {ddl}"))
+    db.session.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_documents_content_sha256 ON documents (content_sha256)"
+    ))
+    db.session.commit()
+    move_inline_content()
+
+
+def referenced_blobs():
+    """البصمات التي تشير إليها المستندات (لتنظيف الملفات اليتيمة)."""
+    return set(db.session.execute(
+        db.select(Document.content_sha256).where(Document.content_sha256.is_not(None)).distinct()
+    ).scalars())
@@ -1,10 +1,14 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from src.models.serialization import SerializerMixin
 
 db = SQLAlchemy()
 
-class Employee(db.Model):
+class Employee(SerializerMixin, db.Model):
     __tablename__ = 'employees'
+    __serialize_exclude__ = ('created_at', 'updated_at')
+    # علاقات مفهرسة بـ employee_id فقط؛ الباقي يتطلب مسحاً كاملاً للجدول
+    __serialize_includes__ = ('leave_management', 'leave_requests', 'attendance_records', 'related_documents')
     
     employee_id = db.Column(db.Integer, primary_key=True) # مسلسل الموظف
     full_name = db.Column(db.String(255), nullable=False) # الاسم
@@ -20,7 +24,7 @@ class Employee(db.Model):
     department_code = db.Column(db.String(50)) # كود القسم
     
     # الحقول القديمة التي قد تكون موجودة أو نحتاجها
-    department = db.Column(db.String(255)) # القسم (للتوافق مع الواجهة الحالية)
+    department = db.Column(db.String(255), index=True) # القسم (للتوافق مع الواجهة الحالية)
     email = db.Column(db.String(255))
     phone = db.Column(db.String(50))
     birth_date = db.Column(db.Date)
@@ -49,44 +53,11 @@ class Employee(db.Model):
     created_documents = db.relationship('Document', foreign_keys='[Document.created_by]', backref='creator')
     related_documents = db.relationship('Document', foreign_keys='[Document.employee_id]', backref='related_employee')
 
-    def to_dict(self):
-        return {
-            'employee_id': self.employee_id,
-            'full_name': self.full_name,
-            'house_number': self.house_number,
-            'national_id': self.national_id,
-            'job_title': self.job_title,
-            'qualification': self.qualification,
-            'hire_date': self.hire_date.isoformat() if self.hire_date else None,
-            'points_count': self.points_count,
-            'years_of_experience': self.years_of_experience,
-            'salary_from_system': self.salary_from_system,
-            'actual_salary': self.actual_salary,
-            'department_code': self.department_code,
-            'department': self.department,
-            'email': self.email,
-            'phone': self.phone,
-            'birth_date': self.birth_date.isoformat() if self.birth_date else None,
-            'nationality': self.nationality,
-            'id_number': self.id_number,
-            'address': self.address,
-            'marital_status': self.marital_status,
-            'children_count': self.children_count,
-            'education_level': self.education_level,
-            'specialization': self.specialization,
-            'contract_end_date': self.contract_end_date.isoformat() if self.contract_end_date else None,
-            'basic_salary': self.basic_salary,
-            'allowances': self.allowances,
-            'total_salary': self.total_salary,
-            'bank_account': self.bank_account,
-            'notes': self.notes
-        }
-
-class LeaveManagement(db.Model):
+class LeaveManagement(SerializerMixin, db.Model):
     __tablename__ = 'leave_management'
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), nullable=False)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), nullable=False, index=True)
     annual_leave_balance = db.Column(db.Integer, default=21)
     casual_leave_balance = db.Column(db.Integer, default=6)
     sick_leave_balance = db.Column(db.Integer, default=15)
@@ -94,56 +65,28 @@ class LeaveManagement(db.Model):
     casual_leave_used = db.Column(db.Integer, default=0)
     sick_leave_used = db.Column(db.Integer, default=0)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'employee_id': self.employee_id,
-            'annual_leave_balance': self.annual_leave_balance,
-            'casual_leave_balance': self.casual_leave_balance,
-            'sick_leave_balance': self.sick_leave_balance,
-            'annual_leave_used': self.annual_leave_used,
-            'casual_leave_used': self.casual_leave_used,
-            'sick_leave_used': self.sick_leave_used,
-            'last_updated': self.last_updated.isoformat() if self.last_updated else None
-        }
 
-class LeaveRequest(db.Model):
+class LeaveRequest(SerializerMixin, db.Model):
     __tablename__ = 'leave_requests'
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), nullable=False)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), nullable=False, index=True)
     leave_type = db.Column(db.String(50), nullable=False)  # 'annual', 'casual', 'sick', 'other'
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
     days_requested = db.Column(db.Integer, nullable=False)
     reason = db.Column(db.Text)
-    status = db.Column(db.String(50), default='pending')  # 'pending', 'approved', 'rejected'
+    status = db.Column(db.String(50), default='pending', index=True)  # 'pending', 'approved', 'rejected'
     requested_at = db.Column(db.DateTime, default=datetime.utcnow)
     approved_by = db.Column(db.Integer, db.ForeignKey('employees.employee_id'))
     approved_at = db.Column(db.DateTime)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'employee_id': self.employee_id,
-            'leave_type': self.leave_type,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'end_date': self.end_date.isoformat() if self.end_date else None,
-            'days_requested': self.days_requested,
-            'reason': self.reason,
-            'status': self.status,
-            'requested_at': self.requested_at.isoformat() if self.requested_at else None,
-            'approved_by': self.approved_by,
-            'approved_at': self.approved_at.isoformat() if self.approved_at else None
-        }
 
-class Attendance(db.Model):
+class Attendance(SerializerMixin, db.Model):
     __tablename__ = 'attendance'
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), nullable=False)
-    date = db.Column(db.Date, nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True) # للاستعلام بمدى تواريخ لكل الموظفين
     check_in_time = db.Column(db.Time)
     check_out_time = db.Column(db.Time)
     working_hours = db.Column(db.Float)
@@ -152,21 +95,8 @@ class Attendance(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     __table_args__ = (db.UniqueConstraint('employee_id', 'date', name='unique_employee_date'),)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'employee_id': self.employee_id,
-            'date': self.date.isoformat() if self.date else None,
-            'check_in_time': self.check_in_time.isoformat() if self.check_in_time else None,
-            'check_out_time': self.check_out_time.isoformat() if self.check_out_time else None,
-            'working_hours': self.working_hours,
-            'late_minutes': self.late_minutes,
-            'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
 
-class Department(db.Model):
+class Department(SerializerMixin, db.Model):
     __tablename__ = 'departments'
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -174,41 +104,23 @@ class Department(db.Model):
     description = db.Column(db.Text)
     manager_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'manager_id': self.manager_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
 
-class Document(db.Model):
+class Document(SerializerMixin, db.Model):
     __tablename__ = 'documents'
+    # المحتوى في مخزن الملفات (content_sha256)؛ القوائم تعيد البيانات الوصفية فقط
+    __serialize_exclude__ = ('content',)
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     document_number = db.Column(db.String(100), unique=True, nullable=False)
     document_type = db.Column(db.String(100), nullable=False)
-    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'))
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), index=True)
     subject = db.Column(db.String(255))
     content = db.Column(db.Text)
     recipient = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_by = db.Column(db.Integer, db.ForeignKey('employees.employee_id'))
     file_path = db.Column(db.String(500))
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'document_number': self.document_number,
-            'document_type': self.document_type,
-            'employee_id': self.employee_id,
-            'subject': self.subject,
-            'content': self.content,
-            'recipient': self.recipient,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'created_by': self.created_by,
-            'file_path': self.file_path
-        }
-
+    content_sha256 = db.Column(db.String(64), index=True) # بصمة المحتوى في مخزن الملفات
+    content_size = db.Column(db.Integer)
+    content_type = db.Column(db.String(255))
+    file_name = db.Column(db.String(255)) # اسم الملف عند التنزيل
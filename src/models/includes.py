@@ -0,0 +1,91 @@
+import json
+from collections import defaultdict
+from functools import lru_cache
+from sqlalchemy import column, func, select
+from src.models.hr_models import db
+from src.models.serialization import row_encoder
+
+# تضمين علاقات النموذج في الاستجابة (include=) بنفس فكرة selectinload لكن على
+# صفوف الأعمدة: استعلام واحد لكل علاقة مهما كان عدد الصفوف الأصلية، والمعرّفات
+# تُمرَّر كمصفوفة JSON في معامل واحد (json_each) فلا يصطدم بحد عدد المعاملات.
+
+
+def _ids_subquery(ids):
+    return select(column('value')).select_from(func.json_each(json.dumps(ids)))
+
+
+def _relationship(model, name):
+    relationship = model.__mapper__.relationships[name]
+    (local, remote), = relationship.local_remote_pairs
+    return relationship, local, remote
+
+
+@lru_cache(maxsize=None)
+def include_local_key(model):
+    """
+    العمود المحلي الذي ترتبط به كل علاقات __serialize_includes__ (المفتاح الأساسي
+    عادةً). nest_includes تجمع المعرّفات من هذا العمود مرة واحدة لكل العلاقات،
+    فعلاقة مسموحة ترتبط بعمود آخر (مثل created_by) خطأ في تعريف النموذج.
+    """
+    keys = {_relationship(model, name)[1].key for name in model.__serialize_includes__}
+    if len(keys) != 1:
+        raise ValueError(f"علاقات include= في {model.__name__} يجب أن ترتبط بعمود محلي واحد: {sorted(keys)}")
+    return keys.pop()
+
+
+def include_query(model, name, ids):
+    """استعلام صفوف العلاقة name لكل المعرّفات ids، وعمود الربط في آخر الصف."""
+    relationship, _, remote = _relationship(model, name)
+    target = relationship.mapper.class_
+    columns = target.__table__.c
+    return (
+        select(*[columns[field] for field in target.serialize_fields()], remote)
+        .where(remote.in_(_ids_subquery(ids)))
+        .order_by(*target.__table__.primary_key.columns)
+    )
+
+
+def load_includes(model, names, parent_ids):
+    """
+    يعيد {اسم العلاقة: {المعرّف الأصلي: قائمة قواميس، أو قاموس/None للعلاقة المفردة}}
+    باستعلام واحد لكل علاقة، مرتب بالمفتاح الأساسي للجدول المرتبط.
+    """
+    ids = list(dict.fromkeys(parent_ids))
+    loaded = {}
+    for name in names:
+        relationship = model.__mapper__.relationships[name]
+        encode = row_encoder(relationship.mapper.class_)
+
+        grouped = defaultdict(list) if relationship.uselist else {}
+        if ids:
+            for row in db.session.execute(include_query(model, name, ids)):
+                if relationship.uselist:
+                    grouped[row[-1]].append(encode(row))
+                else:
+                    grouped.setdefault(row[-1], encode(row))
+        loaded[name] = grouped
+    return loaded
+
+
+def nest_includes(model, names, rows, items):
+    """
+    إضافة العلاقات المطلوبة إلى قواميس items (بنفس ترتيب rows). الصفوف يجب أن
+    تحمل عمود الربط في النموذج الأصلي (المفتاح الأساسي عادةً).
+    """
+    if not names or not items:
+        return items
+
+    local_key = include_local_key(model)
+    keys = [getattr(row, local_key) for row in rows]
+    loaded = load_includes(model, names, keys)
+    for name in names:
+        grouped = loaded[name]
+        empty = list if model.__mapper__.relationships[name].uselist else lambda: None
+        for key, item in zip(keys, items):
+            item[name] = grouped.get(key) or empty()
+    return items
+
+
+def include_tables(model, names):
+    """أسماء جداول العلاقات المضمّنة (لحساب ETag الاستجابة)."""
+    return [model.__mapper__.relationships[name].mapper.local_table.name for name in names]
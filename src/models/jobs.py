@@ -0,0 +1,114 @@
+import json
+from datetime import datetime
+from sqlalchemy.exc import OperationalError
+from src.models.hr_models import db
+from src.models.serialization import SerializerMixin, json_value
+
+# سجل المهام الخلفية (الاستيراد والتصدير وإعادة الحساب). الحالة والتقدم
+# يُكتبان في قاعدة البيانات فيمكن متابعتهما من أي عملية خادم وبعد إعادة التشغيل.
+
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed')
+ACTIVE_JOB_STATUSES = ('queued', 'running')
+
+# عدد رسائل الأخطاء المحفوظة لكل مهمة (العدد الكلي في errors_count)
+MAX_STORED_ERRORS = 100
+
+
+class Job(SerializerMixin, db.Model):
+    __tablename__ = 'jobs'
+    __serialize_exclude__ = ('params', 'errors', 'result', 'artifact_path')
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)
+    params = db.Column(db.Text)
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    errors_count = db.Column(db.Integer, nullable=False, default=0)
+    errors = db.Column(db.Text)
+    result = db.Column(db.Text)
+    message = db.Column(db.Text)
+    artifact_path = db.Column(db.String(500))
+    artifact_name = db.Column(db.String(255))
+    artifact_mimetype = db.Column(db.String(255))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        data = super().to_dict()
+        data['errors'] = json.loads(self.errors) if self.errors else []
+        data['result'] = json.loads(self.result) if self.result else None
+        data['has_artifact'] = bool(self.artifact_path) and self.status == 'succeeded'
+        if self.started_at:
+            end = self.finished_at or datetime.utcnow()
+            data['elapsed_seconds'] = round((end - self.started_at).total_seconds(), 3)
+        return data
+
+
+def record_job_progress(job_id, rows_processed, errors=None):
+    """
+    تحديث تقدم المهمة (ونبضها updated_at) على اتصال مستقل، فلا يمس معاملة المهمة
+    نفسها (مثلاً قراءة التصدير المفتوحة). التحديث معلوماتي فقط: إن كانت قاعدة
+    البيانات مشغولة بكاتب آخر يُتجاوز ويُسجَّل التقدم في الاستدعاء التالي.
+    """
+    values = {'rows_processed': rows_processed, 'updated_at': datetime.utcnow()}
+    if errors is not None:
+        values['errors_count'] = len(errors)
+        values['errors'] = json.dumps(errors[:MAX_STORED_ERRORS], ensure_ascii=False)
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(db.update(Job).where(Job.id == job_id).values(values))
+    except OperationalError:
+        pass
+
+
+def touch_jobs(job_ids):
+    """
+    نبض المهام النشطة التي تنفذها هذه العملية (updated_at)، حتى لا تُعتبر متوقفة
+    أثناء خطوة طويلة لا تسجل تقدماً. على اتصال مستقل وبلا ضمان مثل record_job_progress.
+    """
+    if not job_ids:
+        return
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(
+                db.update(Job)
+                .where(Job.id.in_(job_ids), Job.status.in_(ACTIVE_JOB_STATUSES))
+                .values(updated_at=datetime.utcnow())
+            )
+    except OperationalError:
+        pass
+
+
+def claim_queued_jobs():
+    """
+    معرّفات المهام التي بقيت في الطابور (لم تبدأ) مرتبة، مع تجديد نبضها. تُعاد
+    إلى طابور هذه العملية عند البدء؛ إن كانت في طابور عملية أخرى حية فأول من
+    يبدؤها يأخذها (_execute ينقلها من queued إلى running ذرياً).
+    """
+    job_ids = db.session.execute(
+        db.select(Job.id).where(Job.status == 'queued').order_by(Job.id)
+    ).scalars().all()
+    if job_ids:
+        db.session.execute(db.update(Job).where(Job.id.in_(job_ids)).values(updated_at=datetime.utcnow()))
+        db.session.commit()
+    return job_ids
+
+
+def fail_stale_jobs(stale_before):
+    """
+    المهام النشطة التي لم يتحدث نبضها منذ stale_before توقفت مع عمليتها
+    (إعادة تشغيل أو انهيار)، فتُعلَّم كفاشلة. يعيد عددها.
+    """
+    count = db.session.execute(
+        db.update(Job)
+        .where(Job.status.in_(ACTIVE_JOB_STATUSES), Job.updated_at < stale_before)
+        .values(status='failed', message='توقفت المهمة قبل اكتمالها (أعيد تشغيل الخادم)', finished_at=datetime.utcnow())
+    ).rowcount
+    db.session.commit()
+    return count
+
+
+def job_json_value(value):
+    return json.dumps(value, ensure_ascii=False, default=json_value)
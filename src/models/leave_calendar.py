@@ -0,0 +1,104 @@
+from sqlalchemy import column, select, table, text
+from src.models.hr_models import db, Employee, LeaveRequest
+
+# فهرس فترات الإجازات: جدول R*Tree افتراضي يحمل لكل طلب إجازة مدى أيامه
+# (بالأيام منذ 1970 كأعداد صحيحة). استعلام "من في إجازة بين تاريخين" يصبح
+# بحثاً في الشجرة بدلاً من المرور على كل الطلبات عبر السنين. الـ Triggers
+# تبقي الفهرس متزامناً مع جدول leave_requests من أي اتصال.
+
+leave_requests_rtree = table('leave_requests_rtree', column('id'), column('start_day'), column('end_day'))
+
+# الحالات التي تشغل أيام الموظف (الطلب المرفوض لا يتعارض مع غيره)
+ACTIVE_LEAVE_STATUSES = ('pending', 'approved')
+
+
+def _day_number(expr):
+    return f"CAST(julianday({expr}) - 2440587.5 AS INTEGER)"
+
+
+CALENDAR_TRIGGERS = {
+    'trg_calendar_leave_insert': f"""
+        AFTER INSERT ON leave_requests BEGIN
+            INSERT INTO leave_requests_rtree (id, start_day, end_day)
+                VALUES (NEW.id, {_day_number('NEW.start_date')}, {_day_number('NEW.end_date')});
+        END""",
+    'trg_calendar_leave_delete': """
+        AFTER DELETE ON leave_requests BEGIN
+            DELETE FROM leave_requests_rtree WHERE id = OLD.id;
+        END""",
+    'trg_calendar_leave_update': f"""
+        AFTER UPDATE OF id, start_date, end_date ON leave_requests BEGIN
+            DELETE FROM leave_requests_rtree WHERE id = OLD.id;
+            INSERT INTO leave_requests_rtree (id, start_day, end_day)
+                VALUES (NEW.id, {_day_number('NEW.start_date')}, {_day_number('NEW.end_date')});
+        END""",
+}
+
+
+def rebuild_leave_calendar():
+    """إعادة بناء فهرس الفترات من جدول طلبات الإجازة."""
+    db.session.execute(text("DELETE FROM leave_requests_rtree"))
+    db.session.execute(text(
+        "INSERT INTO leave_requests_rtree (id, start_day, end_day) "
+        f"SELECT r.id, {_day_number('r.start_date')}, {_day_number('r.end_date')} FROM leave_requests AS r"
+    ))
+    db.session.commit()
+
+
+def install_leave_calendar():
+    """إنشاء جدول R*Tree والـ Triggers إن لم تكن موجودة، وبناء الفهرس."""
+    db.session.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS leave_requests_rtree USING rtree_i32(id, start_day, end_day)"
+    ))
+    for name, body in CALENDAR_TRIGGERS.items():
+        db.session.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+    db.session.commit()
+    rebuild_leave_calendar()
+
+
+def _days_overlapping(date_from, date_to):
+    """شرط تقاطع مدى الطلب في الفهرس مع [date_from، date_to] (شامل الطرفين)."""
+    return text(
+        f"leave_requests_rtree.start_day <= {_day_number(':date_to')} "
+        f"AND leave_requests_rtree.end_day >= {_day_number(':date_from')}"
+    ).bindparams(date_from=date_from.isoformat(), date_to=date_to.isoformat())
+
+
+def overlapping_leave_requests(employee_id, start_date, end_date):
+    """طلبات الموظف المعلقة أو المعتمدة التي تتقاطع مع الفترة (عبر فهرس employee_id)."""
+    return (
+        LeaveRequest.query
+        .filter(
+            LeaveRequest.employee_id == employee_id,
+            LeaveRequest.status.in_(ACTIVE_LEAVE_STATUSES),
+            LeaveRequest.start_date <= end_date,
+            LeaveRequest.end_date >= start_date,
+        )
+        .with_entities(LeaveRequest.id, LeaveRequest.start_date, LeaveRequest.end_date, LeaveRequest.status)
+    )
+
+
+def leave_calendar_query(date_from, date_to, department=None, statuses=ACTIVE_LEAVE_STATUSES):
+    """الإجازات التي تتقاطع مع الفترة لكل الموظفين أو لقسم، مرتبة بتاريخ البداية."""
+    query = (
+        db.session.query(
+            LeaveRequest.id,
+            LeaveRequest.employee_id,
+            Employee.full_name,
+            Employee.department,
+            LeaveRequest.leave_type,
+            LeaveRequest.start_date,
+            LeaveRequest.end_date,
+            LeaveRequest.days_requested,
+            LeaveRequest.status,
+        )
+        .join(Employee, Employee.employee_id == LeaveRequest.employee_id)
+        # المعرّفات من فهرس الفترات كاستعلام فرعي حتى يبدأ المخطِّط بالبحث في
+        # الشجرة بدلاً من المرور على كل الطلبات بالحالة
+        .filter(LeaveRequest.id.in_(select(leave_requests_rtree.c.id).where(_days_overlapping(date_from, date_to))))
+        .filter(LeaveRequest.status.in_(statuses))
+        .order_by(LeaveRequest.start_date, LeaveRequest.id)
+    )
+    if department is not None:
+        query = query.filter(Employee.department == department)
+    return query
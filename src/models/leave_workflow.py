@@ -0,0 +1,136 @@
+from datetime import datetime
+from sqlalchemy import case, func, insert, literal, or_, select, update
+from src.models.hr_models import db, Employee, LeaveManagement, LeaveRequest
+
+# اعتماد/رفض طلبات الإجازة وحساب الأرصدة المستخدمة. الاعتماد يتم بجمل UPDATE
+# مشروطة داخل معاملة واحدة: الطلب يتغير فقط إن كان معلقاً، والرصيد يُخصم فقط
+# إن كان المتبقي يكفي، فلا يمكن لاعتمادين متزامنين تجاوز الرصيد.
+
+# نوع الإجازة: (عمود الرصيد، عمود المستخدم). الأنواع الأخرى لا تُخصم من رصيد
+LEAVE_BALANCE_COLUMNS = {
+    'annual': ('annual_leave_balance', 'annual_leave_used'),
+    'casual': ('casual_leave_balance', 'casual_leave_used'),
+    'sick': ('sick_leave_balance', 'sick_leave_used'),
+}
+
+LEAVE_DECISIONS = ('approved', 'rejected')
+
+
+class LeaveWorkflowError(ValueError):
+    """تعذّر تنفيذ القرار على طلب الإجازة. status_code هو رمز HTTP المناسب."""
+
+    def __init__(self, message, status_code=409):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _default_balances():
+    """قيم الرصيد الافتراضية المعرّفة في نموذج LeaveManagement."""
+    columns = LeaveManagement.__table__.c
+    return {
+        balance: columns[balance].default.arg
+        for balance, _ in LEAVE_BALANCE_COLUMNS.values()
+    }
+
+
+def _ensure_leave_records(employee_ids=None):
+    """إنشاء سجل أرصدة افتراضي للموظفين الذين ليس لديهم سجل (جملة INSERT ... SELECT واحدة)."""
+    defaults = _default_balances()
+    query = select(
+        Employee.employee_id,
+        *[literal(value).label(name) for name, value in defaults.items()],
+        *[literal(0).label(used) for _, used in LEAVE_BALANCE_COLUMNS.values()],
+        literal(datetime.utcnow(), LeaveManagement.last_updated.type).label('last_updated'),
+    ).where(~select(LeaveManagement.id).where(LeaveManagement.employee_id == Employee.employee_id).exists())
+    if employee_ids is not None:
+        query = query.where(Employee.employee_id.in_(employee_ids))
+
+    columns = ['employee_id', *defaults, *[used for _, used in LEAVE_BALANCE_COLUMNS.values()], 'last_updated']
+    db.session.execute(insert(LeaveManagement.__table__).from_select(columns, query))
+
+
+def decide_leave_request(request_id, decision, approved_by=None):
+    """
+    اعتماد أو رفض طلب إجازة معلق. عند الاعتماد تُضاف الأيام إلى رصيد النوع
+    المستخدم بشرط ألا يتجاوز الرصيد المتاح. يعيد الطلب بعد التحديث.
+    """
+    if decision not in LEAVE_DECISIONS:
+        raise LeaveWorkflowError("القرار يجب أن يكون approved أو rejected", 400)
+
+    leave_request = db.session.execute(
+        select(LeaveRequest.employee_id, LeaveRequest.leave_type, LeaveRequest.days_requested)
+        .where(LeaveRequest.id == request_id)
+    ).first()
+    if leave_request is None:
+        raise LeaveWorkflowError("طلب الإجازة غير موجود", 404)
+
+    now = datetime.utcnow()
+    try:
+        updated = db.session.execute(
+            update(LeaveRequest)
+            .where(LeaveRequest.id == request_id, LeaveRequest.status == 'pending')
+            .values(status=decision, approved_by=approved_by, approved_at=now)
+        ).rowcount
+        if not updated:
+            raise LeaveWorkflowError("تم البت في طلب الإجازة مسبقاً")
+
+        if decision == 'approved' and leave_request.leave_type in LEAVE_BALANCE_COLUMNS:
+            balance_name, used_name = LEAVE_BALANCE_COLUMNS[leave_request.leave_type]
+            balance = getattr(LeaveManagement, balance_name)
+            used = getattr(LeaveManagement, used_name)
+
+            _ensure_leave_records([leave_request.employee_id])
+            updated = db.session.execute(
+                update(LeaveManagement)
+                .where(
+                    LeaveManagement.employee_id == leave_request.employee_id,
+                    balance - used >= leave_request.days_requested,
+                )
+                .values({used_name: used + leave_request.days_requested, 'last_updated': now})
+            ).rowcount
+            if not updated:
+                raise LeaveWorkflowError("رصيد الإجازة غير كافٍ")
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return db.session.get(LeaveRequest, request_id)
+
+
+def recompute_leave_balances():
+    """
+    إعادة حساب الأرصدة المستخدمة لكل الموظفين من الطلبات المعتمدة بتجميع واحد
+    (GROUP BY) وجملة UPDATE ... FROM. يعيد عدد سجلات الأرصدة بعد الحساب.
+    """
+    used_columns = {used: leave_type for leave_type, (_, used) in LEAVE_BALANCE_COLUMNS.items()}
+    totals = (
+        select(
+            LeaveRequest.employee_id,
+            *[
+                func.sum(case((LeaveRequest.leave_type == leave_type, LeaveRequest.days_requested), else_=0)).label(used)
+                for used, leave_type in used_columns.items()
+            ],
+        )
+        .where(LeaveRequest.status == 'approved')
+        .group_by(LeaveRequest.employee_id)
+        .subquery()
+    )
+
+    now = datetime.utcnow()
+    _ensure_leave_records()
+    # تصفير الأرصدة المستخدمة أولاً لمن لم تعد لديه طلبات معتمدة
+    db.session.execute(
+        update(LeaveManagement)
+        .where(or_(*[getattr(LeaveManagement, used).is_not(0) for used in used_columns]))
+        .values({used: 0 for used in used_columns} | {'last_updated': now})
+    )
+    db.session.execute(
+        update(LeaveManagement)
+        .where(LeaveManagement.employee_id == totals.c.employee_id)
+        .values({used: totals.c[used] for used in used_columns} | {'last_updated': now})
+    )
+    db.session.commit()
+
+    return db.session.execute(select(func.count()).select_from(LeaveManagement)).scalar()
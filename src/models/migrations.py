@@ -0,0 +1,84 @@
+from datetime import datetime
+from sqlalchemy import text
+from src.models.hr_models import db
+from src.models.statistics import install_statistics
+from src.models.search import install_employee_search
+from src.models.table_versions import install_table_versions
+from src.models.attendance_rollup import install_attendance_rollup, install_department_rollup
+from src.models.leave_calendar import install_leave_calendar
+from src.models.document_blobs import install_document_blobs
+
+# ترحيلات مخطط قاعدة البيانات بأرقام إصدارات متسلسلة. عند بدء التطبيق تُطبَّق
+# الترحيلات غير المسجلة في جدول schema_migrations بالترتيب. يجب أن يكون كل
+# ترحيل قابلاً لإعادة التنفيذ بأمان (IF NOT EXISTS / checkfirst).
+
+
+class SchemaMigration(db.Model):
+    __tablename__ = 'schema_migrations'
+
+    version = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(255), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# فهارس الترحيل 3 كما كانت عند كتابته. القائمة ثابتة ولا تُقرأ من النماذج: الأعمدة
+# المضافة لاحقاً لا توجد بعد في قاعدة بيانات قديمة عند تنفيذ هذا الترحيل، وفهارسها
+# تُنشأ في ترحيلاتها الخاصة.
+LOOKUP_INDEXES = {
+    'ix_employees_department': ('employees', 'department'),
+    'ix_leave_management_employee_id': ('leave_management', 'employee_id'),
+    'ix_leave_requests_employee_id': ('leave_requests', 'employee_id'),
+    'ix_leave_requests_status': ('leave_requests', 'status'),
+    'ix_documents_employee_id': ('documents', 'employee_id'),
+}
+
+
+def create_indexes(indexes):
+    """إنشاء الفهارس {الاسم: (الجدول، الأعمدة...)} إن لم تكن موجودة."""
+    for name, (table_name, *columns) in indexes.items():
+        db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table_name} ({', '.join(columns)})"))
+    db.session.commit()
+
+
+def ensure_lookup_indexes():
+    """فهارس البحث بالموظف والقسم والحالة على الجداول الموجودة مسبقاً."""
+    create_indexes(LOOKUP_INDEXES)
+
+
+# /attendance?from=&to= بدون employee_id: الفهرس الفريد (employee_id، date) لا يفيد هنا
+ATTENDANCE_DATE_INDEXES = {
+    'ix_attendance_date': ('attendance', 'date'),
+}
+
+
+def ensure_attendance_date_index():
+    create_indexes(ATTENDANCE_DATE_INDEXES)
+
+
+MIGRATIONS = [
+    (1, 'statistics_summary', install_statistics),
+    (2, 'employee_search', install_employee_search),
+    (3, 'lookup_indexes', ensure_lookup_indexes),
+    (4, 'table_versions', install_table_versions),
+    (5, 'attendance_rollup', install_attendance_rollup),
+    (6, 'leave_calendar', install_leave_calendar),
+    (7, 'document_blobs', install_document_blobs),
+    (8, 'attendance_date_index', ensure_attendance_date_index),
+    (9, 'attendance_department_rollup', install_department_rollup),
+]
+
+
+def run_migrations():
+    """تطبيق الترحيلات المعلقة بالترتيب. يعيد أرقام الإصدارات المطبقة."""
+    db.create_all()
+
+    applied_versions = set(db.session.execute(db.select(SchemaMigration.version)).scalars())
+    applied_now = []
+    for version, name, migrate in MIGRATIONS:
+        if version in applied_versions:
+            continue
+        migrate()
+        db.session.add(SchemaMigration(version=version, name=name))
+        db.session.commit()
+        applied_now.append(version)
+    return applied_now
@@ -0,0 +1,129 @@
+from sqlalchemy import event
+from src.models.hr_models import db
+
+# فحص خطط تنفيذ استعلامات المسارات (EXPLAIN QUERY PLAN): تُرسَل طلبات ممثلة
+# لمسارات hr_bp وتُلتقط جمل SQL التي ينفذها كل مسار فعلاً بمعاملاتها، فلا توجد
+# نسخة منفصلة من الاستعلامات قد تختلف عن المسارات. أي جملة تتحول إلى مسح كامل
+# للجدول (SCAN <table> بدون فهرس) تُعتبر تراجعاً في الأداء.
+
+_DEPARTMENT = 'المالية'
+_INCLUDES = 'leave_management,leave_requests,attendance_records,related_documents'
+
+# (الطريقة، الرابط، جسم JSON) بالشكل المرقّم/المفلتر الذي تستخدمه الواجهة
+READ_REQUESTS = [
+    ('GET', '/api/employees?limit=100&after=100', None),
+    ('GET', f'/api/employees?limit=100&after=0&include={_INCLUDES}', None),
+    ('GET', f'/api/employees/1?include={_INCLUDES}', None),
+    ('GET', f'/api/employees/search?q=محمد&department={_DEPARTMENT}&limit=50', None),
+    ('GET', f'/api/employees/search?department={_DEPARTMENT}&limit=100&after=0', None),
+    ('GET', f'/api/employees_by_department/{_DEPARTMENT}', None),
+    ('GET', '/api/leave-management?limit=100&after=0', None),
+    ('GET', '/api/leave-management/1', None),
+    ('GET', '/api/leave-requests?limit=100&after=0', None),
+    ('GET', f'/api/leave-requests/calendar?from=2025-06-01&to=2025-06-30&department={_DEPARTMENT}', None),
+    ('GET', '/api/attendance?limit=100&after=0', None),
+    ('GET', '/api/attendance?from=2025-06-01&to=2025-06-30&limit=100', None),
+    ('GET', '/api/attendance/1?from=2025-06-01&to=2025-06-30', None),
+    ('GET', '/api/attendance/summary?from=2025-01&to=2025-06&group=department', None),
+    ('GET', '/api/attendance/summary?from=2025-01&to=2025-06&employee_id=1', None),
+    ('GET', '/api/departments?limit=100&after=0', None),
+    ('GET', '/api/departments_list', None),
+    ('GET', '/api/statistics', None),
+    ('GET', '/api/documents?employee_id=1&limit=100', None),
+    ('GET', '/api/documents/1', None),
+    ('GET', '/api/documents/1/content', None),
+    ('GET', '/api/jobs?status=running', None),
+    ('GET', '/api/jobs/1', None),
+    ('GET', '/api/jobs/1/artifact', None),
+]
+
+# طلبات كتابة تعتمد على البحث بفهرس. تُنفَّذ في الاختبارات فقط (تغيّر البيانات)؛
+# مسارات الصيانة والدفعات (إعادة الحساب، الاستيراد، /batch) تمر على الجداول عمداً.
+WRITE_REQUESTS = [
+    ('POST', '/api/documents', {'document_number': 'PLAN-1', 'document_type': 'letter', 'employee_id': 1, 'content': 'نص'}),
+    ('PUT', '/api/employees/1', {'notes': 'فحص الخطط'}),
+    ('POST', '/api/leave-requests', {
+        'employee_id': 1, 'leave_type': 'casual', 'start_date': '2030-01-05', 'end_date': '2030-01-05', 'days_requested': 1,
+    }),
+]
+
+# مسارات قراءة تمر على الجدول كاملاً بطبيعتها (تصدير ملف كامل)
+FULL_TABLE_ROUTES = {
+    ('GET', '/api/employees/export'),
+    ('GET', '/api/export/<string:table_name>'),
+}
+
+# جداول ملخص بصف لكل قسم تُقرأ كاملة عمداً (عددها بعدد الأقسام لا بحجم البيانات)
+FULL_SCAN_TABLES = {'statistics_by_department'}
+
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+
+def _is_table_scan(line):
+    # المسح عبر فهرس أو جدول افتراضي (FTS5) مقبول
+    if not line.startswith("SCAN ") or " USING " in line or " VIRTUAL TABLE" in line:
+        return False
+    return line.split()[1] not in FULL_SCAN_TABLES
+
+
+def route_statements(client, engine, method, url, body=None):
+    """تنفيذ الطلب وإعادة (الاستجابة، [(جملة SQL، معاملاتها)]) التي نفذها."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters[0] if executemany and parameters else parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.open(url, method=method, json=body)
+        response.get_data()  # المسارات المبثوثة تنفذ استعلاماتها أثناء القراءة
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return response, statements
+
+
+def explain(statement, parameters=()):
+    """أسطر خطة التنفيذ لجملة SQL بمعاملاتها."""
+    rows = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+def uncovered_routes(app, requests):
+    """مسارات القراءة في hr_bp التي ليس لها طلب في requests ولا في FULL_TABLE_ROUTES."""
+    adapter = app.url_map.bind('localhost')
+    covered = set(FULL_TABLE_ROUTES)
+    for method, url, _ in requests:
+        rule, _ = adapter.match(url.split('?')[0], method=method, return_rule=True)
+        covered.add((method, rule.rule))
+    return sorted(
+        f"GET {rule.rule}" for rule in app.url_map.iter_rules()
+        if rule.endpoint.startswith('hr.') and 'GET' in rule.methods and ('GET', rule.rule) not in covered
+    )
+
+
+def check_query_plans(app, requests=READ_REQUESTS):
+    """
+    يعيد قاموساً {"الطريقة الرابط": [(الجملة، أسطر الخطة)]} للطلبات التي مسحت
+    جملها جدولاً كاملاً أو فشلت (5xx، فلا تُعرف استعلاماتها).
+    """
+    failures = {}
+    client = app.test_client()
+    with app.app_context():
+        engine = db.engine
+    for method, url, body in requests:
+        # كل طلب في سياق تطبيق مستقل (g) كما في الخادم
+        response, statements = route_statements(client, engine, method, url, body)
+        key = f"{method} {url}"
+        if response.status_code >= 500:
+            failures[key] = [(f"HTTP {response.status_code}", [response.get_data(as_text=True)[:200]])]
+            continue
+        with app.app_context():
+            seen = set()
+            for statement, parameters in statements:
+                if statement in seen or not statement.lstrip().upper().startswith(_EXPLAINABLE):
+                    continue
+                seen.add(statement)
+                plan = explain(statement, parameters)
+                if any(_is_table_scan(line) for line in plan):
+                    failures.setdefault(key, []).append((statement, plan))
+    return failures
@@ -0,0 +1,109 @@
+import re
+from sqlalchemy import column, table, text
+from src.models.hr_models import db, Employee
+
+# فهرس البحث النصي الكامل (FTS5) للموظفين. النصوص تُخزَّن بعد توحيد الإملاء
+# العربي (الهمزات، الألف المقصورة، التاء المربوطة، التشكيل)، والتوحيد يتم
+# داخل الـ Triggers بدوال REPLACE عادية حتى تعمل من أي اتصال بقاعدة البيانات.
+
+ARABIC_NORMALIZATION = [
+    ('أ', 'ا'), ('إ', 'ا'), ('آ', 'ا'), ('ٱ', 'ا'),
+    ('ى', 'ي'), ('ئ', 'ي'), ('ؤ', 'و'), ('ة', 'ه'),
+    # التشكيل والتطويل تُحذف
+    ('ً', ''), ('ٌ', ''), ('ٍ', ''), ('َ', ''),
+    ('ُ', ''), ('ِ', ''), ('ّ', ''), ('ْ', ''),
+    ('ٰ', ''), ('ـ', ''),
+]
+
+_TRANSLATION = str.maketrans({source: target for source, target in ARABIC_NORMALIZATION})
+
+SEARCH_COLUMNS = ['full_name', 'national_id', 'job_title', 'department']
+
+employees_fts = table('employees_fts', column('rowid'), column('rank'))
+
+
+def normalize_arabic(value):
+    """توحيد الإملاء العربي بنفس قواعد الفهرس."""
+    return value.translate(_TRANSLATION) if value else value
+
+
+def _sql_normalize(expr):
+    for source, target in ARABIC_NORMALIZATION:
+        expr = f"REPLACE({expr}, '{source}', '{target}')"
+    return expr
+
+
+def _fts_values(prefix):
+    return ", ".join(
+        [f"CAST({prefix}.employee_id AS TEXT)"] + [_sql_normalize(f"{prefix}.{name}") for name in SEARCH_COLUMNS]
+    )
+
+
+_FTS_COLUMNS = "rowid, employee_id, " + ", ".join(SEARCH_COLUMNS)
+
+SEARCH_TRIGGERS = {
+    'trg_search_employees_insert': f"""
+        AFTER INSERT ON employees BEGIN
+            INSERT INTO employees_fts ({_FTS_COLUMNS}) VALUES (NEW.employee_id, {_fts_values('NEW')});
+        END""",
+    'trg_search_employees_delete': """
+        AFTER DELETE ON employees BEGIN
+            DELETE FROM employees_fts WHERE rowid = OLD.employee_id;
+        END""",
+    'trg_search_employees_update': f"""
+        AFTER UPDATE OF employee_id, {', '.join(SEARCH_COLUMNS)} ON employees BEGIN
+            DELETE FROM employees_fts WHERE rowid = OLD.employee_id;
+            INSERT INTO employees_fts ({_FTS_COLUMNS}) VALUES (NEW.employee_id, {_fts_values('NEW')});
+        END""",
+}
+
+
+def rebuild_employee_search():
+    """إعادة بناء فهرس البحث من جدول الموظفين."""
+    db.session.execute(text("DELETE FROM employees_fts"))
+    db.session.execute(text(
+        f"INSERT INTO employees_fts ({_FTS_COLUMNS}) SELECT e.employee_id, {_fts_values('e')} FROM employees AS e"
+    ))
+    db.session.commit()
+
+
+def install_employee_search():
+    """إنشاء جدول FTS5 والـ Triggers إن لم تكن موجودة، وبناء الفهرس لأول مرة."""
+    exists = db.session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'employees_fts'")
+    ).first()
+    if not exists:
+        db.session.execute(text(
+            f"CREATE VIRTUAL TABLE employees_fts USING fts5(employee_id, {', '.join(SEARCH_COLUMNS)}, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+    for name, body in SEARCH_TRIGGERS.items():
+        db.session.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+    db.session.commit()
+
+    if not exists:
+        rebuild_employee_search()
+
+
+def build_match_expression(query):
+    """
+    تحويل نص البحث إلى تعبير MATCH: كل كلمة تُطابق كبادئة،
+    والكلمات مجتمعة (AND). يعيد None إذا لم يبق شيء للبحث.
+    """
+    tokens = re.findall(r"\w+", normalize_arabic(query))
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def employee_search_query(query):
+    """استعلام الموظفين المطابقين مرتبين حسب الصلة (bm25)، أو None لنص فارغ."""
+    match = build_match_expression(query)
+    if match is None:
+        return None
+    return (
+        Employee.query
+        .join(employees_fts, employees_fts.c.rowid == Employee.employee_id)
+        .filter(text("employees_fts MATCH :match").bindparams(match=match))
+        .order_by(employees_fts.c.rank)
+    )
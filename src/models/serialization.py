@@ -0,0 +1,58 @@
+from datetime import date, datetime, time
+from functools import lru_cache
+from sqlalchemy import Date, DateTime, Time
+
+# تحويل صفوف النماذج إلى قواميس JSON بالاعتماد على تعريف الأعمدة بدلاً من
+# دوال to_dict مكتوبة يدوياً لكل نموذج. row_encoder يعمل مباشرة على صفوف
+# الأعمدة (select/with_entities) دون إنشاء كائنات ORM.
+
+_TEMPORAL_TYPES = (Date, DateTime, Time)
+
+
+def json_value(value):
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+
+class SerializerMixin:
+    # أعمدة لا تظهر في التمثيل الافتراضي للنموذج
+    __serialize_exclude__ = ()
+    # العلاقات التي يمكن تضمينها في الاستجابة عبر include= (انظر src/models/includes.py)
+    __serialize_includes__ = ()
+
+    @classmethod
+    def serialize_fields(cls):
+        return _serialize_fields(cls)
+
+    def to_dict(self):
+        return {name: json_value(getattr(self, name)) for name in self.serialize_fields()}
+
+
+@lru_cache(maxsize=None)
+def _serialize_fields(model):
+    return tuple(column.key for column in model.__table__.columns if column.key not in model.__serialize_exclude__)
+
+
+@lru_cache(maxsize=None)
+def row_encoder(model, fields=None):
+    """
+    دالة تحويل صف أعمدة إلى قاموس. الصف يجب أن يبدأ بالأعمدة بنفس ترتيب fields
+    (أو ترتيب serialize_fields للنموذج)، وأي أعمدة إضافية في آخره تُتجاهل.
+    """
+    names = tuple(fields) if fields else model.serialize_fields()
+    columns = model.__table__.c
+    temporal = tuple(index for index, name in enumerate(names) if isinstance(columns[name].type, _TEMPORAL_TYPES))
+
+    if not temporal:
+        return lambda row: dict(zip(names, row))
+
+    def encode(row):
+        values = list(row)
+        for index in temporal:
+            value = values[index]
+            if value is not None:
+                values[index] = value.isoformat()
+        return dict(zip(names, values))
+
+    return encode
@@ -0,0 +1,178 @@
+from datetime import datetime
+from sqlalchemy import text
+from src.models.hr_models import db
+
+# جداول ملخص الإحصائيات تُحدَّث تلقائياً بواسطة Triggers في SQLite عند أي كتابة
+# على الموظفين أو الحضور أو أرصدة الإجازات (بما في ذلك الإدراج المجمّع)،
+# فتصبح قراءة /statistics قراءة صف واحد بدلاً من المرور على الجداول كاملة.
+
+
+class StatisticsSummary(db.Model):
+    __tablename__ = 'statistics_summary'
+
+    id = db.Column(db.Integer, primary_key=True)  # صف واحد دائماً (id = 1)
+    total_employees = db.Column(db.Integer, nullable=False, default=0)
+    working_hours_sum = db.Column(db.Float, nullable=False, default=0)
+    working_hours_count = db.Column(db.Integer, nullable=False, default=0)
+    late_minutes_sum = db.Column(db.Float, nullable=False, default=0)
+    late_minutes_count = db.Column(db.Integer, nullable=False, default=0)
+    annual_leave_used = db.Column(db.Integer, nullable=False, default=0)
+    casual_leave_used = db.Column(db.Integer, nullable=False, default=0)
+    sick_leave_used = db.Column(db.Integer, nullable=False, default=0)
+    rebuilt_at = db.Column(db.DateTime)
+
+    def to_dict(self, employees_by_department):
+        avg_working_hours = self.working_hours_sum / self.working_hours_count if self.working_hours_count else 0
+        avg_late_minutes = self.late_minutes_sum / self.late_minutes_count if self.late_minutes_count else 0
+        return {
+            'total_employees': self.total_employees,
+            'employees_by_department': employees_by_department,
+            'avg_working_hours': round(avg_working_hours, 2),
+            'avg_late_minutes': round(avg_late_minutes, 2),
+            'total_annual_leave_used': self.annual_leave_used,
+            'total_casual_leave_used': self.casual_leave_used,
+            'total_sick_leave_used': self.sick_leave_used,
+        }
+
+
+class DepartmentStatistic(db.Model):
+    __tablename__ = 'statistics_by_department'
+
+    department = db.Column(db.String(255), primary_key=True)  # '' للموظفين بدون قسم
+    employee_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+_DEPARTMENT_INCREMENT = """
+    INSERT INTO statistics_by_department (department, employee_count) VALUES (COALESCE(NEW.department, ''), 1)
+        ON CONFLICT(department) DO UPDATE SET employee_count = employee_count + 1;
+"""
+
+_DEPARTMENT_DECREMENT = """
+    UPDATE statistics_by_department SET employee_count = employee_count - 1
+        WHERE department = COALESCE(OLD.department, '');
+    DELETE FROM statistics_by_department
+        WHERE department = COALESCE(OLD.department, '') AND employee_count <= 0;
+"""
+
+_ATTENDANCE_ADD = """
+    UPDATE statistics_summary SET
+        working_hours_sum = working_hours_sum + COALESCE(NEW.working_hours, 0),
+        working_hours_count = working_hours_count + (NEW.working_hours IS NOT NULL),
+        late_minutes_sum = late_minutes_sum + COALESCE(NEW.late_minutes, 0),
+        late_minutes_count = late_minutes_count + (NEW.late_minutes IS NOT NULL)
+    WHERE id = 1;
+"""
+
+_ATTENDANCE_REMOVE = """
+    UPDATE statistics_summary SET
+        working_hours_sum = working_hours_sum - COALESCE(OLD.working_hours, 0),
+        working_hours_count = working_hours_count - (OLD.working_hours IS NOT NULL),
+        late_minutes_sum = late_minutes_sum - COALESCE(OLD.late_minutes, 0),
+        late_minutes_count = late_minutes_count - (OLD.late_minutes IS NOT NULL)
+    WHERE id = 1;
+"""
+
+_LEAVE_ADD = """
+    UPDATE statistics_summary SET
+        annual_leave_used = annual_leave_used + COALESCE(NEW.annual_leave_used, 0),
+        casual_leave_used = casual_leave_used + COALESCE(NEW.casual_leave_used, 0),
+        sick_leave_used = sick_leave_used + COALESCE(NEW.sick_leave_used, 0)
+    WHERE id = 1;
+"""
+
+_LEAVE_REMOVE = """
+    UPDATE statistics_summary SET
+        annual_leave_used = annual_leave_used - COALESCE(OLD.annual_leave_used, 0),
+        casual_leave_used = casual_leave_used - COALESCE(OLD.casual_leave_used, 0),
+        sick_leave_used = sick_leave_used - COALESCE(OLD.sick_leave_used, 0)
+    WHERE id = 1;
+"""
+
+STATISTICS_TRIGGERS = {
+    'trg_stats_employees_insert': f"""
+        AFTER INSERT ON employees BEGIN
+            UPDATE statistics_summary SET total_employees = total_employees + 1 WHERE id = 1;
+            {_DEPARTMENT_INCREMENT}
+        END""",
+    'trg_stats_employees_delete': f"""
+        AFTER DELETE ON employees BEGIN
+            UPDATE statistics_summary SET total_employees = total_employees - 1 WHERE id = 1;
+            {_DEPARTMENT_DECREMENT}
+        END""",
+    'trg_stats_employees_department': f"""
+        AFTER UPDATE OF department ON employees
+        WHEN COALESCE(OLD.department, '') <> COALESCE(NEW.department, '') BEGIN
+            {_DEPARTMENT_DECREMENT}
+            {_DEPARTMENT_INCREMENT}
+        END""",
+    'trg_stats_attendance_insert': f"AFTER INSERT ON attendance BEGIN {_ATTENDANCE_ADD} END",
+    'trg_stats_attendance_delete': f"AFTER DELETE ON attendance BEGIN {_ATTENDANCE_REMOVE} END",
+    'trg_stats_attendance_update': f"""
+        AFTER UPDATE OF working_hours, late_minutes ON attendance BEGIN
+            {_ATTENDANCE_REMOVE}
+            {_ATTENDANCE_ADD}
+        END""",
+    'trg_stats_leave_insert': f"AFTER INSERT ON leave_management BEGIN {_LEAVE_ADD} END",
+    'trg_stats_leave_delete': f"AFTER DELETE ON leave_management BEGIN {_LEAVE_REMOVE} END",
+    'trg_stats_leave_update': f"""
+        AFTER UPDATE OF annual_leave_used, casual_leave_used, sick_leave_used ON leave_management BEGIN
+            {_LEAVE_REMOVE}
+            {_LEAVE_ADD}
+        END""",
+}
+
+
+def rebuild_statistics():
+    """إعادة بناء جداول الملخص من الصفر بالاستعلامات التجميعية الكاملة."""
+    db.session.execute(text("DELETE FROM statistics_by_department"))
+    db.session.execute(text("""
+        INSERT INTO statistics_by_department (department, employee_count)
+        SELECT COALESCE(department, ''), COUNT(*) FROM employees GROUP BY COALESCE(department, '')
+    """))
+    db.session.execute(text("DELETE FROM statistics_summary"))
+    db.session.execute(text("""
+        INSERT INTO statistics_summary (
+            id, total_employees,
+            working_hours_sum, working_hours_count, late_minutes_sum, late_minutes_count,
+            annual_leave_used, casual_leave_used, sick_leave_used, rebuilt_at
+        )
+        SELECT 1,
+            (SELECT COUNT(*) FROM employees),
+            a.working_hours_sum, a.working_hours_count, a.late_minutes_sum, a.late_minutes_count,
+            l.annual_leave_used, l.casual_leave_used, l.sick_leave_used,
+            :rebuilt_at
+        FROM (
+            SELECT COALESCE(SUM(working_hours), 0) AS working_hours_sum, COUNT(working_hours) AS working_hours_count,
+                   COALESCE(SUM(late_minutes), 0) AS late_minutes_sum, COUNT(late_minutes) AS late_minutes_count
+            FROM attendance
+        ) AS a, (
+            SELECT COALESCE(SUM(annual_leave_used), 0) AS annual_leave_used,
+                   COALESCE(SUM(casual_leave_used), 0) AS casual_leave_used,
+                   COALESCE(SUM(sick_leave_used), 0) AS sick_leave_used
+            FROM leave_management
+        ) AS l
+    """), {"rebuilt_at": datetime.utcnow()})
+    db.session.commit()
+
+
+def install_statistics():
+    """إنشاء الـ Triggers إن لم تكن موجودة، وبناء الملخص لأول مرة."""
+    for name, body in STATISTICS_TRIGGERS.items():
+        db.session.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+    db.session.commit()
+
+    if db.session.get(StatisticsSummary, 1) is None:
+        rebuild_statistics()
+
+
+def get_statistics_snapshot():
+    """قراءة الإحصائيات من جداول الملخص (صف واحد + صف لكل قسم)."""
+    summary = db.session.get(StatisticsSummary, 1)
+    if summary is None:
+        rebuild_statistics()
+        summary = db.session.get(StatisticsSummary, 1)
+
+    employees_by_department = {
+        row.department: row.employee_count for row in DepartmentStatistic.query.all()
+    }
+    return summary.to_dict(employees_by_department)
@@ -0,0 +1,65 @@
+from flask import g
+from sqlalchemy import text
+from src.models.hr_models import db
+
+# رقم إصدار (generation) لكل جدول تزيده الـ Triggers مع أي إدراج أو تحديث أو
+# حذف، بما في ذلك الإدراج المجمّع والاستيراد. يُستخدم لبناء ETag و
+# Last-Modified لمسارات القراءة دون المرور على الجداول نفسها.
+
+VERSIONED_TABLES = ['employees', 'departments', 'leave_requests', 'leave_management', 'attendance', 'documents']
+
+
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+
+    table_name = db.Column(db.String(64), primary_key=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime)
+
+
+def _bump(table_name):
+    return f"""
+        UPDATE table_versions SET generation = generation + 1, updated_at = CURRENT_TIMESTAMP
+        WHERE table_name = '{table_name}';
+    """
+
+
+VERSION_TRIGGERS = {
+    f'trg_version_{table_name}_{operation.lower()}': f"AFTER {operation} ON {table_name} BEGIN {_bump(table_name)} END"
+    for table_name in VERSIONED_TABLES
+    for operation in ('INSERT', 'UPDATE', 'DELETE')
+}
+
+
+def install_table_versions():
+    """إنشاء صفوف الإصدارات والـ Triggers إن لم تكن موجودة."""
+    for table_name in VERSIONED_TABLES:
+        db.session.execute(
+            text("INSERT OR IGNORE INTO table_versions (table_name, generation, updated_at) "
+                 "VALUES (:table_name, 0, CURRENT_TIMESTAMP)"),
+            {"table_name": table_name},
+        )
+    for name, body in VERSION_TRIGGERS.items():
+        db.session.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+    db.session.commit()
+
+
+def get_table_versions(table_names):
+    """يعيد {اسم الجدول: (generation, updated_at)} للجداول المطلوبة."""
+    rows = db.session.execute(
+        db.select(TableVersion.table_name, TableVersion.generation, TableVersion.updated_at)
+        .where(TableVersion.table_name.in_(table_names))
+    )
+    return {row.table_name: (row.generation, row.updated_at) for row in rows}
+
+
+def request_table_versions(table_names):
+    """
+    مثل get_table_versions لكن مرة واحدة لكل طلب: الطلب الشرطي (ETag) والذاكرة
+    المؤقتة في العملية يقرآن الإصدارات نفسها باستعلام واحد.
+    """
+    cached = g.setdefault('table_versions', {})
+    missing = [name for name in table_names if name not in cached]
+    if missing:
+        cached.update(get_table_versions(missing))
+    return {name: cached[name] for name in table_names if name in cached}
@@ -1,33 +1,67 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, current_app, request, jsonify, send_file, url_for
 from src.models.hr_models import db, Employee, LeaveManagement, LeaveRequest, Attendance, Department, Document
+from src.models.statistics import get_statistics_snapshot, rebuild_statistics
+from src.models.search import employee_search_query
+from src.models.includes import nest_includes
+from src.models.serialization import json_value
+from src.models.attendance_rollup import attendance_summary
+from src.models.leave_calendar import ACTIVE_LEAVE_STATUSES, leave_calendar_query, overlapping_leave_requests
+from src.models.leave_workflow import LeaveWorkflowError, decide_leave_request, recompute_leave_balances
+from src.models.jobs import Job
+from src.models.document_blobs import INLINE_CONTENT_TYPE, normalize_content_type, serves_inline
+from src.utils.conditional import conditional
+from src.utils.directory_cache import department_employees, department_names
+from src.utils.employee_cache import employee_cache, get_employee_record
+from src.utils.pagination import InvalidQueryParam, offset_response, parse_date_range, parse_include
+from src.utils.streaming import NDJSON_MIMETYPE, list_response
+from src.utils.bulk_export import EXPORT_TABLES, export_response
+from src.utils.excel_export import write_employees_xlsx, EXCEL_MIMETYPE
+from src.utils.excel_import import import_employees_xlsx, IMPORT_CHUNK_SIZE
+from src.utils.attendance_ingest import IngestError, ingest_punches, INGEST_CHUNK_SIZE, SHIFT_START, LATE_GRACE_MINUTES
+from src.utils.jobs import JobQueueFull, job_runner
+from src.utils.blob_store import blob_store
+from src.utils import job_tasks  # noqa: F401  تسجيل أنواع المهام
+from src.utils.employee_batch import BatchError, create_employees, update_employees, delete_employees, delete_employee_records
 from datetime import datetime, date
-import sqlite3
-import os
 import io
+import os
+import tempfile
+from types import SimpleNamespace
 from werkzeug.utils import secure_filename
 
-# استيراد openpyxl بدلاً من pandas
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, Alignment
-from openpyxl.utils import get_column_letter
+from zipfile import BadZipFile
+from openpyxl.utils.exceptions import InvalidFileException
 
 hr_bp = Blueprint("hr", __name__)
 
 # مسار للحصول على جميع الموظفين
 @hr_bp.route("/employees", methods=["GET"])
+@conditional('employees', includes=Employee)
 def get_employees():
     try:
-        employees = Employee.query.all()
-        return jsonify([emp.to_dict() for emp in employees])
+        # يدعم limit/after للترقيم بالمؤشر و fields لاختيار الأعمدة و stream للبث
+        # و include لتضمين العلاقات (leave_management,leave_requests,...)
+        return list_response(Employee, Employee.employee_id)
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # مسار للحصول على موظف محدد
 @hr_bp.route("/employees/<int:employee_id>", methods=["GET"])
+@conditional('employees', includes=Employee)
 def get_employee(employee_id):
     try:
-        employee = Employee.query.get_or_404(employee_id)
-        return jsonify(employee.to_dict())
+        includes = parse_include(Employee)
+        record = get_employee_record(employee_id)
+        if record is None:
+            return jsonify({"error": "الموظف غير موجود"}), 404
+        if not includes:
+            return jsonify(record)
+        # السجل المحفوظ مشترك، فتُضاف العلاقات إلى نسخة منه
+        return jsonify(nest_includes(Employee, includes, [SimpleNamespace(**record)], [dict(record)])[0])
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -98,6 +132,7 @@ def update_employee(employee_id):
 
         employee.updated_at = datetime.utcnow()
         db.session.commit()
+        employee_cache.invalidate([employee_id])
 
         return jsonify(employee.to_dict())
     except Exception as e:
@@ -110,107 +145,62 @@ def delete_employee(employee_id):
     try:
         employee = Employee.query.get_or_404(employee_id)
 
-        # حذف السجلات المرتبطة أولاً
-        LeaveManagement.query.filter_by(employee_id=employee_id).delete()
-        LeaveRequest.query.filter_by(employee_id=employee_id).delete()
-        Attendance.query.filter_by(employee_id=employee_id).delete()
-
-        # حذف الموظف
-        db.session.delete(employee)
+        # حذف الموظف مع السجلات المرتبطة (الإجازات، الحضور، المستندات)
+        delete_employee_records([employee.employee_id])
         db.session.commit()
+        employee_cache.invalidate([employee_id])
 
         return jsonify({"message": "تم حذف الموظف بنجاح"}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# مسارات العمليات المجمّعة على الموظفين (مصفوفة JSON في كل طلب)
+@hr_bp.route("/employees/batch", methods=["POST"])
+def add_employees_batch():
+    try:
+        return jsonify(create_employees(request.get_json()).to_dict())
+    except BatchError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+@hr_bp.route("/employees/batch", methods=["PUT"])
+def update_employees_batch():
+    try:
+        return jsonify(update_employees(request.get_json()).to_dict())
+    except BatchError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+@hr_bp.route("/employees/batch", methods=["DELETE"])
+def delete_employees_batch():
+    try:
+        return jsonify(delete_employees(request.get_json()).to_dict())
+    except BatchError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
 # مسار لتصدير بيانات الموظفين إلى Excel باستخدام openpyxl
 @hr_bp.route("/employees/export", methods=["GET"])
 def export_employees_to_excel():
     try:
-        employees = Employee.query.all()
-        
-        # إنشاء مصنف جديد
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "بيانات الموظفين"
-        
-        # تعريف رؤوس الأعمدة بالترتيب المطلوب
-        headers = [
-            'الرقم الوظيفي', 'الاسم الكامل', 'الدار', 'الرقم القومي', 'الوظيفة', 'المؤهل',
-            'تاريخ التعيين', 'عدد الابناط', 'سنوات الخبرة', 'الراتب من المنظومة', 'الراتب',
-            'كود القسم', 'القسم', 'البريد الإلكتروني', 'رقم الهاتف', 'تاريخ الميلاد',
-            'الجنسية', 'العنوان', 'الحالة الاجتماعية', 'عدد الأطفال', 'المستوى التعليمي',
-            'التخصص', 'تاريخ انتهاء العقد', 'الراتب الأساسي', 'البدلات', 'إجمالي الراتب',
-            'رقم الحساب البنكي', 'ملاحظات'
-        ]
-        ws.append(headers)
-        
-        # تنسيق رؤوس الأعمدة
-        header_font = Font(bold=True)
-        for cell in ws[1]:
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
-
-        # إضافة البيانات
-        for emp in employees:
-            emp_dict = emp.to_dict()
-            row_data = [
-                emp_dict.get('employee_id'),
-                emp_dict.get('full_name'),
-                emp_dict.get('house_number'),
-                emp_dict.get('national_id'),
-                emp_dict.get('job_title'),
-                emp_dict.get('qualification'),
-                emp_dict.get('hire_date'),
-                emp_dict.get('points_count'),
-                emp_dict.get('years_of_experience'),
-                emp_dict.get('salary_from_system'),
-                emp_dict.get('actual_salary'),
-                emp_dict.get('department_code'),
-                emp_dict.get('department'),
-                emp_dict.get('email'),
-                emp_dict.get('phone'),
-                emp_dict.get('birth_date'),
-                emp_dict.get('nationality'),
-                emp_dict.get('address'),
-                emp_dict.get('marital_status'),
-                emp_dict.get('children_count'),
-                emp_dict.get('education_level'),
-                emp_dict.get('specialization'),
-                emp_dict.get('contract_end_date'),
-                emp_dict.get('basic_salary'),
-                emp_dict.get('allowances'),
-                emp_dict.get('total_salary'),
-                emp_dict.get('bank_account'),
-                emp_dict.get('notes')
-            ]
-            ws.append(row_data)
-
-        # ضبط عرض الأعمدة تلقائياً
-        for col in ws.columns:
-            max_length = 0
-            column = col[0].column_letter # Get the column name
-            for cell in col:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = (max_length + 2) * 1.2 # إضافة هامش بسيط
-            ws.column_dimensions[column].width = adjusted_width
-
-        # حفظ المصنف في الذاكرة
-        output = io.BytesIO()
-        wb.save(output)
+        # الكتابة إلى ملف مؤقت على القرص بدلاً من الذاكرة؛ يُحذف تلقائياً بعد الإرسال
+        output = tempfile.TemporaryFile()
+        write_employees_xlsx(output)
         output.seek(0)
         
         # إنشاء اسم الملف مع التاريخ
-        filename = f"employees_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx"
+        filename = f"employees_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         
         return send_file(
             output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            mimetype=EXCEL_MIMETYPE,
             as_attachment=True,
             download_name=filename
         )
@@ -232,124 +222,20 @@ def import_employees_from_excel():
         if not file.filename.lower().endswith(('.xlsx', '.xls')):
             return jsonify({"error": "يجب أن يكون الملف من نوع Excel (.xlsx أو .xls)"}), 400
         
-        # تحميل المصنف
+        # حجم الدفعة قابل للضبط من الطلب أو من إعدادات التطبيق
+        chunk_size = request.args.get("chunk_size", type=int) or current_app.config.get("IMPORT_CHUNK_SIZE", IMPORT_CHUNK_SIZE)
+        if chunk_size < 1:
+            return jsonify({"error": "chunk_size يجب أن يكون أكبر من صفر"}), 400
+
+        # قراءة المصنف على شكل تدفق وتطبيقه على دفعات
         try:
-            wb = load_workbook(file)
-            ws = wb.active
-        except Exception as e:
+            import_result = import_employees_xlsx(file, chunk_size=chunk_size)
+        except (InvalidFileException, BadZipFile, KeyError) as e:
             return jsonify({"error": f"خطأ في قراءة ملف Excel: {str(e)}"}), 400
-        
-        # تعريف رؤوس الأعمدة المتوقعة باللغة العربية ومقابلها في قاعدة البيانات
-        column_mapping = {
-            'الرقم الوظيفي': 'employee_id',
-            'الاسم الكامل': 'full_name',
-            'الدار': 'house_number',
-            'الرقم القومي': 'national_id',
-            'الوظيفة': 'job_title',
-            'المؤهل': 'qualification',
-            'تاريخ التعيين': 'hire_date',
-            'عدد الابناط': 'points_count',
-            'سنوات الخبرة': 'years_of_experience',
-            'الراتب من المنظومة': 'salary_from_system',
-            'الراتب': 'actual_salary',
-            'كود القسم': 'department_code',
-            'القسم': 'department',
-            'البريد الإلكتروني': 'email',
-            'رقم الهاتف': 'phone',
-            'تاريخ الميلاد': 'birth_date',
-            'الجنسية': 'nationality',
-            'العنوان': 'address',
-            'الحالة الاجتماعية': 'marital_status',
-            'عدد الأطفال': 'children_count',
-            'المستوى التعليمي': 'education_level',
-            'التخصص': 'specialization',
-            'تاريخ انتهاء العقد': 'contract_end_date',
-            'الراتب الأساسي': 'basic_salary',
-            'البدلات': 'allowances',
-            'إجمالي الراتب': 'total_salary',
-            'رقم الحساب البنكي': 'bank_account',
-            'ملاحظات': 'notes'
-        }
-        
-        # قراءة رؤوس الأعمدة من الصف الأول في ملف Excel
-        excel_headers = [cell.value for cell in ws[1]]
-        
-        # إنشاء قائمة بالأسماء الإنجليزية للأعمدة بناءً على الترتيب في Excel
-        mapped_headers = []
-        for header in excel_headers:
-            mapped_headers.append(column_mapping.get(header, None)) # استخدم None إذا لم يتم العثور على تطابق
-
-        imported_count = 0
-        updated_count = 0
-        errors = []
-        
-        # قراءة البيانات بدءاً من الصف الثاني
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-            employee_data = {}
-            for col_idx, cell_value in enumerate(row):
-                if col_idx < len(mapped_headers) and mapped_headers[col_idx]:
-                    employee_data[mapped_headers[col_idx]] = cell_value
-            
-            try:
-                employee_id = employee_data.get('employee_id')
-                full_name = employee_data.get('full_name')
-
-                if not employee_id:
-                    errors.append(f"الصف {row_idx}: الرقم الوظيفي مطلوب.")
-                    continue
-                if not full_name:
-                    errors.append(f"الصف {row_idx}: الاسم الكامل مطلوب.")
-                    continue
-                
-                # تحويل الأنواع
-                employee_data['employee_id'] = int(employee_id)
-                employee_data['points_count'] = int(employee_data.get('points_count', 0))
-                employee_data['years_of_experience'] = int(employee_data.get('years_of_experience', 0))
-                employee_data['children_count'] = int(employee_data.get('children_count', 0))
-                
-                # تحويل التواريخ
-                date_fields = ['hire_date', 'birth_date', 'contract_end_date']
-                for field in date_fields:
-                    if field in employee_data and employee_data[field]:
-                        if isinstance(employee_data[field], datetime):
-                            employee_data[field] = employee_data[field].date()
-                        elif isinstance(employee_data[field], str):
-                            try:
-                                employee_data[field] = datetime.strptime(employee_data[field], "%Y-%m-%d").date()
-                            except ValueError:
-                                employee_data[field] = None # أو التعامل مع الخطأ بشكل آخر
-                        else:
-                            employee_data[field] = None
-                    else:
-                        employee_data[field] = None
-                
-                # تحويل الأرقام العشرية
-                float_fields = ['salary_from_system', 'actual_salary', 'basic_salary', 'allowances', 'total_salary']
-                for field in float_fields:
-                    if field in employee_data and employee_data[field] is not None:
-                        try:
-                            employee_data[field] = float(employee_data[field])
-                        except ValueError:
-                            employee_data[field] = None
-
-                existing_employee = Employee.query.filter_by(employee_id=employee_data['employee_id']).first()
-                
-                if existing_employee:
-                    for key, value in employee_data.items():
-                        if key != 'employee_id':
-                            setattr(existing_employee, key, value)
-                    existing_employee.updated_at = datetime.utcnow()
-                    updated_count += 1
-                else:
-                    new_employee = Employee(**employee_data)
-                    db.session.add(new_employee)
-                    imported_count += 1
-                
-            except Exception as e:
-                errors.append(f"الصف {row_idx}: {str(e)}")
-                continue
-        
-        db.session.commit()
+
+        imported_count = import_result.imported_count
+        updated_count = import_result.updated_count
+        errors = import_result.errors
         
         result = {
             "message": "تم استيراد البيانات بنجاح",
@@ -370,17 +256,114 @@ def import_employees_from_excel():
         db.session.rollback()
         return jsonify({"error": f"خطأ عام في استيراد البيانات: {str(e)}"}), 500
 
+# مسار لتصدير جدول كامل (أو مفلتر بـ since/from/to) كملف CSV أو NDJSON مبثوث
+@hr_bp.route("/export/<string:table_name>", methods=["GET"])
+def export_table(table_name):
+    try:
+        if table_name not in EXPORT_TABLES:
+            return jsonify({"error": f"جدول غير معروف: {table_name} (المتاح: {', '.join(EXPORT_TABLES)})"}), 404
+        fmt = request.args.get("format") or ("ndjson" if request.accept_mimetypes.best == NDJSON_MIMETYPE else "csv")
+        return export_response(table_name, fmt.lower())
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# مسار لإضافة مهمة خلفية (employees-import، employees-export، leave-recompute، statistics-rebuild)
+# يعيد المهمة فوراً برمز 202؛ التقدم والنتيجة من /jobs/<id>
+@hr_bp.route("/jobs/<string:kind>", methods=["POST"])
+def submit_job(kind):
+    try:
+        if kind not in job_runner.handlers:
+            return jsonify({"error": f"نوع مهمة غير معروف: {kind} (المتاح: {', '.join(job_runner.handlers)})"}), 404
+
+        params = {}
+        input_path = None
+        if kind == 'employees-import':
+            file = request.files.get('file')
+            if file is None or file.filename == '':
+                return jsonify({"error": "لم يتم رفع أي ملف"}), 400
+            if not file.filename.lower().endswith(('.xlsx', '.xls')):
+                return jsonify({"error": "يجب أن يكون الملف من نوع Excel (.xlsx أو .xls)"}), 400
+            chunk_size = request.args.get("chunk_size", type=int) or current_app.config.get("IMPORT_CHUNK_SIZE", IMPORT_CHUNK_SIZE)
+            if chunk_size < 1:
+                return jsonify({"error": "chunk_size يجب أن يكون أكبر من صفر"}), 400
+            params['chunk_size'] = chunk_size
+            # الملف المرفوع يُغلق بانتهاء الطلب، فيُحفظ على القرص لتقرأه المهمة
+            input_path = job_runner.input_path(secure_filename(file.filename) or 'upload.xlsx')
+            file.save(input_path)
+
+        try:
+            job = job_runner.submit(kind, params, input_path=input_path)
+        except JobQueueFull as e:
+            if input_path and os.path.exists(input_path):
+                os.remove(input_path)
+            return jsonify({"error": str(e)}), 503, {"Retry-After": "30"}
+
+        location = url_for("hr.get_job", job_id=job.id)
+        return jsonify(job.to_dict()), 202, {"Location": location}
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+# مسار لآخر المهام الخلفية (الأحدث أولاً)
+@hr_bp.route("/jobs", methods=["GET"])
+def get_jobs():
+    try:
+        limit = min(request.args.get("limit", 50, type=int), 500)
+        query = Job.query.order_by(Job.id.desc())
+        if request.args.get("status"):
+            query = query.filter(Job.status == request.args["status"])
+        return jsonify([job.to_dict() for job in query.limit(limit)])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# مسار لحالة مهمة وتقدمها (الصفوف المعالجة والأخطاء والنتيجة)
+@hr_bp.route("/jobs/<int:job_id>", methods=["GET"])
+def get_job(job_id):
+    try:
+        job = db.session.get(Job, job_id)
+        if job is None:
+            return jsonify({"error": "المهمة غير موجودة"}), 404
+        return jsonify(job.to_dict())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# مسار لتنزيل ناتج المهمة (ملف التصدير) بعد نجاحها
+@hr_bp.route("/jobs/<int:job_id>/artifact", methods=["GET"])
+def download_job_artifact(job_id):
+    try:
+        job = db.session.get(Job, job_id)
+        if job is None:
+            return jsonify({"error": "المهمة غير موجودة"}), 404
+        if job.status != 'succeeded' or not job.artifact_path:
+            return jsonify({"error": "لا يوجد ملف ناتج لهذه المهمة", "status": job.status}), 409
+        if not os.path.exists(job.artifact_path):
+            return jsonify({"error": "انتهت صلاحية الملف الناتج"}), 410
+        return send_file(
+            job.artifact_path,
+            mimetype=job.artifact_mimetype,
+            as_attachment=True,
+            download_name=job.artifact_name,
+            conditional=True,
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # مسار للحصول على إدارة الإجازات
 @hr_bp.route("/leave-management", methods=["GET"])
+@conditional('leave_management')
 def get_leave_management():
     try:
-        leave_records = LeaveManagement.query.all()
-        return jsonify([record.to_dict() for record in leave_records])
+        return list_response(LeaveManagement, LeaveManagement.id)
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # مسار للحصول على إدارة الإجازات لموظف محدد
 @hr_bp.route("/leave-management/<int:employee_id>", methods=["GET"])
+@conditional('leave_management')
 def get_employee_leave_management(employee_id):
     try:
         leave_record = LeaveManagement.query.filter_by(employee_id=employee_id).first()
@@ -391,12 +374,47 @@ def get_employee_leave_management(employee_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# مسار إداري لإعادة حساب الأرصدة المستخدمة لكل الموظفين من الطلبات المعتمدة
+@hr_bp.route("/leave-management/recompute", methods=["POST"])
+def recompute_leave_management():
+    try:
+        records_count = recompute_leave_balances()
+        return jsonify({"message": "تمت إعادة حساب أرصدة الإجازات", "records_count": records_count})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
 # مسار للحصول على طلبات الإجازات
 @hr_bp.route("/leave-requests", methods=["GET"])
+@conditional('leave_requests')
 def get_leave_requests():
     try:
-        leave_requests = LeaveRequest.query.all()
-        return jsonify([req.to_dict() for req in leave_requests])
+        return list_response(LeaveRequest, LeaveRequest.id)
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# مسار تقويم الإجازات: من في إجازة بين تاريخين (from/to إلزاميان)، مع department و status اختياريين
+@hr_bp.route("/leave-requests/calendar", methods=["GET"])
+@conditional('leave_requests', 'employees')
+def get_leave_calendar():
+    try:
+        date_from, date_to = parse_date_range()
+        if not date_from or not date_to:
+            return jsonify({"error": "from و to مطلوبان بصيغة 2024-01-31"}), 400
+
+        status = request.args.get("status")
+        statuses = (status,) if status else ACTIVE_LEAVE_STATUSES
+        query = leave_calendar_query(
+            date.fromisoformat(date_from),
+            date.fromisoformat(date_to),
+            department=request.args.get("department") or None,
+            statuses=statuses,
+        )
+        return jsonify([{key: json_value(value) for key, value in row._asdict().items()} for row in query])
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -406,8 +424,22 @@ def add_leave_request():
     try:
         data = request.get_json()
 
+        # الطلب الجديد معلق دائماً؛ الاعتماد والرفض عبر /approve و /reject فقط حتى يُخصم الرصيد
+        if data.get("status", "pending") != "pending":
+            return jsonify({"error": "طلب الإجازة الجديد يكون معلقاً (pending)؛ استخدم /approve أو /reject للبت فيه"}), 400
+
         start_date = datetime.strptime(data.get("start_date"), "%Y-%m-%d").date()
         end_date = datetime.strptime(data.get("end_date"), "%Y-%m-%d").date()
+        if end_date < start_date:
+            return jsonify({"error": "تاريخ النهاية يجب ألا يسبق تاريخ البداية"}), 400
+
+        # رفض الطلب إذا تقاطع مع طلب معلق أو معتمد لنفس الموظف
+        overlapping = overlapping_leave_requests(data.get("employee_id"), start_date, end_date).all()
+        if overlapping:
+            return jsonify({
+                "error": "طلب الإجازة يتقاطع مع طلبات أخرى للموظف",
+                "overlapping": [{key: json_value(value) for key, value in row._asdict().items()} for row in overlapping],
+            }), 409
 
         leave_request = LeaveRequest(
             employee_id=data.get("employee_id"),
@@ -416,7 +448,7 @@ def add_leave_request():
             end_date=end_date,
             days_requested=data.get("days_requested"),
             reason=data.get("reason"),
-            status=data.get("status", "pending"),
+            status="pending",
         )
 
         db.session.add(leave_request)
@@ -427,112 +459,298 @@ def add_leave_request():
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# مسارا اعتماد ورفض طلب إجازة معلق (approved_by اختياري في جسم الطلب)
+@hr_bp.route("/leave-requests/<int:request_id>/approve", methods=["POST"], defaults={"decision": "approved"})
+@hr_bp.route("/leave-requests/<int:request_id>/reject", methods=["POST"], defaults={"decision": "rejected"})
+def decide_leave(request_id, decision):
+    try:
+        data = request.get_json(silent=True) or {}
+        leave_request = decide_leave_request(request_id, decision, approved_by=data.get("approved_by"))
+        return jsonify(leave_request.to_dict())
+    except LeaveWorkflowError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+def attendance_range_query(query):
+    """تطبيق معاملي from= و to= (تواريخ شاملة) على استعلام الحضور."""
+    date_from, date_to = parse_date_range()
+    if date_from:
+        query = query.filter(Attendance.date >= date_from)
+    if date_to:
+        query = query.filter(Attendance.date <= date_to)
+    return query
+
 # مسار للحصول على سجلات الحضور
 @hr_bp.route("/attendance", methods=["GET"])
+@conditional('attendance')
 def get_attendance():
     try:
-        attendance_records = Attendance.query.all()
-        return jsonify([record.to_dict() for record in attendance_records])
+        # جدول الحضور هو الأكبر: استخدم ?stream=json أو ?stream=ndjson للبث على دفعات
+        # و from/to (YYYY-MM-DD) لتحديد مدى التواريخ
+        return list_response(Attendance, Attendance.id, attendance_range_query(Attendance.query))
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# مسار لملخص الحضور الشهري: from/to بصيغة YYYY-MM و group=employee أو department.
+# الشهر يُحسب لقسم الموظف عند تسجيل أول حضور له فيه، لا لقسمه الحالي، فنقل
+# الموظف لا يغيّر ملخصات الشهور السابقة (ولا يغيّر الـ ETag: يعتمد على الحضور فقط)
+@hr_bp.route("/attendance/summary", methods=["GET"])
+@conditional('attendance')
+def get_attendance_summary():
+    try:
+        month_from, month_to = parse_date_range(fmt="%Y-%m")
+        group = request.args.get("group", "employee")
+        if group not in ("employee", "department"):
+            return jsonify({"error": "group يجب أن يكون employee أو department"}), 400
+
+        return jsonify(attendance_summary(
+            month_from,
+            month_to,
+            group=group,
+            employee_id=request.args.get("employee_id", type=int),
+            department=request.args.get("department") or None,
+        ))
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# مسار لاستقبال بصمات أجهزة الحضور على دفعات (CSV أو NDJSON)
+@hr_bp.route("/attendance/ingest", methods=["POST"])
+def ingest_attendance():
+    try:
+        chunk_size = request.args.get("chunk_size", type=int) or current_app.config.get("INGEST_CHUNK_SIZE", INGEST_CHUNK_SIZE)
+        if chunk_size < 1:
+            return jsonify({"error": "chunk_size يجب أن يكون أكبر من صفر"}), 400
+
+        ingest_result = ingest_punches(
+            request.stream,
+            request.mimetype,
+            current_app.json.loads,
+            shift_start=current_app.config.get("SHIFT_START", SHIFT_START),
+            grace_minutes=current_app.config.get("LATE_GRACE_MINUTES", LATE_GRACE_MINUTES),
+            chunk_size=chunk_size,
+        )
+        errors = ingest_result.errors
+
+        result = {
+            "message": "تم استقبال البصمات بنجاح",
+            "punches_count": ingest_result.punches_count,
+            "records_count": ingest_result.records_count,
+            "errors_count": len(errors)
+        }
+
+        if errors:
+            result["errors"] = errors[:10]  # عرض أول 10 أخطاء فقط
+            if len(errors) > 10:
+                result["note"] = f"تم عرض أول 10 أخطاء من أصل {len(errors)} خطأ"
+
+        return jsonify(result), 200
+    except IngestError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 # مسار للحصول على سجلات الحضور لموظف محدد
 @hr_bp.route("/attendance/<int:employee_id>", methods=["GET"])
+@conditional('attendance')
 def get_employee_attendance(employee_id):
     try:
-        attendance_records = Attendance.query.filter_by(employee_id=employee_id).all()
-        return jsonify([record.to_dict() for record in attendance_records])
+        query = attendance_range_query(Attendance.query.filter_by(employee_id=employee_id))
+        return list_response(Attendance, Attendance.id, query)
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-# مسار للحصول على الأقسام
-@hr_bp.route("/departments", methods=["GET"])
-def get_departments():
+# مسار لقائمة المستندات (البيانات الوصفية فقط؛ المحتوى من /documents/<id>/content)
+@hr_bp.route("/documents", methods=["GET"])
+@conditional('documents')
+def get_documents():
     try:
-        departments = Department.query.all()
-        return jsonify([dept.to_dict() for dept in departments])
+        query = Document.query
+        if request.args.get("employee_id"):
+            query = query.filter(Document.employee_id == request.args.get("employee_id", type=int))
+        return list_response(Document, Document.id, query)
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-# مسار للحصول على إحصائيات عامة
-@hr_bp.route("/statistics", methods=["GET"])
-def get_statistics():
+# مسار للبيانات الوصفية لمستند محدد
+@hr_bp.route("/documents/<int:document_id>", methods=["GET"])
+@conditional('documents')
+def get_document(document_id):
     try:
-        # استخدام SQLite مباشرة للاستعلامات المعقدة
-        db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "database", "hr_system.db")
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        document = db.session.get(Document, document_id)
+        if document is None:
+            return jsonify({"error": "المستند غير موجود"}), 404
+        return jsonify(document.to_dict())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        # إحصائيات الموظفين
-        cursor.execute("SELECT COUNT(*) FROM employees")
-        total_employees = cursor.fetchone()[0]
+def store_document_content(document, stream, content_type, file_name=None):
+    """بث المحتوى إلى مخزن الملفات وتسجيل بصمته في المستند."""
+    digest, size = blob_store().put_stream(stream)
+    document.content = None
+    document.content_sha256 = digest
+    document.content_size = size
+    document.content_type = normalize_content_type(content_type)
+    if file_name:
+        document.file_name = file_name
+
+# مسار لإضافة مستند: multipart (file + الحقول) أو JSON (content نصي)
+@hr_bp.route("/documents", methods=["POST"])
+def add_document():
+    try:
+        file = request.files.get("file")
+        data = request.form if file is not None else request.get_json()
+        if not data or not data.get("document_number") or not data.get("document_type"):
+            return jsonify({"error": "document_number و document_type مطلوبان"}), 400
+
+        document = Document(
+            document_number=data.get("document_number"),
+            document_type=data.get("document_type"),
+            employee_id=data.get("employee_id"),
+            subject=data.get("subject"),
+            recipient=data.get("recipient"),
+            created_by=data.get("created_by"),
+        )
+        if file is not None:
+            store_document_content(document, file.stream, file.mimetype, secure_filename(file.filename or "") or None)
+        elif data.get("content") is not None:
+            store_document_content(document, io.BytesIO(data["content"].encode("utf-8")), INLINE_CONTENT_TYPE)
 
-        cursor.execute("SELECT department, COUNT(*) FROM employees GROUP BY department")
-        employees_by_department = dict(cursor.fetchall())
+        db.session.add(document)
+        db.session.commit()
 
-        # إحصائيات الحضور
-        cursor.execute("SELECT AVG(working_hours) FROM attendance WHERE working_hours IS NOT NULL")
-        avg_working_hours = cursor.fetchone()[0] or 0
+        return jsonify(document.to_dict()), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
 
-        cursor.execute("SELECT AVG(late_minutes) FROM attendance WHERE late_minutes IS NOT NULL")
-        avg_late_minutes = cursor.fetchone()[0] or 0
+# مسار لاستبدال محتوى مستند بجسم الطلب الخام (يُبث إلى المخزن دون تحميله في الذاكرة)
+@hr_bp.route("/documents/<int:document_id>/content", methods=["PUT"])
+def replace_document_content(document_id):
+    try:
+        document = db.session.get(Document, document_id)
+        if document is None:
+            return jsonify({"error": "المستند غير موجود"}), 404
+        file_name = secure_filename(request.args.get("file_name", "")) or None
+        store_document_content(document, request.stream, request.mimetype, file_name)
+        db.session.commit()
+        return jsonify(document.to_dict())
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
 
-        # إحصائيات الإجازات
-        cursor.execute("SELECT SUM(annual_leave_used), SUM(casual_leave_used), SUM(sick_leave_used) FROM leave_management")
-        leave_stats = cursor.fetchone()
+# مسار لتنزيل محتوى مستند: يُبث من الملف ويدعم Range و If-None-Match (البصمة هي الـ ETag)
+# ويُعرض في المتصفح فقط للأنواع الآمنة (INLINE_SAFE_TYPES)، وغيرها مرفق
+@hr_bp.route("/documents/<int:document_id>/content", methods=["GET"])
+def download_document_content(document_id):
+    try:
+        document = db.session.get(Document, document_id)
+        if document is None:
+            return jsonify({"error": "المستند غير موجود"}), 404
+        if not document.content_sha256:
+            return jsonify({"error": "لا يوجد محتوى لهذا المستند"}), 404
+        path = blob_store().path(document.content_sha256)
+        if not os.path.exists(path):
+            return jsonify({"error": "ملف المحتوى غير موجود في المخزن"}), 410
+        # الأنواع غير الآمنة للعرض تُنزَّل كمرفق، و nosniff يمنع المتصفح من تخمين نوع آخر
+        inline = serves_inline(document.content_type) and request.args.get("download") != "1"
+        response = send_file(
+            path,
+            mimetype=document.content_type,
+            as_attachment=not inline,
+            download_name=document.file_name or document.document_number,
+            conditional=True,
+            etag=document.content_sha256,
+        )
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        return response
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        conn.close()
+# مسار للحصول على الأقسام
+@hr_bp.route("/departments", methods=["GET"])
+@conditional('departments')
+def get_departments():
+    try:
+        return list_response(Department, Department.id)
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        statistics = {
-            "total_employees": total_employees,
-            "employees_by_department": employees_by_department,
-            "avg_working_hours": round(avg_working_hours, 2),
-            "avg_late_minutes": round(avg_late_minutes, 2),
-            "total_annual_leave_used": leave_stats[0] or 0,
-            "total_casual_leave_used": leave_stats[1] or 0,
-            "total_sick_leave_used": leave_stats[2] or 0,
-        }
+# مسار للحصول على إحصائيات عامة
+@hr_bp.route("/statistics", methods=["GET"])
+@conditional('employees', 'attendance', 'leave_management')
+def get_statistics():
+    try:
+        # القراءة من جداول الملخص التي تحدّثها الـ Triggers بدلاً من المرور على الجداول كاملة
+        return jsonify(get_statistics_snapshot())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        return jsonify(statistics)
+# مسار إداري لإعادة بناء جداول الإحصائيات من الصفر
+@hr_bp.route("/statistics/rebuild", methods=["POST"])
+def rebuild_statistics_store():
+    try:
+        rebuild_statistics()
+        return jsonify(get_statistics_snapshot())
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 # مسار للبحث في الموظفين
 @hr_bp.route("/employees/search", methods=["GET"])
+@conditional('employees', includes=Employee)
 def search_employees():
     try:
         query = request.args.get("q", "")
         department = request.args.get("department", "")
 
-        employees_query = Employee.query
+        if not query:
+            employees_query = Employee.query
+            if department:
+                employees_query = employees_query.filter(Employee.department == department)
+            return list_response(Employee, Employee.employee_id, employees_query)
 
-        if query:
-            employees_query = employees_query.filter(
-                Employee.full_name.contains(query) | Employee.employee_id.like(f"%{query}%")
-            )
+        # البحث عبر فهرس FTS5 مع توحيد الإملاء العربي، والنتائج مرتبة حسب الصلة
+        employees_query = employee_search_query(query)
+        if employees_query is None:
+            return jsonify([])
 
         if department:
             employees_query = employees_query.filter(Employee.department == department)
 
-        employees = employees_query.all()
-        return jsonify([emp.to_dict() for emp in employees])
+        return offset_response(Employee, employees_query)
+    except InvalidQueryParam as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # مسار للحصول على جميع الأقسام (للقوائم المنسدلة)
 @hr_bp.route("/departments_list", methods=["GET"])
+@conditional('departments')
 def get_departments_list():
     try:
-        departments = Department.query.with_entities(Department.name).all()
-        return jsonify([dept[0] for dept in departments])
+        return jsonify(list(department_names.get()))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # مسار للحصول على الموظفين حسب القسم (للقوائم المنسدلة)
 @hr_bp.route("/employees_by_department/<string:department_name>", methods=["GET"])
+@conditional('employees')
 def get_employees_by_department(department_name):
     try:
-        employees = Employee.query.filter_by(department=department_name).all()
-        return jsonify([{"employee_id": emp.employee_id, "full_name": emp.full_name} for emp in employees])
+        employees = department_employees.get(department_name)
+        return jsonify([{"employee_id": employee_id, "full_name": full_name} for employee_id, full_name in employees])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,220 @@
+import codecs
+import csv
+from datetime import datetime, time
+from sqlalchemy import Integer, and_, bindparam, case, cast, func, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.models.hr_models import db, Attendance, Employee
+
+# استقبال بصمات أجهزة الحضور (CSV أو NDJSON) على دفعات. كل دفعة تُجمَّع في
+# صف واحد لكل (موظف، يوم): أول بصمة دخول وآخر بصمة خروج، ثم تُدمج مع الصف
+# الموجود بجملة INSERT ... ON CONFLICT(employee_id, date) واحدة، فإعادة إرسال
+# نفس البصمات لا تغيّر النتيجة. ساعات العمل والتأخير تُحسب بعد ذلك داخل SQLite
+# من أوقات الدخول والخروج المدمجة حسب قواعد الوردية.
+
+# عدد البصمات في كل دفعة (وكل دفعة تُحفظ في معاملة مستقلة)
+INGEST_CHUNK_SIZE = 10000
+
+# قواعد الوردية الافتراضية (يمكن تجاوزها بـ SHIFT_START و LATE_GRACE_MINUTES في إعدادات التطبيق)
+SHIFT_START = time(8, 0)
+LATE_GRACE_MINUTES = 0
+
+CSV_MIMETYPE = "text/csv"
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+PUNCH_DIRECTIONS = ('in', 'out')
+
+
+class IngestError(ValueError):
+    """طلب استقبال غير صالح (يُعاد للعميل كخطأ 400)."""
+
+
+class IngestResult:
+    def __init__(self):
+        self.punches_count = 0
+        self.records_count = 0
+        self.errors = []
+
+
+def _read_csv(stream):
+    """
+    صفوف CSV كقواميس. كل سطر يُفك ترميزه وحده، فالسطر غير الصالح بترميز UTF-8
+    يُسجَّل خطأً في سطره بدلاً من إيقاف الاستقبال بعد حفظ دفعات سابقة.
+    """
+    lines = iter(stream)
+    try:
+        header = next(lines, b'').removeprefix(codecs.BOM_UTF8).decode('utf-8')
+    except UnicodeDecodeError:
+        raise IngestError("السطر الأول (رؤوس الأعمدة) ليس بترميز UTF-8")
+    fields = next(csv.reader([header]), [])
+
+    for line_number, line in enumerate(lines, start=2):
+        try:
+            text = line.decode('utf-8')
+        except UnicodeDecodeError:
+            yield line_number, None
+            continue
+        if not text.strip():
+            continue
+        yield line_number, dict(zip(fields, next(csv.reader([text]))))
+
+
+def _read_ndjson(stream, loads):
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def _parse_punch(event):
+    """يعيد (employee_id، التاريخ، الوقت، الاتجاه أو None) من حدث البصمة."""
+    if not isinstance(event, dict):
+        raise ValueError("سطر غير صالح")
+    try:
+        employee_id = int(event['employee_id'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("الرقم الوظيفي مطلوب ويجب أن يكون رقماً صحيحاً")
+    try:
+        timestamp = datetime.fromisoformat(event['timestamp'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("timestamp مطلوب بصيغة ISO مثل 2024-01-15T08:03:00")
+    # الأوقات تُخزَّن وتُقارن ببداية الوردية بالتوقيت المحلي دون فرق توقيت
+    if timestamp.tzinfo is not None:
+        raise ValueError("timestamp يجب أن يكون بالتوقيت المحلي دون فرق توقيت (مثل +03:00 أو Z)")
+
+    direction = event.get('direction') or None
+    if direction is not None:
+        if not isinstance(direction, str):
+            raise ValueError("direction يجب أن يكون in أو out")
+        direction = direction.lower()
+        if direction not in PUNCH_DIRECTIONS:
+            raise ValueError("direction يجب أن يكون in أو out")
+    return employee_id, timestamp.date(), timestamp.time().replace(microsecond=0), direction
+
+
+def _pair_punches(punches):
+    """
+    تجميع البصمات لكل (موظف، يوم): الدخول أقدم بصمة دخول والخروج أحدث بصمة خروج.
+    البصمة بدون اتجاه تُحسب للاثنين، والبصمة الوحيدة يُفرَّغ خروجها لاحقاً.
+    """
+    days = {}
+    for employee_id, day, punch_time, direction in punches:
+        check_in, check_out = days.get((employee_id, day), (None, None))
+        if direction != 'out' and (check_in is None or punch_time < check_in):
+            check_in = punch_time
+        if direction != 'in' and (check_out is None or punch_time > check_out):
+            check_out = punch_time
+        days[(employee_id, day)] = (check_in, check_out)
+    return [
+        {'employee_id': employee_id, 'date': day, 'check_in_time': check_in, 'check_out_time': check_out}
+        for (employee_id, day), (check_in, check_out) in days.items()
+    ]
+
+
+def _merge_statement():
+    """إدراج صفوف اليوم أو دمجها مع الموجود: أقدم دخول وأحدث خروج."""
+    table = Attendance.__table__
+    stmt = sqlite_insert(table)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=['employee_id', 'date'],
+        set_={
+            'check_in_time': func.min(
+                func.coalesce(table.c.check_in_time, excluded.check_in_time),
+                func.coalesce(excluded.check_in_time, table.c.check_in_time),
+            ),
+            'check_out_time': func.max(
+                func.coalesce(table.c.check_out_time, excluded.check_out_time),
+                func.coalesce(excluded.check_out_time, table.c.check_out_time),
+            ),
+        },
+    )
+
+
+def _recompute_statement(shift_start, grace_minutes):
+    """
+    حساب ساعات العمل والتأخير والحالة من أوقات الصف المدمجة (جملة UPDATE لكل يوم).
+    الخروج الذي لا يأتي بعد الدخول (بصمة واحدة، أو بصمة خروج أقدم من الدخول) يُفرَّغ
+    حتى لا تُحسب ساعات عمل صفرية أو سالبة.
+    """
+    table = Attendance.__table__
+    check_in, check_out = table.c.check_in_time, table.c.check_out_time
+
+    has_check_out = and_(check_in.isnot(None), check_out.isnot(None), check_out > check_in)
+    worked_hours = func.round((func.julianday(check_out) - func.julianday(check_in)) * 24, 2)
+    minutes_late = cast(func.round((func.julianday(check_in) - func.julianday(literal(shift_start.strftime('%H:%M:%S')))) * 1440), Integer)
+    is_late = minutes_late > grace_minutes
+
+    return (
+        update(table)
+        .where(table.c.employee_id == bindparam('b_employee_id'), table.c.date == bindparam('b_date'))
+        .values(
+            check_out_time=case((has_check_out, check_out), else_=None),
+            working_hours=case((has_check_out, worked_hours), else_=None),
+            late_minutes=case((check_in.is_(None), None), (is_late, minutes_late), else_=0),
+            status=case((check_in.is_(None), None), (is_late, 'late'), else_='on_time'),
+        )
+    )
+
+
+def _apply_chunk(punches, result, shift_start, grace_minutes):
+    employee_ids = {punch[0] for _, punch in punches}
+    known_ids = set(db.session.execute(
+        select(Employee.employee_id).where(Employee.employee_id.in_(employee_ids))
+    ).scalars())
+
+    valid = []
+    for line_number, punch in punches:
+        if punch[0] in known_ids:
+            valid.append(punch)
+        else:
+            result.errors.append(f"السطر {line_number}: الموظف {punch[0]} غير موجود")
+    if not valid:
+        return
+
+    rows = _pair_punches(valid)
+    now = datetime.utcnow()
+    db.session.execute(_merge_statement(), [{**row, 'created_at': now} for row in rows])
+    db.session.execute(
+        _recompute_statement(shift_start, grace_minutes),
+        [{'b_employee_id': row['employee_id'], 'b_date': row['date']} for row in rows],
+    )
+    db.session.commit()
+
+    result.punches_count += len(valid)
+    result.records_count += len(rows)
+
+
+def ingest_punches(stream, mimetype, loads, shift_start=SHIFT_START, grace_minutes=LATE_GRACE_MINUTES,
+                   chunk_size=INGEST_CHUNK_SIZE):
+    """
+    استقبال بصمات الحضور من تدفق CSV (employee_id,timestamp[,direction]) أو
+    NDJSON بنفس الحقول. يعيد IngestResult.
+    """
+    if mimetype == CSV_MIMETYPE:
+        events = _read_csv(stream)
+    elif mimetype == NDJSON_MIMETYPE:
+        events = _read_ndjson(stream, loads)
+    else:
+        raise IngestError(f"نوع المحتوى يجب أن يكون {CSV_MIMETYPE} أو {NDJSON_MIMETYPE}")
+
+    result = IngestResult()
+    chunk = []
+    for line_number, event in events:
+        try:
+            chunk.append((line_number, _parse_punch(event)))
+        except ValueError as e:
+            result.errors.append(f"السطر {line_number}: {str(e)}")
+            continue
+
+        if len(chunk) >= chunk_size:
+            _apply_chunk(chunk, result, shift_start, grace_minutes)
+            chunk = []
+
+    if chunk:
+        _apply_chunk(chunk, result, shift_start, grace_minutes)
+
+    return result
@@ -0,0 +1,81 @@
+import hashlib
+import io
+import os
+import tempfile
+from flask import current_app
+
+# مخزن محتوى المستندات على القرص معنوَن بالمحتوى: اسم الملف هو SHA-256 لبياناته،
+# فالمحتوى المكرر يُخزن مرة واحدة والملف لا يتغير أبداً بعد كتابته. الملفات
+# موزعة على مجلدين فرعيين من أول أحرف البصمة (ab/cd/abcd...) حتى لا يكبر مجلد واحد.
+
+BLOB_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    def __init__(self, root):
+        self.root = root
+        self.tmp_dir = os.path.join(root, 'tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def put_stream(self, stream, chunk_size=BLOB_CHUNK_SIZE):
+        """
+        كتابة تدفق إلى المخزن على أجزاء مع حساب البصمة أثناء القراءة.
+        يعيد (البصمة، الحجم). الكتابة إلى ملف مؤقت ثم نقله بـ os.replace، فلا
+        يظهر ملف ناقص تحت اسم بصمة أبداً.
+        """
+        sha256 = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                while chunk := stream.read(chunk_size):
+                    sha256.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+
+            digest = sha256.hexdigest()
+            final_path = self.path(digest)
+            if os.path.exists(final_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+            return digest, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put_bytes(self, data):
+        existing = hashlib.sha256(data).hexdigest()
+        if self.exists(existing):
+            return existing, len(data)
+        return self.put_stream(io.BytesIO(data))
+
+    def remove_unreferenced(self, referenced):
+        """حذف الملفات التي لا تشير إليها أي بصمة في referenced. يعيد عددها."""
+        removed = 0
+        for directory, _, files in os.walk(self.root):
+            if directory.startswith(self.tmp_dir):
+                continue
+            for name in files:
+                if name not in referenced:
+                    os.remove(os.path.join(directory, name))
+                    removed += 1
+        return removed
+
+
+def blob_store():
+    """مخزن التطبيق الحالي (BLOBS_DIR)."""
+    store = current_app.extensions.get('blob_store')
+    if store is None:
+        store = current_app.extensions['blob_store'] = BlobStore(current_app.config['BLOBS_DIR'])
+    return store
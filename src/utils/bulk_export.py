@@ -0,0 +1,137 @@
+import csv
+import io
+from datetime import date, datetime, time, timedelta
+from flask import Response, current_app, request, stream_with_context
+from sqlalchemy import Date, DateTime, String, Time, case, func, select, type_coerce
+from src.models.hr_models import Employee, LeaveManagement, LeaveRequest, Attendance, Department, Document
+from src.utils.pagination import InvalidQueryParam, parse_after, parse_date_range, parse_fields
+from src.utils.streaming import AFTER_FIELD_HEADER, NDJSON_MIMETYPE, row_batches
+
+# تصدير جداول الموارد البشرية كملفات مسطحة (CSV أو NDJSON) لأنظمة الرواتب
+# والتقارير. الصفوف تُقرأ مرتبة بالمفتاح الأساسي على دفعات (row_batches في
+# src/utils/streaming.py: مؤشر واحد في وضع WAL، ودفعات مستقلة لا تمنع الكتابة
+# طوال التنزيل في الوضع الافتراضي) وتُكتب دفعة بدفعة، فالذاكرة ثابتة مهما كان
+# حجم الجدول. التنزيل المنقطع يُستأنف بـ after=<آخر مفتاح مستلم>.
+
+# عدد الصفوف المقروءة من المؤشر والمكتوبة في كل جزء من الاستجابة
+EXPORT_BATCH_SIZE = 5000
+
+# الجدول: (النموذج، عمود since= لآخر تعديل، عمود from=/to= للتاريخ)
+EXPORT_TABLES = {
+    'employees': (Employee, Employee.updated_at, Employee.hire_date),
+    'departments': (Department, Department.created_at, Department.created_at),
+    'leave_management': (LeaveManagement, LeaveManagement.last_updated, LeaveManagement.last_updated),
+    'leave_requests': (LeaveRequest, LeaveRequest.requested_at, LeaveRequest.start_date),
+    'attendance': (Attendance, Attendance.created_at, Attendance.date),
+    'documents': (Document, Document.created_at, Document.created_at),
+}
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+CSV_MIMETYPE = 'text/csv'
+# علامة ترتيب البايتات تجعل Excel يقرأ الملف كـ UTF-8 فيظهر النص العربي سليماً
+UTF8_BOM = '\ufeff'
+
+
+def parse_since():
+    """قراءة معامل since= (تاريخ أو تاريخ ووقت بصيغة ISO)."""
+    value = request.args.get('since')
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise InvalidQueryParam("since يجب أن يكون بصيغة 2024-01-31 أو 2024-01-31T08:00:00")
+
+
+def export_query(table_name):
+    """
+    استعلام التصدير من معاملات الطلب (fields/since/from/to/after) مرتباً بالمفتاح
+    الأساسي. يعيد (النموذج، الحقول، عمود المفتاح، الاستعلام). المفتاح يُضاف إلى
+    الحقول إن لم تتضمنه حتى يمكن الاستئناف.
+    """
+    if table_name not in EXPORT_TABLES:
+        raise KeyError(table_name)
+    model, since_column, date_column = EXPORT_TABLES[table_name]
+    key_column, = model.__table__.primary_key.columns
+
+    # ملف التصدير يحمل كل أعمدة الجدول افتراضياً، فكلها متاحة في fields=
+    table_fields = [column.key for column in model.__table__.columns]
+    fields = parse_fields(model, table_fields) or table_fields
+    if key_column.key not in fields:
+        fields = [*fields, key_column.key]
+    since = parse_since()
+    date_from, date_to = parse_date_range()
+    after = parse_after()
+
+    columns = model.__table__.c
+    query = select(*[_export_column(columns[name]) for name in fields]).order_by(key_column)
+    if after is not None:
+        query = query.where(key_column > after)
+    if since is not None:
+        query = query.where(since_column >= since)
+    if date_from:
+        query = query.where(date_column >= _day_start(date_column, date.fromisoformat(date_from)))
+    if date_to:
+        # الحد الأعلى شامل: أقل من بداية اليوم التالي
+        query = query.where(date_column < _day_start(date_column, date.fromisoformat(date_to) + timedelta(days=1)))
+    return model, fields, key_column, query
+
+
+def _export_column(column):
+    """
+    أعمدة التاريخ والوقت تُقرأ كنص SQLite المخزن وتُحوَّل إلى صيغة ISO (نفس
+    ناتج json_value) داخل الاستعلام، بدلاً من تحويلها إلى كائنات Python ثم
+    إعادتها نصوصاً لكل صف.
+    """
+    if not isinstance(column.type, (Date, DateTime, Time)):
+        return column
+    text = type_coerce(column, String)
+    if isinstance(column.type, Date) and not isinstance(column.type, DateTime):
+        return text.label(column.key)
+    # الأجزاء من الثانية الصفرية لا تظهر في isoformat()
+    length = 19 if isinstance(column.type, DateTime) else 8
+    trimmed = case((text.like('%.000000'), func.substr(text, 1, length)), else_=text)
+    if isinstance(column.type, DateTime):
+        trimmed = func.replace(trimmed, ' ', 'T')
+    return type_coerce(trimmed, String).label(column.key)
+
+
+def _day_start(column, day):
+    return datetime.combine(day, time()) if isinstance(column.type, DateTime) else day
+
+
+def _csv_chunks(partitions, fields):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield UTF8_BOM + buffer.getvalue()
+
+    for batch in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(partitions, fields):
+    dumps = current_app.json.dumps
+    for batch in partitions:
+        yield "\n".join(dumps(dict(zip(fields, row))) for row in batch) + "\n"
+
+
+def export_response(table_name, fmt):
+    """استجابة مبثوثة بملف الجدول كاملاً (أو المفلتر) بصيغة csv أو ndjson."""
+    if fmt not in EXPORT_FORMATS:
+        raise InvalidQueryParam(f"format يجب أن يكون {' أو '.join(EXPORT_FORMATS)}")
+    _, fields, key_column, query = export_query(table_name)
+
+    def generate():
+        chunks = _csv_chunks if fmt == 'csv' else _ndjson_chunks
+        yield from chunks(row_batches(query, key_column, EXPORT_BATCH_SIZE), fields)
+
+    mimetype = CSV_MIMETYPE if fmt == 'csv' else NDJSON_MIMETYPE
+    filename = f"{table_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    response = Response(stream_with_context(generate()), content_type=f"{mimetype}; charset=utf-8")
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers[AFTER_FIELD_HEADER] = key_column.key
+    return response
@@ -0,0 +1,111 @@
+import gzip
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli اختياري؛ بدونه يُستخدم gzip فقط
+    brotli = None
+
+# ضغط استجابات JSON الكبيرة لمسارات الـ blueprint حسب Accept-Encoding.
+# الاستجابة العادية تُضغط مرة واحدة إن تجاوزت الحد الأدنى، والمبثوثة تُضغط
+# دفعة بدفعة مع تفريغ (flush) بعد كل دفعة فيصل كل جزء للعميل فور إنتاجه.
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/plain')
+
+# الاستجابات الأصغر من هذا (بالبايت) تُرسل كما هي: الضغط لا يوفر شيئاً يذكر
+DEFAULT_MIN_SIZE = 1024
+# مستوى gzip (1-9) وجودة brotli (0-11). انظر benchmarks/bench_compression.py
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+
+
+def _settings():
+    config = current_app.config
+    return (
+        config.get('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE),
+        config.get('COMPRESS_LEVEL', DEFAULT_GZIP_LEVEL),
+        config.get('COMPRESS_BROTLI_QUALITY', DEFAULT_BROTLI_QUALITY),
+    )
+
+
+def choose_encoding():
+    """الترميز الأفضل الذي يقبله العميل (br ثم gzip)، أو None."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding, level, quality):
+    if encoding == 'br':
+        return brotli.compress(data, quality=quality)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _stream_compressor(encoding, level, quality):
+    """يعيد دالتين: ضغط جزء مع تفريغه، وإنهاء التدفق."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=quality)
+        return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = ترويسة gzip
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+
+def _compressed_stream(chunks, encoding, level, quality):
+    process, finish = _stream_compressor(encoding, level, quality)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield process(chunk)
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def compress_response(response):
+    """خطاف after_request: ضغط الاستجابة إن كانت قابلة للضغط والعميل يقبل ذلك."""
+    if (
+        response.status_code < 200 or response.status_code in (204, 206, 304)
+        or response.direct_passthrough
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding()
+    if encoding is None or request.method == 'HEAD':
+        return response
+
+    min_size, level, quality = _settings()
+    if response.is_streamed:
+        response.response = _compressed_stream(response.response, encoding, level, quality)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        response.set_data(compress(data, encoding, level, quality))
+
+    response.content_encoding = encoding
+    # الـ ETag القوي يخص البايتات غير المضغوطة؛ الضعيف (من conditional) يبقى صالحاً
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}.{encoding}")
+    return response
+
+
+def install_compression(blueprint):
+    """تفعيل الضغط لكل مسارات الـ blueprint (يمكن تعطيله عبر COMPRESSION=False)."""
+
+    @blueprint.after_request
+    def _compress(response):
+        if not current_app.config.get('COMPRESSION', True):
+            return response
+        return compress_response(response)
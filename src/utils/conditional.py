@@ -0,0 +1,76 @@
+from datetime import timezone
+from functools import wraps
+from flask import current_app, make_response, request
+from src.models.includes import include_tables
+from src.models.table_versions import request_table_versions
+
+# مدة صلاحية الاستجابة في ذاكرة المتصفح بالثواني. القيمة 0 تعني no-cache:
+# المتصفح يحتفظ بالنسخة لكنه يتحقق منها بـ If-None-Match في كل طلب.
+DEFAULT_CACHE_MAX_AGE = 0
+
+
+def version_token(table_names):
+    """يعيد (ETag، Last-Modified) من إصدارات الجداول، أو (None، None) إن لم تكن مسجلة."""
+    versions = request_table_versions(table_names)
+    if len(versions) != len(table_names):
+        return None, None
+
+    last_modified = max(updated_at for _, updated_at in versions.values())
+    last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+    # الطابع الزمني يميّز قاعدة بيانات أعيد إنشاؤها بنفس أرقام الإصدارات
+    generations = ".".join(str(versions[name][0]) for name in table_names)
+    return f"{generations}-{int(last_modified.timestamp())}", last_modified
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _requested_tables(table_names, includes):
+    """جداول المسار مضافاً إليها جداول العلاقات المطلوبة في include= (غير الصالح منها يُتجاهل هنا)."""
+    if includes is None or not request.args.get("include"):
+        return table_names
+    names = [name.strip() for name in request.args["include"].split(",")]
+    names = [name for name in dict.fromkeys(names) if name in includes.__serialize_includes__]
+    return tuple(dict.fromkeys((*table_names, *include_tables(includes, names))))
+
+
+def conditional(*table_names, includes=None):
+    """
+    دعم الطلبات الشرطية لمسار قراءة يعتمد على الجداول المذكورة: يعيد 304 دون
+    تنفيذ المسار إذا لم تتغير الجداول منذ النسخة التي لدى العميل.
+    الإصدار يُقرأ قبل الاستعلام، فأي كتابة بينهما تجعل الـ ETag أقدم من
+    البيانات، وأسوأ ما يحدث هو إعادة تنزيل غير ضرورية لاحقاً.
+    includes: النموذج الذي يقبل المسار تضمين علاقاته عبر include=.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = version_token(_requested_tables(table_names, includes))
+            if etag is None:
+                return view(*args, **kwargs)
+
+            if _not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            response.last_modified = last_modified
+            response.cache_control.private = True
+            max_age = current_app.config.get("LIST_CACHE_MAX_AGE", DEFAULT_CACHE_MAX_AGE)
+            if max_age:
+                response.cache_control.max_age = max_age
+            else:
+                response.cache_control.no_cache = True
+            # Accept: application/x-ndjson يغيّر شكل الاستجابة لنفس الرابط
+            response.vary.add("Accept")
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,76 @@
+import threading
+from flask import current_app
+from src.models.hr_models import db, Employee, Department
+from src.models.table_versions import request_table_versions
+
+# ذاكرة مؤقتة داخل العملية لبيانات القوائم المنسدلة (الأقسام وموظفي كل قسم).
+# كل قيمة محفوظة مع إصدار جداولها من table_versions الذي تزيده الـ Triggers عند
+# أي كتابة من أي عملية، فتغيُّر الإصدار يُبطل القيم في كل عمليات الخادم.
+# قراءة الإصدار هي نفسها قراءة الـ ETag في @conditional، فالطلب المخدوم من
+# الذاكرة لا ينفذ أي استعلام إضافي.
+
+# حد عدد المفاتيح المحفوظة لكل إصدار (أسماء الأقسام من الرابط قد تكون أي نص)
+MAX_CACHED_KEYS = 1024
+
+
+class VersionedCache:
+    """قيم تُحسب مرة لكل إصدار من الجداول التي تعتمد عليها (load(key))."""
+
+    def __init__(self, table_names, load):
+        self.table_names = tuple(table_names)
+        self.load = load
+        self.version = None
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def get(self, key=None):
+        if not current_app.config.get('DIRECTORY_CACHE', True):
+            return self.load(key)
+        versions = request_table_versions(self.table_names)
+        if len(versions) != len(self.table_names):
+            return self.load(key)
+        # الطابع الزمني يميّز قاعدة بيانات أعيد إنشاؤها بنفس أرقام الإصدارات
+        version = (current_app.config['SQLALCHEMY_DATABASE_URI'], tuple(versions[name] for name in self.table_names))
+
+        with self._lock:
+            if version != self.version:
+                self.version, self.values = version, {}
+            elif key in self.values:
+                return self.values[key]
+
+        # التحميل بعد قراءة الإصدار: القيمة ليست أقدم من إصدارها أبداً
+        value = self.load(key)
+        with self._lock:
+            if version == self.version and len(self.values) < MAX_CACHED_KEYS:
+                self.values[key] = value
+        return value
+
+    def clear(self):
+        with self._lock:
+            self.version, self.values = None, {}
+
+
+def department_names_query():
+    return db.select(Department.name)
+
+
+def department_employees_query(department_name):
+    return (
+        db.select(Employee.employee_id, Employee.full_name)
+        .where(Employee.department == department_name)
+        .order_by(Employee.employee_id)
+    )
+
+
+def _load_department_names(_key):
+    return tuple(db.session.execute(department_names_query()).scalars())
+
+
+def _load_department_employees(department_name):
+    rows = db.session.execute(department_employees_query(department_name))
+    return tuple((row.employee_id, row.full_name) for row in rows)
+
+
+department_names = VersionedCache(['departments'], _load_department_names)
+# القسم -> ((employee_id، full_name)، ...) يُملأ عند أول طلب لكل قسم
+department_employees = VersionedCache(['employees'], _load_department_employees)
@@ -0,0 +1,272 @@
+from datetime import datetime
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.exc import IntegrityError
+from src.models.hr_models import db, Employee, LeaveManagement, LeaveRequest, Attendance, Department, Document
+from src.utils.excel_import import DATE_FIELDS, FLOAT_FIELDS
+from src.utils.employee_cache import employee_cache
+
+# عمليات الموظفين المجمّعة (إضافة/تحديث/حذف) لمزامنة نظام HRIS الليلية.
+# الدفعة كلها تُتحقق وتُحوَّل أنواعها أولاً، والعناصر الخاطئة تُعاد كأخطاء
+# لكل عنصر، ثم تُطبَّق العناصر الصحيحة بجمل executemany في معاملة واحدة.
+
+# حد أقصى يبقي استعلامات IN ضمن حدود متغيرات SQLite
+MAX_BATCH_SIZE = 5000
+
+INTEGER_FIELDS = ['employee_id', 'points_count', 'years_of_experience', 'children_count']
+CREATE_DEFAULTS = {'points_count': 0, 'years_of_experience': 0, 'children_count': 0}
+
+
+class BatchError(ValueError):
+    """طلب دفعة غير صالح ككل (يُعاد للعميل كخطأ 400)."""
+
+
+class BatchItemError(ValueError):
+    """عنصر غير صالح داخل الدفعة."""
+
+
+class BatchResult:
+    def __init__(self, action):
+        self.action = action
+        self.applied_count = 0
+        self.errors = []
+
+    def add_error(self, index, employee_id, message):
+        self.errors.append({"index": index, "employee_id": employee_id, "error": message})
+
+    def to_dict(self):
+        return {
+            f"{self.action}_count": self.applied_count,
+            "errors_count": len(self.errors),
+            "errors": sorted(self.errors, key=lambda error: error["index"]),
+        }
+
+
+def _check_batch(items):
+    if not isinstance(items, list):
+        raise BatchError("يجب إرسال مصفوفة JSON")
+    if len(items) > MAX_BATCH_SIZE:
+        raise BatchError(f"الحد الأقصى للدفعة {MAX_BATCH_SIZE} عنصر")
+
+
+def _parse_value(field, value):
+    if value is None or value == "":
+        return None
+    try:
+        if field in DATE_FIELDS:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        if field in INTEGER_FIELDS:
+            if isinstance(value, bool) or int(value) != float(value):
+                raise ValueError
+            return int(value)
+        if field in FLOAT_FIELDS:
+            return float(value)
+    except (TypeError, ValueError):
+        raise BatchItemError(f"قيمة غير صالحة للحقل {field}: {value}")
+    return value
+
+
+def _parse_item(item):
+    """تحويل عنصر JSON إلى قيم أعمدة جدول الموظفين."""
+    if not isinstance(item, dict):
+        raise BatchItemError("كل عنصر يجب أن يكون كائن JSON")
+
+    unknown = [field for field in item if field not in Employee.serialize_fields()]
+    if unknown:
+        raise BatchItemError(f"حقول غير معروفة: {', '.join(unknown)}")
+
+    data = {field: _parse_value(field, value) for field, value in item.items()}
+    if data.get('employee_id') is None:
+        raise BatchItemError("الرقم الوظيفي مطلوب.")
+    if 'full_name' in data and not data['full_name']:
+        raise BatchItemError("الاسم الكامل مطلوب.")
+    return data
+
+
+def _parse_batch(items, result, require_full_name):
+    """تحقق الدفعة كاملة. يعيد [(index, data)] للعناصر الصحيحة دون تكرار للرقم الوظيفي."""
+    parsed = []
+    seen_ids = set()
+    for index, item in enumerate(items):
+        employee_id = item.get('employee_id') if isinstance(item, dict) else None
+        try:
+            data = _parse_item(item)
+            if require_full_name and 'full_name' not in data:
+                raise BatchItemError("الاسم الكامل مطلوب.")
+            if data['employee_id'] in seen_ids:
+                raise BatchItemError("الرقم الوظيفي مكرر في الدفعة.")
+        except BatchItemError as e:
+            result.add_error(index, employee_id, str(e))
+            continue
+        seen_ids.add(data['employee_id'])
+        parsed.append((index, data))
+    return parsed
+
+
+def _existing_ids(employee_ids):
+    if not employee_ids:
+        return set()
+    return set(db.session.execute(
+        select(Employee.employee_id).where(Employee.employee_id.in_(employee_ids))
+    ).scalars())
+
+
+def _drop_unique_conflicts(parsed, result):
+    """
+    استبعاد العناصر التي تكرر قيمة عمود فريد (الرقم القومي...) لموظف آخر
+    في قاعدة البيانات أو في الدفعة نفسها، قبل بدء الكتابة.
+    """
+    unique_columns = [column for column in Employee.__table__.columns if column.unique]
+    taken = {}
+    for column in unique_columns:
+        values = {data[column.key] for _, data in parsed if data.get(column.key) is not None}
+        if values:
+            taken[column.key] = dict(db.session.execute(
+                select(column, Employee.employee_id).where(column.in_(values))
+            ).all())
+        else:
+            taken[column.key] = {}
+
+    kept = []
+    for index, data in parsed:
+        conflict = None
+        for column in unique_columns:
+            value = data.get(column.key)
+            if value is None:
+                continue
+            owner = taken[column.key].setdefault(value, data['employee_id'])
+            if owner != data['employee_id']:
+                conflict = f"القيمة {value} للحقل {column.key} مستخدمة للموظف {owner}"
+                break
+        if conflict:
+            result.add_error(index, data['employee_id'], conflict)
+        else:
+            kept.append((index, data))
+    return kept
+
+
+def _commit_batch(statements, count, result):
+    """تنفيذ الجمل في معاملة واحدة؛ أي فشل يلغي الدفعة كاملة."""
+    try:
+        for statement, rows in statements:
+            if rows:
+                db.session.execute(statement, rows)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        raise BatchError(f"فشل تطبيق الدفعة ولم يُحفظ أي عنصر: {e.orig}")
+    result.applied_count = count
+
+
+def create_employees(items):
+    """إضافة دفعة موظفين جدد بجملة INSERT واحدة (executemany)."""
+    _check_batch(items)
+    result = BatchResult("created")
+    parsed = _parse_batch(items, result, require_full_name=True)
+
+    existing = _existing_ids([data['employee_id'] for _, data in parsed])
+    valid = []
+    for index, data in parsed:
+        if data['employee_id'] in existing:
+            result.add_error(index, data['employee_id'], "الموظف موجود مسبقاً.")
+        else:
+            valid.append((index, data))
+    valid = _drop_unique_conflicts(valid, result)
+
+    # كل الصفوف تحمل نفس الأعمدة حتى تُنفَّذ بجملة واحدة
+    now = datetime.utcnow()
+    rows = []
+    for _, data in valid:
+        row = dict.fromkeys(Employee.serialize_fields())
+        row.update(CREATE_DEFAULTS)
+        row.update({key: value for key, value in data.items() if value is not None})
+        row['created_at'] = row['updated_at'] = now
+        rows.append(row)
+
+    _commit_batch([(Employee.__table__.insert(), rows)], len(rows), result)
+    return result
+
+
+def update_employees(items):
+    """
+    تحديث دفعة موظفين موجودين. العناصر تُجمَّع حسب الحقول المرسلة وكل مجموعة
+    تُنفَّذ بجملة UPDATE واحدة (executemany).
+    """
+    _check_batch(items)
+    result = BatchResult("updated")
+    parsed = _parse_batch(items, result, require_full_name=False)
+
+    existing = _existing_ids([data['employee_id'] for _, data in parsed])
+    valid = []
+    for index, data in parsed:
+        if data['employee_id'] in existing:
+            valid.append((index, data))
+        else:
+            result.add_error(index, data['employee_id'], "الموظف غير موجود.")
+    valid = _drop_unique_conflicts(valid, result)
+
+    # أسماء المعاملات لا يمكن أن تطابق أسماء الأعمدة في جملة UPDATE
+    now = datetime.utcnow()
+    groups = {}
+    for _, data in valid:
+        fields = tuple(sorted(key for key in data if key != 'employee_id')) + ('updated_at',)
+        row = {f"v_{key}": value for key, value in data.items() if key != 'employee_id'}
+        row.update(b_employee_id=data['employee_id'], v_updated_at=now)
+        groups.setdefault(fields, []).append(row)
+
+    statements = []
+    for fields, rows in groups.items():
+        statement = (
+            update(Employee.__table__)
+            .where(Employee.__table__.c.employee_id == bindparam('b_employee_id'))
+            .values({field: bindparam(f"v_{field}") for field in fields})
+        )
+        statements.append((statement, rows))
+
+    _commit_batch(statements, len(valid), result)
+    employee_cache.invalidate([data['employee_id'] for _, data in valid])
+    return result
+
+
+def delete_employee_records(employee_ids):
+    """
+    حذف الموظفين وكل السجلات المعتمدة عليهم بجمل DELETE/UPDATE على مستوى
+    المجموعة. المراجع غير الإلزامية (المعتمِد، منشئ المستند، مدير القسم) تُفرَّغ.
+    لا يحفظ المعاملة.
+    """
+    for model in (LeaveManagement, LeaveRequest, Attendance, Document):
+        db.session.execute(delete(model).where(model.employee_id.in_(employee_ids)))
+    db.session.execute(update(LeaveRequest).where(LeaveRequest.approved_by.in_(employee_ids)).values(approved_by=None))
+    db.session.execute(update(Document).where(Document.created_by.in_(employee_ids)).values(created_by=None))
+    db.session.execute(update(Department).where(Department.manager_id.in_(employee_ids)).values(manager_id=None))
+    db.session.execute(delete(Employee).where(Employee.employee_id.in_(employee_ids)))
+
+
+def delete_employees(items):
+    """حذف دفعة موظفين (مصفوفة أرقام وظيفية) مع سجلاتهم في معاملة واحدة."""
+    _check_batch(items)
+    result = BatchResult("deleted")
+
+    ids = {}
+    for index, employee_id in enumerate(items):
+        if isinstance(employee_id, bool) or not isinstance(employee_id, int):
+            result.add_error(index, employee_id, "الرقم الوظيفي يجب أن يكون رقماً صحيحاً.")
+        elif employee_id in ids:
+            result.add_error(index, employee_id, "الرقم الوظيفي مكرر في الدفعة.")
+        else:
+            ids[employee_id] = index
+
+    existing = _existing_ids(list(ids))
+    for employee_id, index in ids.items():
+        if employee_id not in existing:
+            result.add_error(index, employee_id, "الموظف غير موجود.")
+
+    try:
+        if existing:
+            delete_employee_records(list(existing))
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        raise BatchError(f"فشل تطبيق الدفعة ولم يُحفظ أي عنصر: {e.orig}")
+    employee_cache.invalidate(existing)
+    result.applied_count = len(existing)
+    return result
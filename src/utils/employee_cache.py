@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from src.models.hr_models import db, Employee
+from src.models.serialization import row_encoder
+from src.models.table_versions import request_table_versions
+
+# ذاكرة مؤقتة داخل العملية لسجلات الموظفين المحوّلة إلى قواميس (ما يعيده
+# GET /employees/<id>)، محدودة العدد (LRU) وبمدة صلاحية. كل سجل محفوظ مع إصدار
+# جدول employees من table_versions الذي قُرئ قبل قراءته، والإصدار المختلف يُعامل
+# كسجل غير موجود، فالكتابة من أي عملية خادم (تزيد الـ Triggers الإصدار) تُبطل
+# السجلات فوراً. قراءة الإصدار هي نفسها قراءة الـ ETag في @conditional، فالطلب
+# المخدوم من الذاكرة ينفذ ذلك الاستعلام وحده. مسارات الكتابة في هذه العملية تحذف
+# أيضاً السجلات التي تغيّرها لتحرير مكانها.
+
+DEFAULT_EMPLOYEE_CACHE_SIZE = 10000
+DEFAULT_EMPLOYEE_CACHE_TTL = 30  # بالثواني
+
+
+class EmployeeCache:
+    def __init__(self, max_size=DEFAULT_EMPLOYEE_CACHE_SIZE, ttl=DEFAULT_EMPLOYEE_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._records = OrderedDict()  # employee_id -> (وقت الانتهاء، الإصدار، السجل)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        self.max_size = app.config.get('EMPLOYEE_CACHE_SIZE', DEFAULT_EMPLOYEE_CACHE_SIZE)
+        self.ttl = app.config.get('EMPLOYEE_CACHE_TTL', DEFAULT_EMPLOYEE_CACHE_TTL)
+        self.clear()
+        app.extensions['employee_cache'] = self
+        metrics = app.extensions.get('metrics')
+        if metrics is not None:
+            metrics.add_collector(self.metric_lines)
+
+    def get(self, employee_id, version):
+        """السجل المحفوظ لهذا الإصدار أو None. القاموس المعاد مشترك فلا يُعدَّل."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._records.get(employee_id)
+            if entry is not None:
+                if entry[0] > now and entry[1] == version:
+                    self._records.move_to_end(employee_id)
+                    self.hits += 1
+                    return entry[2]
+                if entry[1] != version:
+                    self.invalidations += 1
+                del self._records[employee_id]
+            self.misses += 1
+            return None
+
+    def put(self, employee_id, record, version):
+        """version هو إصدار الجدول المقروء قبل قراءة السجل، فالسجل ليس أقدم منه أبداً."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._records[employee_id] = (time.monotonic() + self.ttl, version, record)
+            self._records.move_to_end(employee_id)
+            while len(self._records) > self.max_size:
+                self._records.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, employee_ids):
+        with self._lock:
+            for employee_id in employee_ids:
+                if self._records.pop(employee_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._records)
+            self._records.clear()
+
+    def metric_lines(self):
+        with self._lock:
+            counters = (
+                ('hits', 'الطلبات المخدومة من الذاكرة', self.hits),
+                ('misses', 'الطلبات التي قرأت من قاعدة البيانات', self.misses),
+                ('evictions', 'السجلات المحذوفة لتجاوز الحد الأقصى', self.evictions),
+                ('invalidations', 'السجلات المُبطلة بعد الكتابة', self.invalidations),
+            )
+            size = len(self._records)
+        lines = []
+        for name, help_text, value in counters:
+            lines += [
+                f'# HELP hr_employee_cache_{name}_total {help_text}',
+                f'# TYPE hr_employee_cache_{name}_total counter',
+                f'hr_employee_cache_{name}_total {value}',
+            ]
+        lines += [
+            '# HELP hr_employee_cache_size عدد السجلات المحفوظة',
+            '# TYPE hr_employee_cache_size gauge',
+            f'hr_employee_cache_size {size}',
+        ]
+        return lines
+
+
+employee_cache = EmployeeCache()
+
+
+def _employees_version():
+    """إصدار جدول employees لهذا الطلب، أو None إن لم يكن مسجلاً (لا تُستخدم الذاكرة)."""
+    versions = request_table_versions(['employees'])
+    if 'employees' not in versions:
+        return None
+    # الطابع الزمني والرابط يميّزان قاعدة بيانات أعيد إنشاؤها بنفس أرقام الإصدارات
+    return (current_app.config['SQLALCHEMY_DATABASE_URI'], versions['employees'])
+
+
+def get_employee_record(employee_id):
+    """سجل الموظف كقاموس (من الذاكرة أو بقراءة أعمدته مباشرة دون كائن ORM)، أو None."""
+    version = _employees_version()
+    if version is not None:
+        record = employee_cache.get(employee_id, version)
+        if record is not None:
+            return record
+
+    columns = Employee.__table__.c
+    row = db.session.execute(
+        db.select(*[columns[name] for name in Employee.serialize_fields()])
+        .where(columns.employee_id == employee_id)
+    ).first()
+    if row is None:
+        return None
+    record = row_encoder(Employee)(row)
+    if version is not None:
+        employee_cache.put(employee_id, record, version)
+    return record
@@ -0,0 +1,112 @@
+from datetime import date, datetime
+from itertools import islice
+from sqlalchemy import select
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment
+from openpyxl.utils import get_column_letter
+from src.models.hr_models import db, Employee
+
+# رؤوس أعمدة ملف Excel بالترتيب المطلوب ومقابلها في قاعدة البيانات
+EMPLOYEE_EXCEL_COLUMNS = [
+    ('الرقم الوظيفي', 'employee_id'),
+    ('الاسم الكامل', 'full_name'),
+    ('الدار', 'house_number'),
+    ('الرقم القومي', 'national_id'),
+    ('الوظيفة', 'job_title'),
+    ('المؤهل', 'qualification'),
+    ('تاريخ التعيين', 'hire_date'),
+    ('عدد الابناط', 'points_count'),
+    ('سنوات الخبرة', 'years_of_experience'),
+    ('الراتب من المنظومة', 'salary_from_system'),
+    ('الراتب', 'actual_salary'),
+    ('كود القسم', 'department_code'),
+    ('القسم', 'department'),
+    ('البريد الإلكتروني', 'email'),
+    ('رقم الهاتف', 'phone'),
+    ('تاريخ الميلاد', 'birth_date'),
+    ('الجنسية', 'nationality'),
+    ('العنوان', 'address'),
+    ('الحالة الاجتماعية', 'marital_status'),
+    ('عدد الأطفال', 'children_count'),
+    ('المستوى التعليمي', 'education_level'),
+    ('التخصص', 'specialization'),
+    ('تاريخ انتهاء العقد', 'contract_end_date'),
+    ('الراتب الأساسي', 'basic_salary'),
+    ('البدلات', 'allowances'),
+    ('إجمالي الراتب', 'total_salary'),
+    ('رقم الحساب البنكي', 'bank_account'),
+    ('ملاحظات', 'notes'),
+]
+
+EXCEL_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# عدد الصفوف المجلوبة من قاعدة البيانات في كل دفعة
+EXPORT_BATCH_SIZE = 2000
+# عدد الصفوف الأولى التي يُقدَّر منها عرض الأعمدة
+WIDTH_SAMPLE_ROWS = 1000
+
+
+def _excel_value(value):
+    # التواريخ تُكتب كنص ISO كما في التصدير السابق
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _column_width(max_length):
+    return (max_length + 2) * 1.2  # إضافة هامش بسيط
+
+
+def write_employees_xlsx(dest, batch_size=EXPORT_BATCH_SIZE, sample_rows=WIDTH_SAMPLE_ROWS, progress=None):
+    """
+    كتابة بيانات الموظفين إلى dest (مسار ملف أو كائن ملف) بوضع الكتابة فقط
+    في openpyxl، مع جلب الصفوف على دفعات. يعيد عدد الموظفين المصدَّرين.
+    progress: دالة تُستدعى بعدد الصفوف المكتوبة بعد كل دفعة.
+    """
+    headers = [header for header, _ in EMPLOYEE_EXCEL_COLUMNS]
+    columns = [Employee.__table__.c[field] for _, field in EMPLOYEE_EXCEL_COLUMNS]
+
+    stmt = select(*columns).order_by(Employee.employee_id).execution_options(yield_per=batch_size)
+    result = db.session.execute(stmt)
+    rows = ([_excel_value(value) for value in row] for row in result)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("بيانات الموظفين")
+
+    # في وضع الكتابة فقط يجب ضبط عرض الأعمدة قبل أول صف،
+    # لذلك يُقدَّر العرض من عينة أولى من الصفوف بدلاً من المرور على كل الخلايا
+    sample = list(islice(rows, sample_rows))
+    max_lengths = [len(header) for header in headers]
+    for row in sample:
+        for idx, value in enumerate(row):
+            if value is not None:
+                max_lengths[idx] = max(max_lengths[idx], len(str(value)))
+    for idx, max_length in enumerate(max_lengths, start=1):
+        ws.column_dimensions[get_column_letter(idx)].width = _column_width(max_length)
+
+    # تنسيق رؤوس الأعمدة
+    header_font = Font(bold=True)
+    header_alignment = Alignment(horizontal='center')
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = header_font
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    count = 0
+    for row in sample:
+        ws.append(row)
+        count += 1
+    for row in rows:
+        ws.append(row)
+        count += 1
+        if progress and count % batch_size == 0:
+            progress(count)
+
+    wb.save(dest)
+    if progress:
+        progress(count)
+    return count
@@ -0,0 +1,159 @@
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from openpyxl import load_workbook
+from src.models.hr_models import db, Employee
+from src.utils.excel_export import EMPLOYEE_EXCEL_COLUMNS
+from src.utils.employee_cache import employee_cache
+
+# عدد الصفوف في كل دفعة إدراج/تحديث (وكل دفعة تُحفظ في معاملة مستقلة)
+IMPORT_CHUNK_SIZE = 1000
+# حد أقصى يبقي استعلام IN الخاص بكل دفعة ضمن حدود متغيرات SQLite
+MAX_IMPORT_CHUNK_SIZE = 20000
+
+# رؤوس الأعمدة العربية ومقابلها في قاعدة البيانات
+COLUMN_MAPPING = dict(EMPLOYEE_EXCEL_COLUMNS)
+
+DATE_FIELDS = ['hire_date', 'birth_date', 'contract_end_date']
+FLOAT_FIELDS = ['salary_from_system', 'actual_salary', 'basic_salary', 'allowances', 'total_salary']
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported_count = 0
+        self.updated_count = 0
+        self.errors = []
+
+
+def _normalize_row(employee_data):
+    """تحويل أنواع قيم الصف كما يتوقعها جدول الموظفين."""
+    employee_data['employee_id'] = int(employee_data['employee_id'])
+    employee_data['points_count'] = int(employee_data.get('points_count', 0))
+    employee_data['years_of_experience'] = int(employee_data.get('years_of_experience', 0))
+    employee_data['children_count'] = int(employee_data.get('children_count', 0))
+
+    # تحويل التواريخ
+    for field in DATE_FIELDS:
+        value = employee_data.get(field)
+        if isinstance(value, datetime):
+            employee_data[field] = value.date()
+        elif isinstance(value, str) and value:
+            try:
+                employee_data[field] = datetime.strptime(value, "%Y-%m-%d").date()
+            except ValueError:
+                employee_data[field] = None
+        else:
+            employee_data[field] = None
+
+    # تحويل الأرقام العشرية
+    for field in FLOAT_FIELDS:
+        if field in employee_data and employee_data[field] is not None:
+            try:
+                employee_data[field] = float(employee_data[field])
+            except ValueError:
+                employee_data[field] = None
+
+    return employee_data
+
+
+def _upsert_statement(columns):
+    """INSERT ... ON CONFLICT(employee_id) DO UPDATE للأعمدة الموجودة في الملف."""
+    stmt = sqlite_insert(Employee.__table__)
+    update_columns = {name: stmt.excluded[name] for name in columns if name != 'employee_id'}
+    update_columns['updated_at'] = datetime.utcnow()
+    return stmt.on_conflict_do_update(index_elements=['employee_id'], set_=update_columns)
+
+
+def _apply_chunk(chunk, seen_ids, result):
+    """
+    إدراج/تحديث دفعة من الصفوف بجملة واحدة. عند فشل الدفعة (مثلاً تكرار رقم قومي)
+    تُعاد المحاولة صفاً صفاً لتسجيل الخطأ في الصف المسبب فقط.
+    """
+    ids = {data['employee_id'] for _, data in chunk}
+    existing_ids = set(db.session.execute(
+        select(Employee.employee_id).where(Employee.employee_id.in_(ids - seen_ids))
+    ).scalars()) | (ids & seen_ids)
+
+    stmt = _upsert_statement(chunk[0][1].keys())
+    try:
+        db.session.execute(stmt, [data for _, data in chunk])
+        db.session.commit()
+        applied = chunk
+    except IntegrityError:
+        db.session.rollback()
+        applied = []
+        for row_idx, data in chunk:
+            try:
+                db.session.execute(stmt, [data])
+                db.session.commit()
+                applied.append((row_idx, data))
+            except IntegrityError as e:
+                db.session.rollback()
+                result.errors.append(f"الصف {row_idx}: {str(e.orig)}")
+    employee_cache.invalidate([data['employee_id'] for _, data in applied])
+
+    for _, data in applied:
+        employee_id = data['employee_id']
+        if employee_id in existing_ids or employee_id in seen_ids:
+            result.updated_count += 1
+        else:
+            result.imported_count += 1
+        seen_ids.add(employee_id)
+
+
+def import_employees_xlsx(file, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+    """
+    استيراد الموظفين من ملف Excel بقراءة متدفقة (read_only) وإدراج/تحديث
+    على دفعات. تُحفظ كل دفعة في معاملة مستقلة. يعيد ImportResult.
+    progress: دالة تُستدعى بـ ImportResult بعد كل دفعة.
+    """
+    chunk_size = min(chunk_size, MAX_IMPORT_CHUNK_SIZE)
+    wb = load_workbook(file, read_only=True)
+    try:
+        ws = wb.active
+        rows = ws.iter_rows(values_only=True)
+
+        # قراءة رؤوس الأعمدة من الصف الأول وتحويلها إلى أسماء الحقول
+        excel_headers = next(rows, ())
+        mapped_headers = [COLUMN_MAPPING.get(header) for header in excel_headers]
+
+        result = ImportResult()
+        seen_ids = set()
+        chunk = []
+
+        # قراءة البيانات بدءاً من الصف الثاني
+        for row_idx, row in enumerate(rows, start=2):
+            # كل الصفوف تحمل نفس الحقول حتى تُنفَّذ الدفعة بجملة واحدة
+            employee_data = {
+                field: row[col_idx] if col_idx < len(row) else None
+                for col_idx, field in enumerate(mapped_headers) if field
+            }
+
+            if not employee_data.get('employee_id'):
+                result.errors.append(f"الصف {row_idx}: الرقم الوظيفي مطلوب.")
+                continue
+            if not employee_data.get('full_name'):
+                result.errors.append(f"الصف {row_idx}: الاسم الكامل مطلوب.")
+                continue
+
+            try:
+                chunk.append((row_idx, _normalize_row(employee_data)))
+            except Exception as e:
+                result.errors.append(f"الصف {row_idx}: {str(e)}")
+                continue
+
+            if len(chunk) >= chunk_size:
+                _apply_chunk(chunk, seen_ids, result)
+                chunk = []
+                if progress:
+                    progress(result)
+
+        if chunk:
+            _apply_chunk(chunk, seen_ids, result)
+        if progress:
+            progress(result)
+
+        return result
+    finally:
+        wb.close()
@@ -0,0 +1,44 @@
+from datetime import datetime
+from src.models.leave_workflow import recompute_leave_balances
+from src.models.statistics import get_statistics_snapshot, rebuild_statistics
+from src.utils.excel_export import write_employees_xlsx, EXCEL_MIMETYPE
+from src.utils.excel_import import import_employees_xlsx, IMPORT_CHUNK_SIZE
+from src.utils.jobs import job_runner
+
+# أنواع المهام الخلفية المتاحة عبر POST /jobs/<kind>. كل دالة تستقبل JobContext
+# وتعيد قاموس النتيجة الذي يظهر في /jobs/<id>.
+
+
+@job_runner.register('employees-import')
+def import_employees_job(context):
+    def progress(result):
+        context.progress(result.imported_count + result.updated_count, result.errors)
+
+    chunk_size = context.params.get('chunk_size') or IMPORT_CHUNK_SIZE
+    result = import_employees_xlsx(context.params['input_path'], chunk_size=chunk_size, progress=progress)
+    return {
+        "imported_count": result.imported_count,
+        "updated_count": result.updated_count,
+        "total_processed": result.imported_count + result.updated_count,
+        "errors_count": len(result.errors),
+    }
+
+
+@job_runner.register('employees-export')
+def export_employees_job(context):
+    filename = f"employees_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    count = write_employees_xlsx(context.artifact_path(filename, EXCEL_MIMETYPE), progress=context.progress)
+    return {"exported_count": count}
+
+
+@job_runner.register('leave-recompute')
+def recompute_leave_job(context):
+    records_count = recompute_leave_balances()
+    context.progress(records_count)
+    return {"records_count": records_count}
+
+
+@job_runner.register('statistics-rebuild')
+def rebuild_statistics_job(context):
+    rebuild_statistics()
+    return get_statistics_snapshot()
@@ -0,0 +1,210 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from src.models.hr_models import db
+from src.models.jobs import Job, claim_queued_jobs, fail_stale_jobs, job_json_value, record_job_progress, touch_jobs
+
+# تنفيذ المهام الثقيلة (استيراد/تصدير Excel، إعادة حساب الأرصدة والإحصائيات)
+# خارج خيط الطلب: المسار ينشئ سجل Job ويعيده فوراً (202)، وتنفذه مجموعة
+# خيوط محدودة العدد. عدد المهام المتزامنة وطول الطابور محدودان حتى لا تستهلك
+# المهام الثقيلة اتصالات قاعدة البيانات ووقت المعالج على حساب الطلبات التفاعلية.
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_WORKERS = 1
+DEFAULT_MAX_QUEUED_JOBS = 10
+# المهمة النشطة التي لم يتجدد نبضها منذ هذه المدة توقفت مع عمليتها فتُعلَّم كفاشلة
+STALE_JOB_SECONDS = 15 * 60
+# كل هذه المدة تجدد العملية نبض مهامها (المنتظرة والجارية) وتفحص المهام المتوقفة
+DEFAULT_JOB_HEARTBEAT_SECONDS = 60
+# ملفات النواتج والملفات المرفوعة الأقدم من هذا تُحذف عند بدء الخادم
+ARTIFACT_RETENTION_SECONDS = 7 * 24 * 3600
+
+
+class JobQueueFull(RuntimeError):
+    """طابور المهام ممتلئ؛ يُعاد للعميل كخطأ 503."""
+
+
+class JobContext:
+    """ما تحتاجه دالة المهمة: المعاملات، وتسجيل التقدم، ومسار ملف الناتج."""
+
+    def __init__(self, job_id, params, jobs_dir):
+        self.job_id = job_id
+        self.params = params
+        self.jobs_dir = jobs_dir
+        self.artifact = None
+
+    def progress(self, rows_processed, errors=None):
+        record_job_progress(self.job_id, rows_processed, errors)
+
+    def artifact_path(self, download_name, mimetype):
+        """مسار ملف الناتج الذي يُنزَّل من /jobs/<id>/artifact بعد نجاح المهمة."""
+        path = os.path.join(self.jobs_dir, f"{self.job_id}-{download_name}")
+        self.artifact = (path, download_name, mimetype)
+        return path
+
+
+class JobRunner:
+    def __init__(self):
+        self.handlers = {}
+        self.app = None
+        self.executor = None
+        self.jobs_dir = None
+        self.max_queued = DEFAULT_MAX_QUEUED_JOBS
+        self.heartbeat_seconds = DEFAULT_JOB_HEARTBEAT_SECONDS
+        self._pending = 0
+        self._active = set()  # المهام في طابور هذه العملية أو قيد التنفيذ فيها
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._monitor = None
+
+    def register(self, kind):
+        """تسجيل دالة مهمة: handler(context) تعيد قاموس النتيجة."""
+        def decorator(handler):
+            self.handlers[kind] = handler
+            return handler
+        return decorator
+
+    def init_app(self, app, jobs_dir):
+        self.app = app
+        self.jobs_dir = jobs_dir
+        os.makedirs(jobs_dir, exist_ok=True)
+        self.max_queued = app.config.get('MAX_QUEUED_JOBS', DEFAULT_MAX_QUEUED_JOBS)
+        self.heartbeat_seconds = app.config.get('JOB_HEARTBEAT_SECONDS', DEFAULT_JOB_HEARTBEAT_SECONDS)
+        workers = app.config.get('JOB_WORKERS', DEFAULT_JOB_WORKERS)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hr-job')
+        app.extensions['jobs'] = self
+        self._remove_old_files()
+        with app.app_context():
+            # المهام المقبولة التي لم تبدأ قبل إعادة التشغيل تُنفَّذ الآن بدلاً من بقائها منتظرة
+            queued = claim_queued_jobs()
+            self._fail_stale_jobs()
+        for job_id in queued:
+            with self._lock:
+                self._pending += 1
+            self._enqueue(job_id)
+
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._monitor_jobs, name='hr-job-monitor', daemon=True)
+        self._monitor.start()
+
+    def shutdown(self, wait=True):
+        """إيقاف خيط المتابعة ومجموعة الخيوط (المهام المنتظرة تبقى في الطابور للتشغيل التالي)."""
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join()
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _monitor_jobs(self):
+        """
+        نبض دوري لمهام هذه العملية (فلا تُعلَّم متوقفة أثناء خطوة طويلة بلا تقدم
+        مثل إعادة حساب الأرصدة)، ثم تعليم المهام المتوقفة في العمليات المنتهية.
+        """
+        while not self._stop.wait(self.heartbeat_seconds):
+            try:
+                with self.app.app_context():
+                    with self._lock:
+                        active = list(self._active)
+                    touch_jobs(active)
+                    self._fail_stale_jobs()
+            except Exception:
+                logger.exception("فشل فحص المهام الخلفية")
+
+    def _fail_stale_jobs(self):
+        stale = fail_stale_jobs(datetime.utcnow() - timedelta(seconds=STALE_JOB_SECONDS))
+        if stale:
+            logger.warning("تم تعليم %d مهمة متوقفة كفاشلة", stale)
+
+    def _remove_old_files(self):
+        expired = datetime.now().timestamp() - ARTIFACT_RETENTION_SECONDS
+        for entry in os.scandir(self.jobs_dir):
+            if entry.is_file() and entry.stat().st_mtime < expired:
+                os.remove(entry.path)
+
+    def input_path(self, name):
+        """مسار لحفظ ملف مرفوع تقرؤه المهمة لاحقاً (يُحذف بعد انتهائها)."""
+        return os.path.join(self.jobs_dir, f"upload-{os.urandom(8).hex()}-{name}")
+
+    def submit(self, kind, params=None, input_path=None):
+        """إنشاء سجل المهمة وإضافتها إلى الطابور. يعيد Job."""
+        if kind not in self.handlers:
+            raise KeyError(kind)
+        with self._lock:
+            if self._pending >= self.max_queued:
+                raise JobQueueFull("طابور المهام ممتلئ، حاول لاحقاً")
+            self._pending += 1
+
+        try:
+            params = dict(params or {})
+            if input_path:
+                params['input_path'] = input_path
+            job = Job(kind=kind, status='queued', params=job_json_value(params))
+            db.session.add(job)
+            db.session.commit()
+            self._enqueue(job.id)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return job
+
+    def _enqueue(self, job_id):
+        with self._lock:
+            self._active.add(job_id)
+        try:
+            self.executor.submit(self._run, job_id)
+        except Exception:
+            with self._lock:
+                self._active.discard(job_id)
+            raise
+
+    def _run(self, job_id):
+        try:
+            with self.app.app_context():
+                self._execute(job_id)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._active.discard(job_id)
+
+    def _execute(self, job_id):
+        now = datetime.utcnow()
+        # المهمة قد تكون أُلغيت أو عُلِّمت متوقفة وهي في الطابور
+        started = db.session.execute(
+            db.update(Job).where(Job.id == job_id, Job.status == 'queued')
+            .values(status='running', started_at=now, updated_at=now)
+        ).rowcount
+        db.session.commit()
+        if not started:
+            return
+
+        job = db.session.get(Job, job_id)
+        params = json.loads(job.params) if job.params else {}
+        context = JobContext(job_id, params, self.jobs_dir)
+        try:
+            result = self.handlers[job.kind](context)
+            values = {'status': 'succeeded', 'result': job_json_value(result) if result is not None else None}
+            if context.artifact:
+                values.update(zip(('artifact_path', 'artifact_name', 'artifact_mimetype'), context.artifact))
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("فشلت المهمة %s (%s)", job_id, job.kind)
+            values = {'status': 'failed', 'message': str(e)}
+            if context.artifact and os.path.exists(context.artifact[0]):
+                os.remove(context.artifact[0])
+        finally:
+            input_path = params.get('input_path')
+            if input_path and os.path.exists(input_path):
+                os.remove(input_path)
+
+        now = datetime.utcnow()
+        values.update(finished_at=now, updated_at=now)
+        db.session.execute(db.update(Job).where(Job.id == job_id).values(values))
+        db.session.commit()
+
+
+job_runner = JobRunner()
@@ -0,0 +1,36 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson اختياري؛ بدونه يُستخدم مُرمِّز Flask الافتراضي
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    مُرمِّز JSON يستخدم orjson إن كان مثبتاً. النص العربي يُكتب UTF-8 مباشرة
+    بدلاً من \\uXXXX، فتصغر الاستجابات أيضاً.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.pop("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.pop("indent", None):
+            option |= orjson.OPT_INDENT_2
+        # orjson يكتب دائماً بالصيغة المضغوطة التي يطلبها Flask عبر separators
+        kwargs.pop("separators", None)
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def install_json_provider(app):
+    """استخدام FastJSONProvider إذا كان orjson متاحاً وغير معطّل عبر HR_FAST_JSON=0."""
+    if orjson is not None and app.config.get("FAST_JSON", True):
+        app.json = FastJSONProvider(app)
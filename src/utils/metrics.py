@@ -0,0 +1,230 @@
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+# قياسات الأداء لكل مسار: زمن الاستجابة، وعدد وزمن استعلامات SQL لكل طلب،
+# والاستعلامات البطيئة. تُعرض بصيغة Prometheus النصية على /api/_metrics.
+# للمسارات التي تبث الاستجابة (stream) يُقاس الزمن حتى إرسال الترويسات فقط.
+
+logger = logging.getLogger(__name__)
+
+# حدود مدرّجات الزمن بالثواني وعدد الاستعلامات لكل طلب
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 500)
+
+# الاستعلام الأبطأ من هذا (بالميلي ثانية) يُسجَّل في السجل ويُعد في hr_sql_slow_queries_total
+DEFAULT_SLOW_QUERY_MS = 100
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+class Histogram:
+    """مدرّج تراكمي بسيط: عدد القيم في كل حد، والمجموع، والعدد الكلي."""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            running += count
+            yield bound, running
+
+
+class MetricsRegistry:
+    """القياسات المجمعة منذ بدء العملية، مفتاحها (الطريقة، المسار)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.latency = {}
+        self.query_counts = {}
+        self.query_seconds = {}
+        self.responses = {}
+        self.slow_queries = {}
+        self.queries_total = 0
+        self.query_seconds_total = 0.0
+        # دوال تعيد أسطر قياسات إضافية (مثل ذاكرة سجلات الموظفين)
+        self.collectors = []
+
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+
+    def observe_request(self, key, status, seconds, queries, query_seconds):
+        with self._lock:
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.query_counts[key] = Histogram(QUERY_COUNT_BUCKETS)
+                self.query_seconds[key] = 0.0
+            self.latency[key].observe(seconds)
+            self.query_counts[key].observe(queries)
+            self.query_seconds[key] += query_seconds
+            status_key = (*key, status)
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def observe_query(self, seconds):
+        with self._lock:
+            self.queries_total += 1
+            self.query_seconds_total += seconds
+
+    def observe_slow_query(self, key):
+        with self._lock:
+            self.slow_queries[key] = self.slow_queries.get(key, 0) + 1
+
+    def render(self):
+        """نص القياسات بصيغة Prometheus (text/plain; version=0.0.4)."""
+        with self._lock:
+            lines = []
+            _histogram(lines, 'hr_http_request_duration_seconds', 'زمن الاستجابة لكل مسار', self.latency)
+            _histogram(lines, 'hr_sql_queries_per_request', 'عدد استعلامات SQL لكل طلب', self.query_counts)
+            _counter(lines, 'hr_sql_request_seconds_total', 'زمن استعلامات SQL المجمع لكل مسار', self.query_seconds)
+            _counter(lines, 'hr_http_responses_total', 'عدد الاستجابات لكل مسار ورمز حالة', self.responses, ('status',))
+            _counter(lines, 'hr_sql_slow_queries_total', 'الاستعلامات الأبطأ من الحد لكل مسار', self.slow_queries)
+            lines += [
+                '# HELP hr_sql_queries_total عدد كل استعلامات SQL',
+                '# TYPE hr_sql_queries_total counter',
+                f'hr_sql_queries_total {self.queries_total}',
+                '# HELP hr_sql_query_seconds_total زمن كل استعلامات SQL',
+                '# TYPE hr_sql_query_seconds_total counter',
+                f'hr_sql_query_seconds_total {self.query_seconds_total:.6f}',
+                '# HELP hr_process_start_time_seconds وقت بدء العملية',
+                '# TYPE hr_process_start_time_seconds gauge',
+                f'hr_process_start_time_seconds {self.started_at:.3f}',
+            ]
+        for collector in self.collectors:
+            lines += collector()
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(key, names=()):
+    pairs = zip(('method', 'route', *names), key)
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+def _histogram(lines, name, help_text, histograms):
+    lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for key, histogram in sorted(histograms.items()):
+        labels = _labels(key)
+        for bound, count in histogram.cumulative():
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'{name}_sum{{{labels}}} {histogram.total:.6f}')
+        lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+
+def _counter(lines, name, help_text, values, extra_labels=()):
+    lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+    for key, value in sorted(values.items()):
+        value = f'{value:.6f}' if isinstance(value, float) else value
+        lines.append(f'{name}{{{_labels(key, extra_labels)}}} {value}')
+
+
+def _route_key():
+    rule = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+    return request.method, rule
+
+
+def _start_request():
+    g._metrics_started = time.perf_counter()
+    g._metrics_queries = 0
+    g._metrics_query_seconds = 0.0
+    if current_app.config.get('PROFILING') and request.args.get('_profile'):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # أداة تحليل أخرى تعمل في خيط آخر (Python 3.12+)
+            return
+        g._metrics_profiler = profiler
+
+
+def _finish_request(response):
+    started = g.pop('_metrics_started', None)
+    if started is None:
+        return response
+
+    profiler = g.pop('_metrics_profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        response = _profile_response(profiler)
+
+    current_app.extensions['metrics'].observe_request(
+        _route_key(),
+        response.status_code,
+        time.perf_counter() - started,
+        g._metrics_queries,
+        g._metrics_query_seconds,
+    )
+    return response
+
+
+def _profile_response(profiler):
+    """استبدال الاستجابة بملخص cProfile لأكثر الدوال استهلاكاً للوقت."""
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(request.args.get('_profile_sort', 'cumulative')).print_stats(
+        request.args.get('_profile_limit', 40, type=int)
+    )
+    return current_app.response_class(output.getvalue(), mimetype='text/plain')
+
+
+def install_query_listeners(engine, registry, slow_query_ms=DEFAULT_SLOW_QUERY_MS):
+    """عدّ استعلامات SQL وقياس زمنها، ونسبتها إلى الطلب الحالي إن وُجد."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_metrics_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info['_metrics_started'].pop()
+        registry.observe_query(seconds)
+
+        in_request = has_request_context() and '_metrics_queries' in g
+        if in_request:
+            g._metrics_queries += 1
+            g._metrics_query_seconds += seconds
+
+        if seconds * 1000 >= slow_query_ms:
+            key = _route_key() if in_request else ('', UNMATCHED_ROUTE)
+            registry.observe_slow_query(key)
+            logger.warning("استعلام بطيء (%.1f ms) في %s %s: %s", seconds * 1000, *key, ' '.join(statement.split())[:500])
+
+
+def install_metrics(app, engine):
+    """
+    تفعيل القياسات: خطافات before/after_request لزمن المسارات، ومستمعات
+    SQLAlchemy للاستعلامات، ومسار /api/_metrics. مع PROFILING=True يمكن
+    إضافة ?_profile=1 لأي طلب للحصول على ملخص cProfile بدلاً من الاستجابة.
+    """
+    if not app.config.get('METRICS', True):
+        return
+
+    registry = MetricsRegistry()
+    app.extensions['metrics'] = registry
+    install_query_listeners(engine, registry, app.config.get('SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_MS))
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+    def metrics_view():
+        return app.response_class(registry.render(), mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule('/api/_metrics', 'metrics', metrics_view)
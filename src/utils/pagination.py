@@ -0,0 +1,217 @@
+from datetime import datetime
+from flask import request, jsonify, url_for
+from src.models.includes import nest_includes
+from src.models.serialization import row_encoder
+
+# الحد الافتراضي والأقصى لعدد الصفوف في الصفحة الواحدة
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+class InvalidQueryParam(ValueError):
+    """معامل استعلام غير صالح (يُعاد للعميل كخطأ 400)."""
+
+
+def parse_fields(model, allowed=None):
+    """
+    قراءة معامل fields= والتحقق من أن الحقول من allowed (افتراضياً الحقول
+    المعروضة للنموذج serialize_fields، فالأعمدة المستثناة لا تُختار أيضاً).
+    """
+    raw = request.args.get("fields", "")
+    names = [name.strip() for name in raw.split(",") if name.strip()]
+    if not names:
+        return None
+
+    if allowed is None:
+        allowed = model.serialize_fields()
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise InvalidQueryParam(f"حقول غير معروفة: {', '.join(unknown)}")
+
+    # إزالة التكرار مع الحفاظ على الترتيب
+    return list(dict.fromkeys(names))
+
+
+def parse_include(model):
+    """قراءة معامل include= والتحقق من أن العلاقات مسموح بتضمينها في النموذج."""
+    raw = request.args.get("include", "")
+    names = [name.strip() for name in raw.split(",") if name.strip()]
+
+    unknown = [name for name in names if name not in model.__serialize_includes__]
+    if unknown:
+        allowed = ", ".join(model.__serialize_includes__) or "لا شيء"
+        raise InvalidQueryParam(f"علاقات غير قابلة للتضمين: {', '.join(unknown)} (المتاح: {allowed})")
+
+    return list(dict.fromkeys(names))
+
+
+def parse_page(default_limit=DEFAULT_PAGE_LIMIT):
+    """
+    قراءة معاملي limit= و after= لترقيم الصفحات بالمؤشر. بدون limit يُطبَّق
+    default_limit (None للبث، حيث تُقرأ النتائج كاملة على دفعات).
+    """
+    limit = request.args.get("limit")
+    after = request.args.get("after")
+
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise InvalidQueryParam("limit يجب أن يكون رقماً صحيحاً")
+        if limit < 1:
+            raise InvalidQueryParam("limit يجب أن يكون أكبر من صفر")
+        limit = min(limit, MAX_PAGE_LIMIT)
+    elif after is not None:
+        limit = DEFAULT_PAGE_LIMIT
+    else:
+        limit = default_limit
+
+    return limit, parse_after()
+
+
+def parse_after():
+    """قراءة معامل after= (قيمة المفتاح التي تبدأ القراءة بعدها) أو None."""
+    after = request.args.get("after")
+    if after is None:
+        return None
+    try:
+        return int(after)
+    except ValueError:
+        raise InvalidQueryParam("after يجب أن يكون رقماً صحيحاً")
+
+
+def parse_date_range(name_from="from", name_to="to", fmt="%Y-%m-%d"):
+    """قراءة معاملي from= و to= (شاملين للطرفين) والتحقق من صيغتهما. يعيد (from، to) كنصوص أو None."""
+    values = []
+    for name in (name_from, name_to):
+        value = request.args.get(name) or None
+        if value is not None:
+            try:
+                value = datetime.strptime(value, fmt).strftime(fmt)
+            except ValueError:
+                example = datetime(2024, 1, 31).strftime(fmt)
+                raise InvalidQueryParam(f"{name} يجب أن يكون بصيغة {example}")
+        values.append(value)
+    if values[0] and values[1] and values[0] > values[1]:
+        raise InvalidQueryParam(f"{name_from} يجب أن يسبق {name_to}")
+    return tuple(values)
+
+
+def build_list_query(model, key_column, query=None, default_limit=DEFAULT_PAGE_LIMIT):
+    """
+    بناء استعلام القائمة من معاملات الطلب (fields/limit/after).
+    يعيد (الاستعلام، الحقول المطلوبة أو None، limit).
+    الاستعلام يجلب limit + 1 صفاً لمعرفة وجود صفحة تالية.
+    """
+    fields = parse_fields(model)
+    limit, after = parse_page(default_limit)
+
+    if query is None:
+        query = model.query
+
+    if after is not None:
+        query = query.filter(key_column > after)
+    if limit is not None or after is not None:
+        query = query.order_by(key_column)
+    if limit is not None:
+        query = query.limit(limit + 1)
+
+    # جلب الأعمدة مباشرة بدلاً من كائنات ORM كاملة،
+    # مع عمود المفتاح دائماً لحساب المؤشر التالي
+    selected = list(fields or model.serialize_fields())
+    if key_column.key not in selected:
+        selected.append(key_column.key)
+    query = query.with_entities(*[model.__table__.c[name] for name in selected])
+
+    return query, fields, limit
+
+
+def row_serializer(model, fields):
+    """دالة تحويل صف الأعمدة الذي يعيده build_list_query إلى قاموس."""
+    return row_encoder(model, tuple(fields) if fields else None)
+
+
+def keyset_page(model, key_column, query=None):
+    """
+    تنفيذ استعلام مرقّم بالمؤشر (keyset) على عمود المفتاح مع إسقاط الحقول.
+    يعيد (قائمة العناصر، قيمة after للصفحة التالية أو None).
+    """
+    includes = parse_include(model)
+    query, fields, limit = build_list_query(model, key_column, query)
+    rows = query.all()
+
+    next_after = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_after = getattr(rows[-1], key_column.key)
+
+    serialize = row_serializer(model, fields)
+    items = nest_includes(model, includes, rows, [serialize(row) for row in rows])
+    return items, next_after
+
+
+def paginated_response(model, key_column, query=None):
+    """
+    استجابة JSON بقائمة العناصر (نفس الشكل السابق للتوافق مع الواجهة).
+    عند وجود صفحة تالية تُضاف ترويسة X-Next-After ورابط Link بالصفحة التالية.
+    """
+    items, next_after = keyset_page(model, key_column, query)
+    response = jsonify(items)
+
+    if next_after is not None:
+        args = request.args.to_dict()
+        args["after"] = next_after
+        next_url = url_for(request.endpoint, **(request.view_args or {}), **args)
+        response.headers["X-Next-After"] = str(next_after)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return response
+
+
+def parse_offset():
+    """قراءة معامل offset= لترقيم النتائج المرتبة بغير المفتاح (مثل نتائج البحث)."""
+    offset = request.args.get("offset", "0")
+    try:
+        offset = int(offset)
+    except ValueError:
+        raise InvalidQueryParam("offset يجب أن يكون رقماً صحيحاً")
+    if offset < 0:
+        raise InvalidQueryParam("offset لا يمكن أن يكون سالباً")
+    return offset
+
+
+def offset_response(model, query):
+    """
+    استجابة قائمة مرقّمة بـ limit/offset مع الحفاظ على ترتيب الاستعلام.
+    عند وجود صفحة تالية تُضاف ترويسة X-Next-Offset ورابط Link.
+    """
+    fields = parse_fields(model)
+    includes = parse_include(model)
+    limit, _ = parse_page()
+    offset = parse_offset()
+
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    # المفتاح الأساسي دائماً في آخر الصف لربط العلاقات المضمّنة
+    selected = list(fields or model.serialize_fields())
+    selected += [column.key for column in model.__table__.primary_key.columns if column.key not in selected]
+    query = query.with_entities(*[model.__table__.c[name] for name in selected])
+
+    rows = query.all()
+    has_next = limit is not None and len(rows) > limit
+    if has_next:
+        rows = rows[:limit]
+
+    serialize = row_serializer(model, fields)
+    response = jsonify(nest_includes(model, includes, rows, [serialize(row) for row in rows]))
+
+    if has_next:
+        args = request.args.to_dict()
+        args["offset"] = offset + limit
+        next_url = url_for(request.endpoint, **(request.view_args or {}), **args)
+        response.headers["X-Next-Offset"] = str(offset + limit)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return response
@@ -0,0 +1,14 @@
+from sqlalchemy import event
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    """تطبيق قيم PRAGMA على كل اتصال جديد في مجمع الاتصالات."""
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
@@ -0,0 +1,108 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from datetime import datetime, timezone
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli اختياري؛ بدونه يُقدَّم gzip فقط
+    brotli = None
+
+# الملفات الثابتة (index.html والأصول) تُقرأ مرة واحدة عند البدء إلى ذاكرة
+# العملية مع نسخ مضغوطة مسبقاً بـ brotli و gzip، فلا يلمس أي طلب نظام الملفات.
+# أضف الملفات أو عدّلها ثم أعد تشغيل الخادم.
+
+# الملفات التي يحمل اسمها بصمة المحتوى (مثل app.3f2a9c1e.js أو app-3f2a9c1e.js)
+# لا تتغير أبداً تحت نفس الاسم، فتُخزَّن في المتصفح سنة كاملة
+FINGERPRINT = re.compile(r"[.-][0-9a-f]{8,}\.\w+$")
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+COMPRESSIBLE_TYPES = {
+    'application/javascript', 'application/json', 'application/manifest+json', 'application/xml',
+    'application/wasm', 'image/svg+xml', 'image/x-icon', 'image/vnd.microsoft.icon', 'font/ttf', 'font/otf',
+}
+# الملفات الأصغر من هذا لا تستحق الضغط، والنسخة المضغوطة تُهمل إن لم توفر 10% على الأقل
+MIN_COMPRESS_SIZE = 256
+MIN_COMPRESS_RATIO = 0.9
+
+SPA_INDEX = 'index.html'
+
+
+class StaticAsset:
+    """ملف ثابت في الذاكرة مع نسخه المضغوطة حسب الترميز (br، gzip)."""
+
+    __slots__ = ('path', 'data', 'encoded', 'mimetype', 'digest', 'last_modified', 'immutable')
+
+    def __init__(self, path, data, mimetype, last_modified):
+        self.path = path
+        self.data = data
+        self.mimetype = mimetype
+        self.last_modified = last_modified
+        self.digest = hashlib.sha256(data).hexdigest()[:20]
+        self.immutable = bool(FINGERPRINT.search(path))
+        self.encoded = {}
+        if _compressible(mimetype) and len(data) >= MIN_COMPRESS_SIZE:
+            for encoding, compress in _compressors():
+                compressed = compress(data)
+                if len(compressed) <= len(data) * MIN_COMPRESS_RATIO:
+                    self.encoded[encoding] = compressed
+
+    def representation(self, accept_encoding):
+        """أفضل نسخة يقبلها العميل: (الترميز أو None، البيانات)."""
+        for encoding, data in self.encoded.items():
+            if accept_encoding[encoding]:
+                return encoding, data
+        return None, self.data
+
+
+def _compressible(mimetype):
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES
+
+
+def _compressors():
+    # الترتيب هو الأفضلية عند قبول العميل للترميزين
+    if brotli is not None:
+        yield 'br', lambda data: brotli.compress(data, quality=11)
+    yield 'gzip', lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def scan_static_folder(folder):
+    """قراءة كل ملفات المجلد (بمسارات نسبية بصيغة URL) إلى قاموس {المسار: StaticAsset}."""
+    manifest = {}
+    if not folder or not os.path.isdir(folder):
+        return manifest
+
+    for root, _, files in os.walk(folder):
+        for name in files:
+            full_path = os.path.join(root, name)
+            path = os.path.relpath(full_path, folder).replace(os.sep, '/')
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            modified = datetime.fromtimestamp(int(os.path.getmtime(full_path)), timezone.utc)
+            with open(full_path, 'rb') as file:
+                manifest[path] = StaticAsset(path, file.read(), mimetype, modified)
+    return manifest
+
+
+def asset_response(asset):
+    """استجابة الملف بالترميز المناسب لـ Accept-Encoding مع ETag وترويسات التخزين."""
+    encoding, data = asset.representation(request.accept_encodings)
+    response = current_app.response_class(data, mimetype=asset.mimetype)
+    if encoding:
+        response.content_encoding = encoding
+    if asset.encoded:
+        response.vary.add('Accept-Encoding')
+
+    # لكل ترميز ETag مختلف لأن البايتات مختلفة
+    response.set_etag(f"{asset.digest}.{encoding}" if encoding else asset.digest)
+    response.last_modified = asset.last_modified
+    if asset.immutable:
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        # index.html والملفات غير المبصومة: يُتحقق منها في كل تحميل (304 غالباً)
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
@@ -0,0 +1,128 @@
+from itertools import islice
+from flask import Response, current_app, request, stream_with_context
+from sqlalchemy import text
+from src.models.hr_models import db
+from src.models.includes import nest_includes
+from src.utils.pagination import InvalidQueryParam, build_list_query, parse_include, row_serializer, paginated_response
+
+# عدد الصفوف التي تُجلب من قاعدة البيانات وتُكتب في كل دفعة
+STREAM_BATCH_SIZE = 1000
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# اسم حقل المفتاح الذي تُستأنف به القراءة المنقطعة (after=<آخر قيمة مستلمة>)
+AFTER_FIELD_HEADER = "X-After-Field"
+
+
+def stream_mode():
+    """
+    تحديد وضع البث من الطلب: ?stream=json أو ?stream=ndjson
+    أو ترويسة Accept: application/x-ndjson. يعيد None للاستجابة العادية.
+    """
+    mode = request.args.get("stream")
+    if mode is None:
+        if request.accept_mimetypes.best == NDJSON_MIMETYPE:
+            return "ndjson"
+        return None
+
+    mode = mode.lower()
+    if mode in ("1", "true", "json"):
+        return "json"
+    if mode == "ndjson":
+        return "ndjson"
+    raise InvalidQueryParam("stream يجب أن يكون json أو ndjson")
+
+
+def _join_batch(batch, fmt, continued):
+    if fmt == "ndjson":
+        return "\n".join(batch) + "\n"
+    chunk = ",".join(batch)
+    return "," + chunk if continued else chunk
+
+
+def uses_wal():
+    """هل قاعدة البيانات في وضع WAL (انظر ENGINE_PROFILES في src/config.py)."""
+    return db.session.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+
+
+def row_batches(statement, key_column, batch_size, limit=None):
+    """
+    صفوف الاستعلام (مرتبة بـ key_column) على دفعات. في وضع WAL تُقرأ بمؤشر واحد
+    (لقطة متسقة لا تمنع الكتابة). في وضع journal الافتراضي يمنع المؤشر المفتوح
+    أي كتابة طوال التنزيل، فتُقرأ كل دفعة باستعلام مستقل (key > آخر مفتاح) يُقرأ
+    كاملاً قبل إرسالها ويُحرَّر القفل بين الدفعات؛ كل صف يظهر مرة واحدة لكن
+    الكتابة أثناء التنزيل قد تظهر في الدفعات اللاحقة.
+    """
+    statement = statement.order_by(None).order_by(key_column)
+    if uses_wal():
+        result = db.session.execute(statement.limit(limit).execution_options(yield_per=batch_size))
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+        return
+
+    last_key = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        batch_statement = statement if last_key is None else statement.where(key_column > last_key)
+        batch = db.session.execute(batch_statement.limit(size)).all()
+        if not batch:
+            return
+        yield batch
+        if len(batch) < size:
+            return
+        last_key = batch[-1]._mapping[key_column.key]
+        if remaining is not None:
+            remaining -= len(batch)
+
+
+def _generate_chunks(query, key_column, encode_batch, fmt, limit):
+    dumps = current_app.json.dumps
+    emitted = 0
+
+    # إرسال أول بايت قبل تنفيذ الاستعلام
+    if fmt == "json":
+        yield "["
+
+    # الاستعلام يُنفَّذ هنا عند أول قراءة للاستجابة، لا عند بنائها في المسار
+    for batch in row_batches(query.statement, key_column, STREAM_BATCH_SIZE, limit):
+        yield _join_batch([dumps(item) for item in encode_batch(batch)], fmt, emitted > 0)
+        emitted += len(batch)
+
+    if fmt == "json":
+        yield "]"
+
+
+def streamed_response(model, key_column, query=None, fmt="json"):
+    """
+    بث نتائج الاستعلام مرتبة بالمفتاح على دفعات بصيغة مصفوفة JSON أو NDJSON
+    دون تحميل الجدول كاملاً في الذاكرة. كل عنصر يحمل المفتاح (ترويسة
+    X-After-Field باسمه) حتى يستأنف العميل البث المنقطع بـ after=.
+    """
+    includes = parse_include(model)
+    query, fields, limit = build_list_query(model, key_column, query, default_limit=None)
+    if fields and key_column.key not in fields:
+        # build_list_query يضيف عمود المفتاح في آخر الصف
+        fields = [*fields, key_column.key]
+    serialize = row_serializer(model, fields)
+
+    # العلاقات المضمّنة تُحمَّل لكل دفعة باستعلام واحد لكل علاقة
+    def encode_batch(batch):
+        return nest_includes(model, includes, batch, [serialize(row) for row in batch])
+
+    mimetype = NDJSON_MIMETYPE if fmt == "ndjson" else "application/json"
+    response = Response(
+        stream_with_context(_generate_chunks(query, key_column, encode_batch, fmt, limit)), mimetype=mimetype
+    )
+    response.headers[AFTER_FIELD_HEADER] = key_column.key
+    return response
+
+
+def list_response(model, key_column, query=None):
+    """استجابة قائمة: بث عند طلبه، وإلا قائمة JSON مرقّمة بالمؤشر."""
+    mode = stream_mode()
+    if mode:
+        return streamed_response(model, key_column, query, fmt=mode)
+    return paginated_response(model, key_column, query)
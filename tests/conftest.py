@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.models.hr_models import db  # noqa: E402
+from src.models.migrations import run_migrations  # noqa: E402
+
+DATABASE_DIR = os.path.join(ROOT, 'src', 'database')
+
+
+def create_app(database_path, blobs_dir, routes=False):
+    """تطبيق Flask على قاعدة بيانات SQLite في database_path بعد تطبيق الترحيلات."""
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{database_path}",
+        BLOBS_DIR=str(blobs_dir),
+    )
+    db.init_app(app)
+    if routes:
+        from src.routes.hr_routes import hr_bp
+        app.register_blueprint(hr_bp, url_prefix='/api')
+    with app.app_context():
+        run_migrations()
+    return app
+
+
+def seed(app, employees, years=0.1):
+    """بيانات حتمية بمولّد القياس (benchmarks/generate_data.py)."""
+    from benchmarks.generate_data import generate
+    with app.app_context():
+        generate(employees, years, seed=42, leave_per_year=4)
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    def make(database_path, routes=False):
+        return create_app(database_path, tmp_path / 'blobs', routes=routes)
+    return make
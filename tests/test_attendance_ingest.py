@@ -0,0 +1,119 @@
+import json
+from datetime import time
+
+import pytest
+
+from conftest import create_app, seed
+from src.models.hr_models import db, Attendance
+
+DAY = '2030-03-04'
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(tmp_path / 'ingest.db', tmp_path / 'blobs', routes=True)
+    seed(app, 5)
+    app.config.update(SHIFT_START=time(8, 0), LATE_GRACE_MINUTES=5)
+    return app
+
+
+def _ingest_csv(app, body):
+    return app.test_client().post('/api/attendance/ingest', data=body, content_type='text/csv')
+
+
+def _ingest_ndjson(app, events):
+    body = '\n'.join(json.dumps(event) for event in events)
+    return app.test_client().post('/api/attendance/ingest', data=body, content_type='application/x-ndjson')
+
+
+def _record(app, employee_id, day=DAY):
+    with app.app_context():
+        return db.session.execute(
+            db.select(Attendance).filter_by(employee_id=employee_id).where(Attendance.date == day)
+        ).scalar_one()
+
+
+def test_pairs_first_in_and_last_out(app):
+    response = _ingest_csv(app, (
+        'employee_id,timestamp,direction\n'
+        f'1,{DAY}T08:02:00,in\n'
+        f'1,{DAY}T12:00:00,out\n'
+        f'1,{DAY}T13:00:00,in\n'
+        f'1,{DAY}T17:02:00,out\n'
+        f'2,{DAY}T07:55:00\n'
+        f'2,{DAY}T16:00:00\n'
+    ))
+    assert response.status_code == 200
+    assert response.get_json()['records_count'] == 2
+
+    first = _record(app, 1)
+    assert (first.check_in_time, first.check_out_time, first.working_hours) == (time(8, 2), time(17, 2), 9.0)
+    second = _record(app, 2)
+    assert (second.check_in_time, second.check_out_time) == (time(7, 55), time(16, 0))
+
+
+def test_resend_is_idempotent(app):
+    body = f'employee_id,timestamp,direction\n3,{DAY}T08:00:00,in\n3,{DAY}T16:30:00,out\n'
+    _ingest_csv(app, body)
+    before = _record(app, 3)
+    _ingest_csv(app, body)
+    after = _record(app, 3)
+    assert (after.id, after.check_in_time, after.check_out_time, after.working_hours) == \
+        (before.id, before.check_in_time, before.check_out_time, before.working_hours)
+
+    # بصمة خروج لاحقة في طلب آخر تمدد اليوم نفسه
+    _ingest_csv(app, f'employee_id,timestamp,direction\n3,{DAY}T18:00:00,out\n')
+    assert _record(app, 3).working_hours == 10.0
+
+
+@pytest.mark.parametrize('check_in, late_minutes, status', [
+    ('08:05:00', 0, 'on_time'),
+    ('08:06:00', 6, 'late'),
+    ('07:40:00', 0, 'on_time'),
+])
+def test_lateness_uses_shift_start_and_grace(app, check_in, late_minutes, status):
+    _ingest_csv(app, f'employee_id,timestamp,direction\n4,{DAY}T{check_in},in\n')
+    record = _record(app, 4)
+    assert (record.late_minutes, record.status) == (late_minutes, status)
+    # بصمة واحدة: لا خروج ولا ساعات عمل
+    assert (record.check_out_time, record.working_hours) == (None, None)
+
+
+def test_out_before_in_has_no_working_hours(app):
+    _ingest_csv(app, f'employee_id,timestamp,direction\n5,{DAY}T17:00:00,in\n5,{DAY}T08:00:00,out\n')
+    record = _record(app, 5)
+    assert (record.check_in_time, record.check_out_time, record.working_hours) == (time(17, 0), None, None)
+
+
+def test_bad_lines_are_reported_per_line(app):
+    response = _ingest_ndjson(app, [
+        {'employee_id': 1, 'timestamp': f'{DAY}T08:00:00', 'direction': 5},
+        {'employee_id': 1, 'timestamp': f'{DAY}T08:00:00+03:00'},
+        {'employee_id': 1, 'timestamp': 'أمس'},
+        {'employee_id': 'x', 'timestamp': f'{DAY}T08:00:00'},
+        {'employee_id': 9999, 'timestamp': f'{DAY}T08:00:00'},
+        {'employee_id': 1, 'timestamp': f'{DAY}T08:00:00', 'direction': 'in'},
+    ])
+    assert response.status_code == 200
+    result = response.get_json()
+    assert (result['punches_count'], result['errors_count']) == (1, 5)
+    assert [error.split(':')[0] for error in result['errors']] == [f'السطر {n}' for n in range(1, 6)]
+
+
+def test_invalid_utf8_csv_line_is_reported(app):
+    body = (
+        b'employee_id,timestamp,direction\n'
+        + f'1,{DAY}T08:00:00,in\n'.encode()
+        + b'2,\xff\xfe,in\n'
+        + f'2,{DAY}T08:10:00,in\n'.encode()
+    )
+    response = _ingest_csv(app, body)
+    assert response.status_code == 200
+    result = response.get_json()
+    assert (result['punches_count'], result['errors_count']) == (2, 1)
+    assert result['errors'][0].startswith('السطر 3')
+
+
+def test_unsupported_content_type_is_rejected(app):
+    response = app.test_client().post('/api/attendance/ingest', data='x', content_type='text/plain')
+    assert response.status_code == 400
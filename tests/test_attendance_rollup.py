@@ -0,0 +1,97 @@
+import sqlite3
+
+import pytest
+
+from conftest import create_app, seed
+from src.models.attendance_rollup import ROLLUP_TRIGGERS, SUMMARY_COLUMNS, rebuild_attendance_rollup
+from src.models.hr_models import db, Attendance, Employee
+from src.models.migrations import run_migrations
+
+NEW_DEPARTMENT = 'قسم منقول إليه'
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(tmp_path / 'rollup.db', tmp_path / 'blobs', routes=True)
+    seed(app, 10)
+    app.database_path = tmp_path / 'rollup.db'
+    return app
+
+
+def _rollups():
+    columns = f"records_count, {', '.join(SUMMARY_COLUMNS)}"
+    return (
+        db.session.execute(db.text(
+            f"SELECT employee_id, month, department, {columns} FROM attendance_monthly ORDER BY employee_id, month"
+        )).all(),
+        db.session.execute(db.text(
+            f"SELECT month, department, {columns} FROM attendance_department_monthly ORDER BY month, department"
+        )).all(),
+    )
+
+
+def _ingest(client, *lines):
+    response = client.post('/api/attendance/ingest', data='employee_id,timestamp,direction\n' + '\n'.join(lines),
+                           content_type='text/csv')
+    assert response.status_code == 200
+
+
+def _department_summary(client, month):
+    response = client.get(f'/api/attendance/summary?from={month}&to={month}&group=department')
+    assert response.status_code == 200
+    return {row['department']: row for row in response.get_json()}
+
+
+def test_triggers_match_full_rebuild(app):
+    client = app.test_client()
+    _ingest(client, '1,2030-01-02T08:10:00,in', '1,2030-01-02T16:00:00,out', '2,2030-01-02T07:50:00,in')
+    assert client.delete('/api/employees/3').status_code == 200
+    with app.app_context():
+        db.session.execute(db.update(Attendance).where(Attendance.employee_id == 4).values(status='absent'))
+        db.session.commit()
+        incremental = _rollups()
+        rebuild_attendance_rollup()
+        assert _rollups() == incremental
+
+
+def test_months_stay_with_department_at_write_time(app):
+    client = app.test_client()
+    with app.app_context():
+        old_department = db.session.get(Employee, 1).department
+    _ingest(client, '1,2030-01-02T08:00:00,in', '1,2030-01-02T16:00:00,out')
+
+    assert client.put('/api/employees/1', json={'department': NEW_DEPARTMENT}).status_code == 200
+    _ingest(client, '1,2030-02-03T08:00:00,in', '1,2030-02-03T17:00:00,out')
+
+    january = _department_summary(client, '2030-01')
+    assert january[old_department]['total_hours'] == 8.0
+    assert NEW_DEPARTMENT not in january
+    february = _department_summary(client, '2030-02')
+    assert february[NEW_DEPARTMENT]['total_hours'] == 9.0
+
+    # حذف سجل يناير بعد النقل يُطرح من القسم الذي احتُسب له
+    with app.app_context():
+        db.session.execute(db.delete(Attendance).where(Attendance.employee_id == 1, Attendance.date == '2030-01-02'))
+        db.session.commit()
+    assert old_department not in _department_summary(client, '2030-01')
+
+
+def test_upgrade_adds_department_rollup(app):
+    client = app.test_client()
+    _ingest(client, '5,2030-01-02T08:00:00,in', '5,2030-01-02T16:00:00,out')
+    with app.app_context():
+        expected = _rollups()
+        db.session.remove()
+        db.engine.dispose()
+
+    # قاعدة بيانات بالترحيل 8: بدون قسم الشهر وجدول الأقسام والـ Triggers الجديدة
+    with sqlite3.connect(app.database_path) as connection:
+        for name in ROLLUP_TRIGGERS:
+            connection.execute(f"DROP TRIGGER {name}")
+        connection.execute("DROP TABLE attendance_department_monthly")
+        connection.execute("ALTER TABLE attendance_monthly DROP COLUMN department")
+        connection.execute("DELETE FROM schema_migrations WHERE version = 9")
+
+    with app.app_context():
+        assert run_migrations() == [9]
+        assert _rollups() == expected
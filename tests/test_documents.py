@@ -0,0 +1,56 @@
+import pytest
+
+from conftest import create_app
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = create_app(tmp_path / 'documents.db', tmp_path / 'blobs', routes=True)
+    client = app.test_client()
+    response = client.post('/api/documents', json={'document_number': 'D-1', 'document_type': 'letter', 'content': 'نص المستند'})
+    assert response.status_code == 201
+    return client
+
+
+def _upload(client, body, content_type):
+    response = client.put('/api/documents/1/content', data=body, content_type=content_type)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_html_is_served_as_attachment(client):
+    _upload(client, b'<script>alert(1)</script>', 'text/html')
+
+    response = client.get('/api/documents/1/content')
+
+    assert response.mimetype == 'text/html'
+    assert response.headers['Content-Disposition'].startswith('attachment')
+    assert response.headers['X-Content-Type-Options'] == 'nosniff'
+
+
+def test_safe_type_is_served_inline(client):
+    _upload(client, b'%PDF-1.4', 'application/pdf')
+
+    response = client.get('/api/documents/1/content')
+
+    assert response.headers['Content-Disposition'].startswith('inline')
+    assert response.headers['X-Content-Type-Options'] == 'nosniff'
+    assert client.get('/api/documents/1/content?download=1').headers['Content-Disposition'].startswith('attachment')
+
+
+def test_invalid_content_type_is_stored_as_octet_stream(client):
+    document = _upload(client, b'data', 'text/html"><script>')
+    assert document['content_type'] == 'application/octet-stream'
+
+
+def test_range_and_if_none_match(client):
+    content = 'نص المستند'.encode('utf-8')
+
+    response = client.get('/api/documents/1/content', headers={'Range': 'bytes=0-3'})
+    assert response.status_code == 206
+    assert response.get_data() == content[:4]
+
+    etag = client.get('/api/documents/1/content').headers['ETag']
+    response = client.get('/api/documents/1/content', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['X-Content-Type-Options'] == 'nosniff'
@@ -0,0 +1,90 @@
+import io
+import sqlite3
+
+import pytest
+from openpyxl import Workbook
+
+from conftest import create_app, seed
+from src.utils.employee_cache import employee_cache
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(tmp_path / 'cache.db', tmp_path / 'blobs', routes=True)
+    seed(app, 20)
+    app.database_path = tmp_path / 'cache.db'
+    employee_cache.clear()
+    return app
+
+
+def _name(client, employee_id):
+    response = client.get(f'/api/employees/{employee_id}')
+    assert response.status_code == 200
+    return response.get_json()['full_name']
+
+
+def test_repeated_read_is_served_from_cache(app):
+    client = app.test_client()
+    _name(client, 1)
+    hits = employee_cache.hits
+    _name(client, 1)
+    assert employee_cache.hits == hits + 1
+
+
+def test_write_from_another_process_is_seen(app):
+    client = app.test_client()
+    first = client.get('/api/employees/1')
+    assert first.get_json()['full_name'] != 'اسم من عملية أخرى'
+
+    # كتابة من اتصال منفصل (عملية خادم أخرى) لا تمر بـ invalidate
+    with sqlite3.connect(app.database_path) as connection:
+        connection.execute("UPDATE employees SET full_name = 'اسم من عملية أخرى' WHERE employee_id = 1")
+
+    second = client.get('/api/employees/1')
+    assert second.get_json()['full_name'] == 'اسم من عملية أخرى'
+    assert second.headers['ETag'] != first.headers['ETag']
+    # الـ ETag الجديد يخص الجسم الجديد
+    assert client.get('/api/employees/1', headers={'If-None-Match': second.headers['ETag']}).status_code == 304
+
+
+def test_update_invalidates(app):
+    client = app.test_client()
+    _name(client, 1)
+    assert client.put('/api/employees/1', json={'full_name': 'اسم محدث'}).status_code == 200
+    assert _name(client, 1) == 'اسم محدث'
+
+
+def test_delete_invalidates(app):
+    client = app.test_client()
+    _name(client, 2)
+    assert client.delete('/api/employees/2').status_code == 200
+    assert client.get('/api/employees/2').status_code == 404
+
+
+def test_batch_update_and_delete_invalidate(app):
+    client = app.test_client()
+    _name(client, 3)
+    _name(client, 4)
+    response = client.put('/api/employees/batch', json=[{'employee_id': 3, 'full_name': 'اسم دفعة'}])
+    assert response.status_code == 200
+    assert _name(client, 3) == 'اسم دفعة'
+
+    assert client.delete('/api/employees/batch', json=[4]).status_code == 200
+    assert client.get('/api/employees/4').status_code == 404
+
+
+def test_import_invalidates(app):
+    client = app.test_client()
+    _name(client, 5)
+
+    workbook = Workbook()
+    workbook.active.append(['الرقم الوظيفي', 'الاسم الكامل'])
+    workbook.active.append([5, 'اسم مستورد'])
+    data = io.BytesIO()
+    workbook.save(data)
+    data.seek(0)
+
+    response = client.post('/api/employees/import', data={'file': (data, 'employees.xlsx')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert _name(client, 5) == 'اسم مستورد'
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import event
+
+from conftest import create_app, seed
+from src.models.hr_models import db, Employee
+from src.models.includes import include_local_key
+
+INCLUDES = ['leave_management', 'leave_requests', 'attendance_records']
+
+
+def _employee_queries(app, url):
+    """عدد استعلامات SQL للطلب، دون قراءة إصدار الجداول (ETag) الثابتة لكل طلب."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if 'table_versions' not in statement:
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        response = app.test_client().get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+@pytest.mark.parametrize('employees', [20, 200])
+def test_include_query_count_is_constant(tmp_path, employees):
+    app = create_app(tmp_path / 'includes.db', tmp_path / 'blobs', routes=True)
+    seed(app, employees)
+
+    count, items = _employee_queries(app, f"/api/employees?limit=1000&include={','.join(INCLUDES)}")
+
+    assert len(items) == employees
+    assert all(name in item for item in items for name in INCLUDES)
+    assert count == 1 + len(INCLUDES)
+
+
+def test_includes_share_local_key():
+    assert include_local_key(Employee) == 'employee_id'
@@ -0,0 +1,95 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import create_app
+from src.models.hr_models import db
+from src.models.jobs import Job
+from src.utils.jobs import STALE_JOB_SECONDS, JobRunner
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(tmp_path / 'jobs.db', tmp_path / 'blobs')
+    app.config['JOB_HEARTBEAT_SECONDS'] = 0.05
+    return app
+
+
+def _add_job(app, status, age_seconds=0):
+    updated_at = datetime.utcnow() - timedelta(seconds=age_seconds)
+    with app.app_context():
+        job = Job(kind='echo', status=status, params='{}', updated_at=updated_at, started_at=updated_at)
+        db.session.add(job)
+        db.session.commit()
+        return job.id
+
+
+def _job(app, job_id):
+    with app.app_context():
+        return db.session.get(Job, job_id)
+
+
+def _runner(handler):
+    runner = JobRunner()
+    runner.register('echo')(handler)
+    return runner
+
+
+def test_queued_jobs_run_after_restart(app, tmp_path):
+    job_id = _add_job(app, 'queued', age_seconds=STALE_JOB_SECONDS * 2)
+    runner = _runner(lambda context: {'ok': True})
+
+    runner.init_app(app, str(tmp_path / 'jobs'))
+    runner.shutdown()
+
+    job = _job(app, job_id)
+    assert job.status == 'succeeded'
+    assert job.to_dict()['result'] == {'ok': True}
+
+
+def test_stale_running_jobs_fail_at_startup(app, tmp_path):
+    stale_id = _add_job(app, 'running', age_seconds=STALE_JOB_SECONDS + 60)
+    live_id = _add_job(app, 'running')
+    runner = _runner(lambda context: None)
+
+    runner.init_app(app, str(tmp_path / 'jobs'))
+    runner.shutdown()
+
+    assert _job(app, stale_id).status == 'failed'
+    # قد تكون مهمة عملية أخرى حية
+    assert _job(app, live_id).status == 'running'
+
+
+def test_long_job_keeps_heartbeat_and_sweep_runs_periodically(app, tmp_path):
+    started, release = threading.Event(), threading.Event()
+
+    def handler(context):
+        started.set()
+        release.wait(5)
+
+    runner = _runner(handler)
+    runner.init_app(app, str(tmp_path / 'jobs'))
+    try:
+        with app.app_context():
+            job_id = runner.submit('echo').id
+        assert started.wait(5)
+        # مهمة عملية انتهت بعد بدء هذه العملية
+        orphan_id = _add_job(app, 'running', age_seconds=STALE_JOB_SECONDS + 60)
+        with app.app_context():
+            db.session.execute(db.update(Job).where(Job.id == job_id).values(
+                updated_at=datetime.utcnow() - timedelta(seconds=STALE_JOB_SECONDS - 1)
+            ))
+            db.session.commit()
+
+        time.sleep(0.5)
+
+        job = _job(app, job_id)
+        assert job.status == 'running'
+        assert datetime.utcnow() - job.updated_at < timedelta(seconds=5)
+        assert _job(app, orphan_id).status == 'failed'
+    finally:
+        release.set()
+        runner.shutdown()
+    assert _job(app, job_id).status == 'succeeded'
@@ -0,0 +1,90 @@
+import pytest
+
+from conftest import create_app, seed
+from src.models.hr_models import db, LeaveManagement, LeaveRequest
+from src.models.leave_workflow import recompute_leave_balances
+
+EMPLOYEE = 1
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(tmp_path / 'leave.db', tmp_path / 'blobs', routes=True)
+    seed(app, 5)
+    with app.app_context():
+        db.session.execute(
+            db.update(LeaveManagement).where(LeaveManagement.employee_id == EMPLOYEE)
+            .values(casual_leave_balance=3, casual_leave_used=0)
+        )
+        db.session.commit()
+    return app
+
+
+def _request_leave(client, day, days=1, **extra):
+    return client.post('/api/leave-requests', json={
+        'employee_id': EMPLOYEE, 'leave_type': 'casual', 'days_requested': days,
+        'start_date': f'2031-01-{day:02d}', 'end_date': f'2031-01-{day + days - 1:02d}', **extra,
+    })
+
+
+def _casual_used(app):
+    with app.app_context():
+        return db.session.execute(
+            db.select(LeaveManagement.casual_leave_used).where(LeaveManagement.employee_id == EMPLOYEE)
+        ).scalar_one()
+
+
+def test_new_request_is_always_pending(app):
+    client = app.test_client()
+    assert _request_leave(client, 1, status='approved').status_code == 400
+
+    response = _request_leave(client, 1, status='pending')
+    assert response.status_code == 201
+    assert response.get_json()['status'] == 'pending'
+    assert _casual_used(app) == 0
+
+
+def test_approve_deducts_and_refuses_overdraw(app):
+    client = app.test_client()
+    first = _request_leave(client, 1, days=2).get_json()['id']
+    second = _request_leave(client, 10, days=2).get_json()['id']
+
+    assert client.post(f'/api/leave-requests/{first}/approve').status_code == 200
+    assert _casual_used(app) == 2
+
+    # المتبقي يوم واحد فقط
+    assert client.post(f'/api/leave-requests/{second}/approve').status_code == 409
+    assert _casual_used(app) == 2
+    with app.app_context():
+        assert db.session.get(LeaveRequest, second).status == 'pending'
+
+
+def test_deciding_twice_is_rejected(app):
+    client = app.test_client()
+    request_id = _request_leave(client, 1).get_json()['id']
+
+    assert client.post(f'/api/leave-requests/{request_id}/reject').status_code == 200
+    assert client.post(f'/api/leave-requests/{request_id}/approve').status_code == 409
+    assert client.post(f'/api/leave-requests/{request_id}/reject').status_code == 409
+    assert _casual_used(app) == 0
+
+
+def test_recompute_matches_approved_requests(app):
+    with app.app_context():
+        db.session.execute(db.update(LeaveManagement).values(annual_leave_used=99, casual_leave_used=99, sick_leave_used=99))
+        db.session.commit()
+
+        recompute_leave_balances()
+
+        approved = {}
+        for employee_id, leave_type, days in db.session.execute(
+            db.select(LeaveRequest.employee_id, LeaveRequest.leave_type, LeaveRequest.days_requested)
+            .where(LeaveRequest.status == 'approved')
+        ):
+            key = (employee_id, leave_type)
+            approved[key] = approved.get(key, 0) + days
+
+        for record in db.session.execute(db.select(LeaveManagement)).scalars():
+            for leave_type in ('annual', 'casual', 'sick'):
+                expected = approved.get((record.employee_id, leave_type), 0)
+                assert getattr(record, f'{leave_type}_leave_used') == expected
@@ -0,0 +1,58 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+from sqlalchemy import inspect
+
+from conftest import DATABASE_DIR
+from src.models.hr_models import db
+from src.models.migrations import ATTENDANCE_DATE_INDEXES, LOOKUP_INDEXES, MIGRATIONS, SchemaMigration, run_migrations
+from src.utils.blob_store import blob_store
+
+# قواعد البيانات المرفقة بالمستودع أُنشئت قبل الترحيلات، فالترقية منها يجب أن تمر
+# بكل الترحيلات بالترتيب على المخطط القديم وليس على مخطط النماذج الحالي.
+COMMITTED_DATABASES = ['hr_system.db', 'hr_system_updated.db']
+
+
+def _applied_versions():
+    return set(db.session.execute(db.select(SchemaMigration.version)).scalars())
+
+
+def _index_names(table_name):
+    return {index['name'] for index in inspect(db.engine).get_indexes(table_name)}
+
+
+@pytest.mark.parametrize('database_name', COMMITTED_DATABASES)
+def test_upgrade_committed_database(make_app, tmp_path, database_name):
+    database_path = tmp_path / database_name
+    shutil.copy(os.path.join(DATABASE_DIR, database_name), database_path)
+    # مستند بمحتوى داخل الجدول كما كان قبل مخزن الملفات
+    with sqlite3.connect(database_path) as connection:
+        connection.execute(
+            "INSERT INTO documents (document_number, document_type, content) VALUES ('T-1', 'letter', 'نص المستند')"
+        )
+
+    app = make_app(database_path)
+
+    with app.app_context():
+        assert _applied_versions() == {version for version, _, _ in MIGRATIONS}
+        for name, (table_name, *_) in {**LOOKUP_INDEXES, **ATTENDANCE_DATE_INDEXES}.items():
+            assert name in _index_names(table_name)
+        assert 'ix_documents_content_sha256' in _index_names('documents')
+
+        content, digest = db.session.execute(
+            db.text("SELECT content, content_sha256 FROM documents WHERE document_number = 'T-1'")
+        ).one()
+        assert content is None
+        with open(blob_store().path(digest), encoding='utf-8') as blob:
+            assert blob.read() == 'نص المستند'
+
+
+def test_fresh_database(make_app, tmp_path):
+    app = make_app(tmp_path / 'fresh.db')
+
+    with app.app_context():
+        assert _applied_versions() == {version for version, _, _ in MIGRATIONS}
+        # إعادة التشغيل على قاعدة مرحَّلة لا تطبق شيئاً
+        assert run_migrations() == []
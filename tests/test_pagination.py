@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from conftest import create_app, seed
+from src.utils.pagination import DEFAULT_PAGE_LIMIT
+
+EMPLOYEES = DEFAULT_PAGE_LIMIT + 50
+
+
+@pytest.fixture(scope='module')
+def client(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp('pagination')
+    app = create_app(tmp_path / 'pagination.db', tmp_path / 'blobs', routes=True)
+    seed(app, EMPLOYEES)
+    return app.test_client()
+
+
+@pytest.mark.parametrize('url', ['/api/employees', '/api/leave-management', '/api/departments'])
+def test_default_limit_applies(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert len(response.get_json()) <= DEFAULT_PAGE_LIMIT
+
+
+def test_default_page_links_to_next(client):
+    seen = []
+    url = '/api/employees?fields=employee_id'
+    while url:
+        response = client.get(url)
+        items = response.get_json()
+        assert len(items) <= DEFAULT_PAGE_LIMIT
+        seen += [item['employee_id'] for item in items]
+        url = response.headers.get('Link', '').partition('<')[2].partition('>')[0] or None
+    assert seen == list(range(1, EMPLOYEES + 1))
+
+
+def test_stream_is_not_limited(client):
+    response = client.get('/api/employees?stream=ndjson&fields=employee_id')
+    assert len(response.get_data(as_text=True).splitlines()) == EMPLOYEES
+    assert 'X-Next-After' not in response.headers
+
+
+@pytest.mark.parametrize('url', [
+    '/api/employees?fields=employee_id,created_at',
+    '/api/employees?fields=updated_at&stream=json',
+    '/api/documents?fields=id,content',
+])
+def test_fields_exclude_hidden_columns(client, url):
+    response = client.get(url)
+    assert response.status_code == 400
+    assert 'حقول غير معروفة' in json.loads(response.get_data())['error']
@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import create_app, seed
+from src.models.query_plans import READ_REQUESTS, WRITE_REQUESTS, check_query_plans, uncovered_routes
+
+# كل جملة SQL ينفذها مسار (بالطلبات الممثلة في src/models/query_plans.py) يجب
+# أن تستخدم فهرساً. الجمل تُلتقط من تنفيذ المسارات نفسها على قاعدة مرحَّلة.
+
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp('plans')
+    app = create_app(tmp_path / 'plans.db', tmp_path / 'blobs', routes=True)
+    seed(app, employees=200)
+    return app
+
+
+def _format(failures):
+    return '\n'.join(
+        f"{name}\n    {' '.join(statement.split())[:300]}\n        " + '\n        '.join(plan)
+        for name, statements in failures.items()
+        for statement, plan in statements
+    )
+
+
+def test_every_read_route_has_a_plan_request(app):
+    assert uncovered_routes(app, READ_REQUESTS) == []
+
+
+def test_read_routes_use_indexes(app):
+    failures = check_query_plans(app, READ_REQUESTS)
+    assert not failures, _format(failures)
+
+
+def test_write_routes_use_indexes(app):
+    failures = check_query_plans(app, WRITE_REQUESTS)
+    assert not failures, _format(failures)
+
+
+def test_detects_table_scan(app):
+    from src.models.hr_models import db
+    with app.app_context():
+        db.session.execute(db.text("DROP INDEX ix_attendance_date"))
+        db.session.commit()
+        # الاتصالات المفتوحة في المجمع تحتفظ بالجمل المحضرة على المخطط السابق
+        db.engine.dispose()
+    try:
+        failures = check_query_plans(app, [('GET', '/api/attendance?from=2025-06-01&to=2025-06-30&limit=100', None)])
+        assert list(failures) == ['GET /api/attendance?from=2025-06-01&to=2025-06-30&limit=100']
+    finally:
+        with app.app_context():
+            db.session.execute(db.text("CREATE INDEX ix_attendance_date ON attendance (date)"))
+            db.session.commit()
+            db.engine.dispose()
+
@@ -0,0 +1,96 @@
+import json
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+
+from conftest import create_app, seed
+from src.models.hr_models import db
+from src.utils import bulk_export, streaming
+
+
+def test_stream_runs_query_while_reading(tmp_path):
+    app = create_app(tmp_path / 'streaming.db', tmp_path / 'blobs', routes=True)
+    seed(app, 30)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM employees' in statement:
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        response = app.test_client().get('/api/employees?stream=json&fields=employee_id')
+        # أُرسلت الترويسات وأول بايت ("[") دون تنفيذ استعلام الموظفين
+        assert statements == []
+        items = json.loads(response.get_data())
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+
+    assert len(statements) == 1
+    assert [item['employee_id'] for item in items] == list(range(1, 31))
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(streaming, 'STREAM_BATCH_SIZE', 10)
+    monkeypatch.setattr(bulk_export, 'EXPORT_BATCH_SIZE', 10)
+    app = create_app(tmp_path / 'batches.db', tmp_path / 'blobs', routes=True)
+    seed(app, 30)
+    app.database_path = tmp_path / 'batches.db'
+    return app
+
+
+def _write_from_other_connection(app):
+    # timeout=0: يفشل فوراً بـ "database is locked" إن كان البث يمسك قفل القراءة
+    with sqlite3.connect(app.database_path, timeout=0) as connection:
+        connection.execute("UPDATE employees SET notes = 'كتابة أثناء البث' WHERE employee_id = 30")
+
+
+@pytest.mark.parametrize('url', [
+    '/api/employees?stream=ndjson&fields=employee_id',
+    '/api/export/employees?format=ndjson&fields=employee_id',
+])
+def test_stream_does_not_block_writers(app, url):
+    response = app.test_client().get(url)
+    chunks = response.iter_encoded()
+    body = next(chunks)
+    # البث متوقف بين دفعتين
+    _write_from_other_connection(app)
+    body += b''.join(chunks)
+    response.close()
+    assert [json.loads(line)['employee_id'] for line in body.splitlines()] == list(range(1, 31))
+
+
+@pytest.mark.parametrize('url', [
+    '/api/employees?stream=ndjson&fields=full_name&after=20',
+    '/api/export/employees?format=ndjson&fields=full_name&after=20',
+])
+def test_stream_resumes_after_key(app, url):
+    response = app.test_client().get(url)
+    assert response.headers['X-After-Field'] == 'employee_id'
+    items = [json.loads(line) for line in response.get_data().splitlines()]
+    assert [item['employee_id'] for item in items] == list(range(21, 31))
+    assert all(item['full_name'] for item in items)
+
+
+def test_wal_stream_reads_one_snapshot(app):
+    with sqlite3.connect(app.database_path) as connection:
+        connection.execute("PRAGMA journal_mode=WAL")
+    with app.app_context():
+        db.engine.dispose()
+    client = app.test_client()
+
+    response = client.get('/api/employees?stream=json&fields=employee_id&limit=25')
+    assert [item['employee_id'] for item in json.loads(response.get_data())] == list(range(1, 26))
+
+    # القراءة في WAL لا تمنع الكتابة حتى مع مؤشر مفتوح
+    response = client.get('/api/employees?stream=ndjson&fields=employee_id')
+    chunks = response.iter_encoded()
+    body = next(chunks)
+    _write_from_other_connection(app)
+    body += b''.join(chunks)
+    response.close()
+    assert len(body.splitlines()) == 30